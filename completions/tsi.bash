@@ -21,7 +21,7 @@ _tsi() {
     case ${prev} in
         install)
             if [[ ${cur} == -* ]]; then
-                COMPREPLY=($(compgen -W "--force --prefix" -- ${cur}))
+                COMPREPLY=($(compgen -W "--force --prefix --jobs" -- ${cur}))
             elif [[ ${cur} == *@ ]]; then
                 # User typed package@, show versions
                 local pkg_name="${cur%@}"
@@ -218,7 +218,10 @@ print(' '.join(sorted(set(versions), reverse=True)))
     for ((i=1; i < ${#COMP_WORDS[@]}; i++)); do
         if [[ "${COMP_WORDS[i]}" == "install" ]]; then
             # We're in install command
-            if [[ ${prev} == "--force" ]] || [[ ${prev} == "--prefix" ]]; then
+            if [[ ${prev} == "--jobs" ]]; then
+                # --jobs takes a number
+                return 0
+            elif [[ ${prev} == "--force" ]] || [[ ${prev} == "--prefix" ]]; then
                 # After --force or --prefix, complete packages
                 local repo_dir="${HOME}/.tsi/packages"
                 if [ -d "$repo_dir" ]; then
@@ -230,7 +233,7 @@ print(' '.join(sorted(set(versions), reverse=True)))
                 return 0
             elif [[ ${cur} == -* ]]; then
                 # Complete install options
-                COMPREPLY=($(compgen -W "--force --prefix" -- ${cur}))
+                COMPREPLY=($(compgen -W "--force --prefix --jobs" -- ${cur}))
                 return 0
             else
                 # Complete packages
@@ -0,0 +1,41 @@
+"""
+JSON helpers shared by the TSI scripts.
+
+Uses orjson when it is installed (noticeably faster for loading and saving
+package files) and falls back to the standard library otherwise. Both paths
+produce identical 2-space indented output.
+"""
+
+import io
+
+# Write buffer for dump(); large enough that a package file is one write
+WRITE_BUFFER_SIZE = 1 << 20
+
+try:
+    import orjson
+
+    loads = orjson.loads
+
+    def dumps(obj) -> bytes:
+        """Serialize obj as 2-space indented JSON."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def dump(obj, fp):
+        """Write obj as 2-space indented JSON to a binary file."""
+        fp.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+except ImportError:
+    import json
+
+    loads = json.loads
+
+    def dumps(obj) -> bytes:
+        """Serialize obj as 2-space indented JSON."""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+    def dump(obj, fp):
+        """Write obj as 2-space indented JSON to a binary file."""
+        # json.dump encodes chunk by chunk instead of building one big string
+        text = io.TextIOWrapper(fp, encoding='utf-8')
+        json.dump(obj, text, indent=2, ensure_ascii=False)
+        text.flush()
+        text.detach()
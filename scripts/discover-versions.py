@@ -22,70 +22,441 @@ import argparse
 import urllib.request
 import urllib.error
 import urllib.parse
+import http.client
+import socket
+import hashlib
+import threading
+import time
+import atexit
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
+from _tsi_json import WRITE_BUFFER_SIZE, dump, loads
+
+try:
+    import urllib3
+except ImportError:
+    urllib3 = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Regexes used in per-version loops, compiled once
+_GH_REPO_RE = re.compile(r'github\.com/([^/]+)/([^/]+)')
+_CURL_RE = re.compile(r'curl-(\d+\.\d+\.\d+)\.tar\.gz')
+_MAJOR_MINOR_RE = re.compile(r'^\d+\.\d+')
+_LEADING_DIGIT_RE = re.compile(r'^\d+')
+# Common URL version patterns: version-1.2.3, v1.2.3, 1.2.3, etc.
+_URL_VER_RES = [re.compile(p) for p in (
+    r'[vV]?(\d+\.\d+\.\d+(?:\.\d+)?(?:-[a-zA-Z0-9]+)?)',
+    r'(\d+\.\d+\.\d+(?:\.\d+)?(?:-[a-zA-Z0-9]+)?)',
+    r'(\d+\.\d+(?:\.\d+)?(?:-[a-zA-Z0-9]+)?)',
+)]
+# package-name-version, e.g. pcre2-10.43
+_PKG_VER_RE = re.compile(r'([a-zA-Z0-9_-]+-)(\d+\.\d+(?:\.\d+)?)')
+# Bare version patterns, most specific first. 'v'-prefixed variants are not
+# needed: the unprefixed pattern matches the same digits and keeps the 'v'.
+_VER_PATTERNS = [re.compile(p) for p in (
+    r'\d+\.\d+\.\d+\.\d+',  # 1.2.3.4
+    r'\d+\.\d+\.\d+',  # 1.2.3
+    r'\d+\.\d+',  # 1.2
+)]
+
+# Shared connection pool so repeated GitHub API calls reuse the same
+# keep-alive HTTPS connection instead of re-handshaking for every page.
+if urllib3 is not None:
+    _HTTP = urllib3.PoolManager(
+        maxsize=16,
+        timeout=urllib3.Timeout(connect=5.0, read=30.0),
+        # Follow redirects only; fetch_url owns retrying transient failures
+        retries=urllib3.Retry(total=5, connect=0, read=0),
+    )
+else:
+    _HTTP = None
+
+# GitHub rate-limit budget shared by all worker threads. Updated from the
+# X-RateLimit-* headers of every response so requests pause before the
+# budget runs out instead of failing with 403.
+RATE_LIMIT_THRESHOLD = 10
+_RateLimit = {'remaining': 5000, 'reset': 0, 'lock': threading.Lock()}
+
+
+def _rate_limit_update(headers):
+    """Record the remaining budget reported by a response."""
+    remaining = headers.get('X-RateLimit-Remaining')
+    reset = headers.get('X-RateLimit-Reset')
+    if remaining is None:
+        return
+    try:
+        with _RateLimit['lock']:
+            _RateLimit['remaining'] = int(remaining)
+            if reset is not None:
+                _RateLimit['reset'] = int(reset)
+    except ValueError:
+        pass
+
+
+def _rate_limit_wait():
+    """Sleep until the rate limit resets if the budget is nearly exhausted."""
+    with _RateLimit['lock']:
+        remaining = _RateLimit['remaining']
+        delay = _RateLimit['reset'] - time.time() + 1
+    if remaining < RATE_LIMIT_THRESHOLD and delay > 0:
+        print(f"Rate limit nearly exhausted ({remaining} left), sleeping {int(delay)}s until reset...",
+              file=sys.stderr)
+        time.sleep(delay)
+
+
+# Transient network failures worth retrying with exponential backoff
+MAX_RETRIES = 5
+MAX_BACKOFF = 30
+_TRANSIENT_ERRORS = (TimeoutError, socket.timeout, urllib.error.URLError,
+                     http.client.RemoteDisconnected, ConnectionResetError)
+if urllib3 is not None:
+    _TRANSIENT_ERRORS += (urllib3.exceptions.HTTPError,)
+
+
+# On-disk ETag cache for GET requests. GitHub answers If-None-Match with
+# 304 Not Modified for unchanged pages, which does not count against the
+# rate limit, so repeated runs only pay for pages that actually changed.
+ETAG_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'tsi'
+ETAG_INDEX_FILE = ETAG_CACHE_DIR / 'etag.json'
+_etag_lock = threading.Lock()
+_etag_index = None
+_etag_updates = {}  # Entries stored by this run, written by _etag_save_index
+
+
+def _etag_load_index() -> Dict:
+    """Load the ETag index (once per process). Caller must hold _etag_lock."""
+    global _etag_index
+    if _etag_index is None:
+        try:
+            with open(ETAG_INDEX_FILE, 'rb') as f:
+                _etag_index = loads(f.read())
+        except (OSError, ValueError):
+            _etag_index = {}
+    return _etag_index
+
+
+def _etag_lookup(url: str) -> Optional[Dict]:
+    """Return the cache entry for url if its cached body is still on disk."""
+    with _etag_lock:
+        entry = _etag_load_index().get(url)
+    if entry and Path(entry.get('cached_json_path', '')).is_file():
+        return entry
+    return None
+
+
+def _etag_read_body(entry: Dict) -> Optional[str]:
+    """Read a cached response body, verifying it against its checksum."""
+    try:
+        body = Path(entry['cached_json_path']).read_text(encoding='utf-8')
+    except OSError:
+        return None
+    if hashlib.sha256(body.encode('utf-8')).hexdigest() != entry.get('body_sha'):
+        return None
+    return body
+
+
+def _etag_store(url: str, etag: Optional[str], body: str):
+    """Remember the ETag and body of a successful response."""
+    if not etag:
+        return
+    try:
+        body_path = ETAG_CACHE_DIR / 'etag' / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        body_path.write_text(body, encoding='utf-8')
+    except OSError as e:
+        print(f"Warning: Could not update ETag cache: {e}", file=sys.stderr)
+        return
+    entry = {
+        'etag': etag,
+        'body_sha': hashlib.sha256(body.encode('utf-8')).hexdigest(),
+        'cached_json_path': str(body_path),
+    }
+    with _etag_lock:
+        _etag_load_index()[url] = entry
+        _etag_updates[url] = entry
+
+
+@atexit.register
+def _etag_save_index():
+    """Write this run's ETag entries to the index once, at exit."""
+    with _etag_lock:
+        if not _etag_updates:
+            return
+        # Re-read the index so entries written by another run meanwhile are kept
+        try:
+            with open(ETAG_INDEX_FILE, 'rb') as f:
+                index = loads(f.read())
+        except (OSError, ValueError):
+            index = {}
+        index.update(_etag_updates)
+        try:
+            tmp_path = ETAG_INDEX_FILE.with_name(f'{ETAG_INDEX_FILE.name}.{os.getpid()}.tmp')
+            with open(tmp_path, 'wb') as f:
+                dump(index, f)
+            os.replace(tmp_path, ETAG_INDEX_FILE)
+        except OSError as e:
+            print(f"Warning: Could not update ETag cache: {e}", file=sys.stderr)
+        _etag_updates.clear()
+
 
 def load_json(filepath):
     """Load and parse a JSON file."""
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    return loads(Path(filepath).read_bytes())
 
 
 def save_json(filepath, data):
     """Save data as formatted JSON."""
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
-        f.write('\n')
+    with open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        dump(data, f)
+        f.write(b'\n')
+
+
+def _warn_http_status(url: str, status: int, headers, reason=None):
+    """Report a non-200 HTTP response."""
+    if status == 403:
+        # Rate limit or forbidden - try to get rate limit info
+        rate_limit = headers.get('X-RateLimit-Remaining', 'unknown')
+        if rate_limit == '0':
+            print(f"Warning: GitHub API rate limit exceeded for {url}", file=sys.stderr)
+        else:
+            print(f"Warning: HTTP 403 for {url} (rate limit remaining: {rate_limit})", file=sys.stderr)
+    else:
+        print(f"Warning: HTTP {status} for {url}: {reason or status}", file=sys.stderr)
 
 
-def fetch_url(url: str, headers: Optional[Dict] = None, token: Optional[str] = None) -> Optional[str]:
-    """Fetch content from a URL."""
-    try:
-        req_headers = headers.copy() if headers else {}
-        if token:
-            req_headers['Authorization'] = f'token {token}'
+def _request(url: str, headers: Dict, data: Optional[bytes] = None):
+    """
+    Perform one HTTP request.
 
-        req = urllib.request.Request(url, headers=req_headers)
+    Returns:
+        Tuple of (status, response headers, body or None, reason)
+    """
+    if _HTTP is not None:
+        response = _HTTP.request('POST' if data is not None else 'GET', url,
+                                 body=data, headers=headers)
+        body = response.data.decode('utf-8') if response.status == 200 else None
+        return response.status, response.headers, body, response.reason
+
+    try:
+        req = urllib.request.Request(url, data=data, headers=headers)
         with urllib.request.urlopen(req, timeout=30) as response:
-            return response.read().decode('utf-8')
+            return response.status, response.headers, response.read().decode('utf-8'), response.reason
     except urllib.error.HTTPError as e:
-        if e.code == 403:
-            # Rate limit or forbidden - try to get rate limit info
-            rate_limit = e.headers.get('X-RateLimit-Remaining', 'unknown')
-            if rate_limit == '0':
-                print(f"Warning: GitHub API rate limit exceeded for {url}", file=sys.stderr)
-            else:
-                print(f"Warning: HTTP 403 for {url} (rate limit remaining: {rate_limit})", file=sys.stderr)
-        else:
-            print(f"Warning: HTTP {e.code} for {url}: {e}", file=sys.stderr)
+        return e.code, e.headers, None, e
+
+
+def fetch_url(url: str, headers: Optional[Dict] = None, token: Optional[str] = None,
+              data: Optional[bytes] = None) -> Optional[str]:
+    """Fetch content from a URL (POSTs ``data`` when given)."""
+    req_headers = headers.copy() if headers else {}
+    if token:
+        req_headers['Authorization'] = f'token {token}'
+
+    # Only plain GETs are cacheable
+    cached = _etag_lookup(url) if data is None else None
+    if cached:
+        req_headers['If-None-Match'] = cached['etag']
+
+    attempt = 0
+    rate_limit_retried = False
+    while True:
+        _rate_limit_wait()
+        try:
+            status, resp_headers, body, reason = _request(url, req_headers, data)
+        except _TRANSIENT_ERRORS as e:
+            if attempt < MAX_RETRIES:
+                attempt = _backoff(url, attempt, e)
+                continue
+            print(f"Warning: Failed to fetch {url}: {e}", file=sys.stderr)
+            return None
+        except Exception as e:
+            print(f"Warning: Failed to fetch {url}: {e}", file=sys.stderr)
+            return None
+        _rate_limit_update(resp_headers)
+
+        if status == 304 and cached:
+            body = _etag_read_body(cached)
+            if body is not None:
+                return body
+            # The cached body is gone or corrupt: fetch the page in full
+            cached = None
+            req_headers.pop('If-None-Match', None)
+            continue
+        if status == 200:
+            if data is None:
+                _etag_store(url, resp_headers.get('ETag'), body)
+            return body
+        if status >= 500 and attempt < MAX_RETRIES:
+            attempt = _backoff(url, attempt, f"HTTP {status}")
+            continue
+        if status == 403 and resp_headers.get('X-RateLimit-Remaining') == '0' and not rate_limit_retried:
+            # Budget exhausted - _rate_limit_wait() sleeps until reset, then retry once
+            rate_limit_retried = True
+            continue
+        _warn_http_status(url, status, resp_headers, reason)
         return None
-    except Exception as e:
-        print(f"Warning: Failed to fetch {url}: {e}", file=sys.stderr)
+
+
+def _backoff(url: str, attempt: int, reason) -> int:
+    """Sleep before retrying a failed request; returns the next attempt number."""
+    sleep_for = min(2 ** attempt, MAX_BACKOFF)
+    print(f"Warning: Failed to fetch {url}: {reason} (retrying in {sleep_for}s)", file=sys.stderr)
+    time.sleep(sleep_for)
+    return attempt + 1
+
+
+def normalize_tag_version(tag: str, skip_dev: bool = False) -> Optional[str]:
+    """
+    Turn a release/tag name into a bare version string.
+
+    Args:
+        tag: Tag name (e.g., "v1.2.3", "pcre2-10.43")
+        skip_dev: Reject versions with a patch number >= 1000 (development tags)
+
+    Returns:
+        Version string, or None if the tag does not look like a version
+    """
+    # Remove 'v' prefix if present
+    version = tag.lstrip('v') if tag.startswith('v') else tag
+    # Remove package name prefix if present (e.g., "pcre2-10.43" -> "10.43")
+    # Common patterns: package-name-version, package_version
+    if '-' in version or '_' in version:
+        # Try to extract just the version part (assume version is at the end)
+        parts = version.replace('_', '-').split('-')
+        # Check if last part looks like a version (contains digits and dots)
+        if parts and _MAJOR_MINOR_RE.match(parts[-1]):
+            version = parts[-1]
+    if not version or not _LEADING_DIGIT_RE.match(version):  # Must start with digit
         return None
+    if skip_dev:
+        # Filter out development versions with very high patch numbers
+        # (e.g., 9.1.1924 is likely a development version, not a release)
+        parts = version.split('.')
+        if len(parts) >= 3:
+            try:
+                # Skip versions with patch number >= 1000 (likely development versions)
+                if int(parts[2]) >= 1000:
+                    return None
+            except ValueError:
+                pass
+    return version
 
 
-def discover_github_versions(repo: str, max_versions: Optional[int] = None, token: Optional[str] = None) -> List[str]:
+def discover_github_versions(repo: str, max_versions: Optional[int] = None, token: Optional[str] = None,
+                             existing_versions: Optional[set] = None) -> List[str]:
     """
     Discover versions from GitHub releases and tags.
 
     Args:
         repo: Repository in format 'owner/repo' or full URL
         max_versions: Maximum number of versions to return (None = all versions)
+        existing_versions: Versions already in the package file. Pagination
+            stops at the first page containing only known versions, since
+            GitHub lists newest first and older pages cannot hold anything new.
 
     Returns:
         List of version strings (sorted, newest first)
     """
     # Extract owner/repo from URL if needed
     if 'github.com' in repo:
-        match = re.search(r'github\.com/([^/]+)/([^/]+)', repo)
+        match = _GH_REPO_RE.search(repo)
         if match:
             repo = f"{match.group(1)}/{match.group(2)}"
         else:
             return []
 
+    pages = _github_version_pages(repo, max_versions, token)
+
     versions = []
+    index = 0
+    while True:
+        page_versions = pages.page(index)
+        if page_versions is None:  # No more pages
+            break
+        versions.extend(page_versions)
+
+        # Check if we've reached max_versions limit
+        if max_versions and len(versions) >= max_versions:
+            return versions[:max_versions]
+
+        if _all_known(page_versions, existing_versions):
+            break
+        index += 1
+
+    return versions
+
+
+class _GitHubVersionPages:
+    """
+    Version pages of one GitHub repository (newest first), fetched on demand
+    and kept for the rest of the run.
+
+    Several package files can share an upstream repository; each page is only
+    requested once, while every caller still stops at its own known versions.
+    """
+
+    def __init__(self, source):
+        self._source = source
+        self._pages = []
+        self._lock = threading.Lock()
+        self.failed = False  # A request failed before the last page
+
+    def page(self, index: int) -> Optional[List[str]]:
+        """Return the versions on page ``index``, or None past the last page."""
+        with self._lock:
+            while len(self._pages) <= index and self._source is not None:
+                try:
+                    self._pages.append(next(self._source))
+                except StopIteration as stop:
+                    self._source = None
+                    self.failed = not stop.value
+            return self._pages[index] if index < len(self._pages) else None
+
+
+# (repo, max_versions) -> _GitHubVersionPages, shared by all threads of a run
+_github_version_cache: Dict[Tuple[str, Optional[int]], _GitHubVersionPages] = {}
+_github_version_cache_lock = threading.Lock()
+
+
+def _github_version_pages(repo: str, max_versions: Optional[int], token: Optional[str]) -> _GitHubVersionPages:
+    """
+    Memoized version pages of repo, keyed on (repo, max_versions) only.
+
+    Pages that ended on a failed request are replaced on the next lookup, so
+    a transient error doesn't leave the rest of the run with missing versions.
+    """
+    key = (repo, max_versions)
+    with _github_version_cache_lock:
+        pages = _github_version_cache.get(key)
+        if pages is None or pages.failed:
+            pages = _GitHubVersionPages(_iter_github_version_pages(repo, max_versions, token))
+            _github_version_cache[key] = pages
+        return pages
+
+
+def _iter_github_version_pages(repo: str, max_versions: Optional[int], token: Optional[str]):
+    """
+    Yield the versions of each page of GitHub releases, or of tags if there are no releases.
+
+    Returns:
+        True if every page was fetched, False if a request failed on the way
+    """
+    if token:
+        # GraphQL returns releases and tags together at one rate-limit point
+        # per request; it requires auth, so REST remains the anonymous path.
+        complete = yield from _iter_github_graphql_pages(repo, max_versions, token)
+        if complete is not None:
+            return complete
+
+    count = 0
+    complete = True
 
     # Try GitHub API for releases (with pagination)
     page = 1
@@ -95,83 +466,166 @@ def discover_github_versions(repo: str, max_versions: Optional[int] = None, toke
         releases_url = f"https://api.github.com/repos/{repo}/releases?page={page}&per_page={per_page}"
         content = fetch_url(releases_url, headers={"Accept": "application/vnd.github.v3+json"}, token=token)
 
-        if not content:
-            break
-
         try:
-            releases = json.loads(content)
-            if not releases:  # No more pages
-                break
-
-            for release in releases:
-                tag = release.get('tag_name', '')
-                # Remove 'v' prefix if present
-                version = tag.lstrip('v') if tag.startswith('v') else tag
-                # Remove package name prefix if present (e.g., "pcre2-10.43" -> "10.43")
-                # Common patterns: package-name-version, package_version
-                if '-' in version or '_' in version:
-                    # Try to extract just the version part (assume version is at the end)
-                    parts = version.replace('_', '-').split('-')
-                    # Check if last part looks like a version (contains digits and dots)
-                    if parts and re.match(r'^\d+\.\d+', parts[-1]):
-                        version = parts[-1]
-                if version and re.match(r'^\d+', version):  # Must start with digit
-                    versions.append(version)
-
-                # Check if we've reached max_versions limit
-                if max_versions and len(versions) >= max_versions:
-                    return versions[:max_versions]
-
-            page += 1
+            releases = json.loads(content) if content else None
         except json.JSONDecodeError:
+            releases = None
+        if not isinstance(releases, list):  # Failed request or unusable response
+            complete = False
+            break
+        if not releases:  # No more pages
             break
 
+        page_versions = [v for v in (normalize_tag_version(release.get('tag_name') or '')
+                                     for release in releases) if v]
+        count += len(page_versions)
+        yield page_versions
+
+        # Check if we've reached max_versions limit
+        if max_versions and count >= max_versions:
+            return True
+        page += 1
+
     # If no releases, try tags (with pagination)
-    if not versions:
+    if not count:
         page = 1
         while True:
             tags_url = f"https://api.github.com/repos/{repo}/tags?page={page}&per_page={per_page}"
             content = fetch_url(tags_url, headers={"Accept": "application/vnd.github.v3+json"}, token=token)
 
-            if not content:
-                break
-
             try:
-                tags = json.loads(content)
-                if not tags:  # No more pages
-                    break
-
-                for tag in tags:
-                    name = tag.get('name', '')
-                    version = name.lstrip('v') if name.startswith('v') else name
-                    # Remove package name prefix if present
-                    if '-' in version or '_' in version:
-                        parts = version.replace('_', '-').split('-')
-                        if parts and re.match(r'^\d+\.\d+', parts[-1]):
-                            version = parts[-1]
-                    if version and re.match(r'^\d+', version):  # Must start with digit
-                        # Filter out development versions with very high patch numbers
-                        # (e.g., 9.1.1924 is likely a development version, not a release)
-                        parts = version.split('.')
-                        if len(parts) >= 3:
-                            try:
-                                patch = int(parts[2])
-                                # Skip versions with patch number >= 1000 (likely development versions)
-                                if patch >= 1000:
-                                    continue
-                            except ValueError:
-                                pass
-                        versions.append(version)
-
-                    # Check if we've reached max_versions limit
-                    if max_versions and len(versions) >= max_versions:
-                        return versions[:max_versions]
-
-                page += 1
+                tags = json.loads(content) if content else None
             except json.JSONDecodeError:
+                tags = None
+            if not isinstance(tags, list):  # Failed request or unusable response
+                complete = False
+                break
+            if not tags:  # No more pages
                 break
 
-    return versions
+            page_versions = [v for v in (normalize_tag_version(tag.get('name') or '', skip_dev=True)
+                                         for tag in tags) if v]
+            count += len(page_versions)
+            yield page_versions
+
+            # Check if we've reached max_versions limit
+            if max_versions and count >= max_versions:
+                return True
+            page += 1
+
+    return complete
+
+
+def _all_known(page_versions: List[str], existing_versions) -> bool:
+    """True if every version on a page is already in the package file."""
+    return bool(existing_versions) and bool(page_versions) and \
+        all(v in existing_versions for v in page_versions)
+
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+GITHUB_VERSIONS_QUERY = """
+query($o: String!, $n: String!, $rc: String, $tc: String, $r: Boolean!, $t: Boolean!) {
+  repository(owner: $o, name: $n) {
+    releases(first: 100, after: $rc, orderBy: {field: CREATED_AT, direction: DESC}) @include(if: $r) {
+      pageInfo { hasNextPage endCursor }
+      nodes { tagName }
+    }
+    refs(refPrefix: "refs/tags/", first: 100, after: $tc,
+         orderBy: {field: TAG_COMMIT_DATE, direction: DESC}) @include(if: $t) {
+      pageInfo { hasNextPage endCursor }
+      nodes { name }
+    }
+  }
+}
+"""
+
+
+def _iter_github_graphql_pages(repo: str, max_versions: Optional[int], token: Optional[str]):
+    """
+    Yield the versions of each page of GitHub releases and tags via the
+    GraphQL API.
+
+    Releases and tags are requested in the same query, so a repository with
+    releases is usually covered by a single round-trip. Tags are only used
+    when the repository has no releases, matching the REST behaviour.
+
+    Returns:
+        None if the GraphQL API could not be used and the caller should fall
+        back to REST (nothing has been yielded then); otherwise True if every
+        page was fetched, False if a later request failed
+    """
+    owner, _, name = repo.partition('/')
+    if not owner or not name:
+        return None
+
+    release_count = 0
+    tag_pages = []  # Held back until it is known that there are no releases
+    tag_count = 0
+    release_cursor = None
+    tag_cursor = None
+    want_releases = True
+    want_tags = True
+    complete = True
+
+    while want_releases or want_tags:
+        payload = {
+            'query': GITHUB_VERSIONS_QUERY,
+            'variables': {
+                'o': owner, 'n': name,
+                'rc': release_cursor, 'tc': tag_cursor,
+                'r': want_releases, 't': want_tags,
+            },
+        }
+        content = fetch_url(GITHUB_GRAPHQL_URL, headers={"Content-Type": "application/json"},
+                            token=token, data=json.dumps(payload).encode('utf-8'))
+        try:
+            result = json.loads(content) if content else {}
+        except json.JSONDecodeError:
+            result = {}
+
+        repository = (result.get('data') or {}).get('repository')
+        if result.get('errors') or not repository:
+            if release_cursor is None and tag_cursor is None:
+                return None  # First request failed - let REST handle it
+            complete = False
+            break
+
+        if want_releases:
+            releases = repository.get('releases') or {}
+            page_versions = [v for v in (normalize_tag_version(node.get('tagName', ''))
+                                         for node in releases.get('nodes') or []) if v]
+            release_count += len(page_versions)
+            if page_versions:
+                yield page_versions
+            page_info = releases.get('pageInfo') or {}
+            release_cursor = page_info.get('endCursor')
+            want_releases = bool(page_info.get('hasNextPage'))
+            if max_versions and release_count >= max_versions:
+                want_releases = False
+
+        if release_count:
+            # Releases take precedence over tags
+            want_tags = False
+        elif want_tags:
+            refs = repository.get('refs') or {}
+            page_versions = [v for v in (normalize_tag_version(node.get('name', ''), skip_dev=True)
+                                         for node in refs.get('nodes') or []) if v]
+            tag_count += len(page_versions)
+            tag_pages.append(page_versions)
+            page_info = refs.get('pageInfo') or {}
+            tag_cursor = page_info.get('endCursor')
+            want_tags = bool(page_info.get('hasNextPage'))
+            if max_versions and tag_count >= max_versions:
+                want_tags = False
+            if not want_releases:
+                # No releases at all: tag pages can be handed out as they come
+                yield from tag_pages
+                tag_pages = []
+
+    if not release_count:
+        yield from tag_pages
+    return complete
 
 
 def discover_url_pattern_versions(base_url: str, version_pattern: str, max_versions: int = 10) -> List[str]:
@@ -203,11 +657,10 @@ def discover_curl_versions(max_versions: Optional[int] = None) -> List[str]:
     if not content:
         return []
 
-    # Extract version numbers from the page
-    versions = []
-    pattern = r'curl-(\d+\.\d+\.\d+)\.tar\.gz'
-    matches = re.findall(pattern, content)
-    versions = sorted(set(matches), reverse=True)
+    # Extract version numbers from the page (each tarball is linked several times)
+    seen = {m.group(1) for m in _CURL_RE.finditer(content)}
+    # Sort numerically - lexically "8.10.0" would sort below "8.9.0"
+    versions = sorted(seen, key=lambda v: tuple(int(x) for x in v.split('.')), reverse=True)
 
     if max_versions:
         return versions[:max_versions]
@@ -216,15 +669,8 @@ def discover_curl_versions(max_versions: Optional[int] = None) -> List[str]:
 
 def extract_version_from_url(url: str) -> Optional[str]:
     """Extract version number from a URL."""
-    # Common patterns: version-1.2.3, v1.2.3, 1.2.3, etc.
-    patterns = [
-        r'[vV]?(\d+\.\d+\.\d+(?:\.\d+)?(?:-[a-zA-Z0-9]+)?)',
-        r'(\d+\.\d+\.\d+(?:\.\d+)?(?:-[a-zA-Z0-9]+)?)',
-        r'(\d+\.\d+(?:\.\d+)?(?:-[a-zA-Z0-9]+)?)',
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    for pattern in _URL_VER_RES:
+        match = pattern.search(url)
         if match:
             return match.group(1)
     return None
@@ -241,8 +687,11 @@ def generate_version_definition(base_version: Dict, new_version: str) -> Dict:
     Returns:
         New version definition dictionary
     """
-    import copy
-    new_def = copy.deepcopy(base_version)
+    # Only 'version' and the 'source' url/tag are rewritten below, so a
+    # two-level clone is enough; nested lists/dicts stay shared with the base.
+    new_def = dict(base_version)
+    if isinstance(new_def.get('source'), dict):
+        new_def['source'] = dict(new_def['source'])
     new_def['version'] = new_version
 
     # Update source URL if it contains version
@@ -261,30 +710,20 @@ def generate_version_definition(base_version: Dict, new_version: str) -> Dict:
             # Try to find and replace version pattern in URL
             # Handle cases like: package-1.2.3, package_1.2.3, pcre2-10.43, etc.
             # First try to find package-name-version pattern (replace all occurrences)
-            package_version_pattern = r'([a-zA-Z0-9_-]+-)(\d+\.\d+(?:\.\d+)?)'
-            if re.search(package_version_pattern, url):
+            if _PKG_VER_RE.search(url):
                 # Replace all occurrences of package-version pattern
-                new_def['source']['url'] = re.sub(
-                    package_version_pattern,
+                new_def['source']['url'] = _PKG_VER_RE.sub(
                     lambda m: f"{m.group(1)}{new_version}",
                     url
                 )
             else:
                 # Match version patterns like: 1.2.3, v1.2.3, 1.2.3.4, etc.
                 # Try to replace all occurrences of the version
-                version_patterns = [
-                    (r'\d+\.\d+\.\d+\.\d+', new_version),  # 1.2.3.4
-                    (r'v\d+\.\d+\.\d+\.\d+', f"v{new_version}"),  # v1.2.3.4
-                    (r'\d+\.\d+\.\d+', new_version),  # 1.2.3
-                    (r'v\d+\.\d+\.\d+', f"v{new_version}"),  # v1.2.3
-                    (r'\d+\.\d+', new_version),  # 1.2
-                    (r'v\d+\.\d+', f"v{new_version}"),  # v1.2
-                ]
-
-                for pattern, replacement in version_patterns:
-                    if re.search(pattern, url):
-                        # Replace all occurrences
-                        new_def['source']['url'] = re.sub(pattern, replacement, url)
+                for pattern in _VER_PATTERNS:
+                    # Replace all occurrences of the most specific pattern present
+                    new_url, count = pattern.subn(new_version, url)
+                    if count:
+                        new_def['source']['url'] = new_url
                         break
 
     # Update git tag if present
@@ -303,6 +742,35 @@ def generate_version_definition(base_version: Dict, new_version: str) -> Dict:
     return new_def
 
 
+def load_version_template(package_file: Path) -> Tuple[Optional[Dict], set]:
+    """
+    Read only what discovery needs from a package file.
+
+    Returns:
+        Tuple of (latest version definition or None, set of existing version strings)
+    """
+    if ijson is not None:
+        # Stream just versions[0] and the version strings instead of building
+        # every historical version object
+        with open(package_file, 'rb') as f:
+            latest = next(ijson.items(f, 'versions.item', use_float=True), None)
+        if latest is not None:
+            with open(package_file, 'rb') as f:
+                existing_versions = set(ijson.items(f, 'versions.item.version'))
+            return latest, existing_versions
+
+    pkg = load_json(package_file)
+
+    # Get the latest version as template
+    if 'versions' in pkg and pkg['versions']:
+        latest = pkg['versions'][0]
+    elif 'version' in pkg:
+        latest = pkg
+    else:
+        return None, set()
+    return latest, {v.get('version') for v in pkg.get('versions', [pkg])}
+
+
 def discover_package_versions(package_file: Path, max_versions: Optional[int] = None, token: Optional[str] = None) -> List[str]:
     """
     Discover available versions for a package.
@@ -317,14 +785,8 @@ def discover_package_versions(package_file: Path, max_versions: Optional[int] =
     if not package_file.exists():
         return []
 
-    pkg = load_json(package_file)
-
-    # Get the latest version as template
-    if 'versions' in pkg and pkg['versions']:
-        latest = pkg['versions'][0]
-    elif 'version' in pkg:
-        latest = pkg
-    else:
+    latest, existing_versions = load_version_template(package_file)
+    if latest is None:
         return []
 
     source = latest.get('source', {})
@@ -335,17 +797,17 @@ def discover_package_versions(package_file: Path, max_versions: Optional[int] =
 
     # GitHub discovery
     if 'github.com' in source_url:
-        repo_match = re.search(r'github\.com/([^/]+)/([^/]+)', source_url)
+        repo_match = _GH_REPO_RE.search(source_url)
         if repo_match:
             repo = f"{repo_match.group(1)}/{repo_match.group(2)}"
-            discovered = discover_github_versions(repo, max_versions, token)
+            discovered = discover_github_versions(repo, max_versions, token, existing_versions)
 
     # Git repository discovery
     elif source_type == 'git' and 'github.com' in source_url:
-        repo_match = re.search(r'github\.com/([^/]+)/([^/]+)', source_url)
+        repo_match = _GH_REPO_RE.search(source_url)
         if repo_match:
             repo = f"{repo_match.group(1)}/{repo_match.group(2)}"
-            discovered = discover_github_versions(repo, max_versions, token)
+            discovered = discover_github_versions(repo, max_versions, token, existing_versions)
 
     # Special cases for specific websites
     elif 'curl.se' in source_url:
@@ -357,7 +819,38 @@ def discover_package_versions(package_file: Path, max_versions: Optional[int] =
     return discovered
 
 
-def add_versions_to_package(package_file: Path, new_versions: List[str], dry_run: bool = False) -> Tuple[int, int]:
+class _PackageCache:
+    """
+    Package files loaded during a run, written back once each by flush().
+
+    Keeps --all from re-reading and re-serializing a package file every time
+    it is touched. Only used from the main thread.
+    """
+
+    def __init__(self):
+        self._packages = {}
+        self._dirty = set()
+
+    def load(self, package_file: Path) -> Dict:
+        """Return the package data, reading the file only on first use."""
+        if package_file not in self._packages:
+            self._packages[package_file] = load_json(package_file)
+        return self._packages[package_file]
+
+    def store(self, package_file: Path, pkg: Dict):
+        """Replace the cached package data and mark it for writing."""
+        self._packages[package_file] = pkg
+        self._dirty.add(package_file)
+
+    def flush(self):
+        """Write every modified package file."""
+        for package_file in sorted(self._dirty):
+            save_json(package_file, self._packages[package_file])
+        self._dirty.clear()
+
+
+def add_versions_to_package(package_file: Path, new_versions: List[str], dry_run: bool = False,
+                            cache: Optional[_PackageCache] = None) -> Tuple[int, int]:
     """
     Add new versions to a package file.
 
@@ -365,6 +858,8 @@ def add_versions_to_package(package_file: Path, new_versions: List[str], dry_run
         package_file: Path to package JSON file
         new_versions: List of version strings to add
         dry_run: If True, don't actually modify files
+        cache: Optional _PackageCache; changes are written on cache.flush()
+            instead of immediately
 
     Returns:
         Tuple of (added_count, skipped_count)
@@ -373,7 +868,7 @@ def add_versions_to_package(package_file: Path, new_versions: List[str], dry_run
         print(f"Error: Package file not found: {package_file}", file=sys.stderr)
         return 0, 0
 
-    pkg = load_json(package_file)
+    pkg = cache.load(package_file) if cache else load_json(package_file)
 
     # Convert to multi-version format if needed
     if 'versions' not in pkg:
@@ -412,7 +907,10 @@ def add_versions_to_package(package_file: Path, new_versions: List[str], dry_run
         pkg['versions'] = new_version_defs + pkg['versions']
 
         if not dry_run:
-            save_json(package_file, pkg)
+            if cache:
+                cache.store(package_file, pkg)
+            else:
+                save_json(package_file, pkg)
             print(f"Added {added_count} new version(s) to {package_file.name}")
         else:
             print(f"[DRY RUN] Would add {added_count} new version(s) to {package_file.name}")
@@ -470,7 +968,7 @@ def check_and_add_version(package_file: Path, target_version: str, token: Option
 
     # For GitHub repos, check directly if the version exists
     if 'github.com' in source_url:
-        repo_match = re.search(r'github\.com/([^/]+)/([^/]+)', source_url)
+        repo_match = _GH_REPO_RE.search(source_url)
         if repo_match:
             repo = f"{repo_match.group(1)}/{repo_match.group(2)}"
             # Search for the specific version (with reasonable limit to avoid excessive API calls)
@@ -521,6 +1019,12 @@ def main():
         default='packages',
         help='Path to packages directory (default: packages)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Number of packages to discover concurrently with --all (default: 8)'
+    )
     parser.add_argument(
         '--github-token',
         default=None,
@@ -557,31 +1061,42 @@ def main():
 
     if args.all:
         # Process all packages
-        package_files = list(packages_dir.glob('*.json'))
+        # Skip README if it exists as JSON
+        package_files = [f for f in packages_dir.glob('*.json') if f.name != 'README.json']
         total_added = 0
         total_skipped = 0
         failed_packages = []
 
-        for pkg_file in package_files:
-            # Skip README if it exists as JSON
-            if pkg_file.name == 'README.json':
-                continue
-
-            try:
-                print(f"\nProcessing {pkg_file.name}...")
-                versions = discover_package_versions(pkg_file, args.max_versions, github_token)
-
-                if versions:
-                    added, skipped = add_versions_to_package(pkg_file, versions, args.dry_run)
-                    total_added += added
-                    total_skipped += skipped
-                else:
-                    print(f"  No new versions discovered")
-            except Exception as e:
-                print(f"  ⚠️  Error processing {pkg_file.name}: {e}", file=sys.stderr)
-                failed_packages.append(pkg_file.name)
-                # Continue with other packages instead of failing completely
-                continue
+        # Discovery is network-bound, so run it concurrently; file writes stay
+        # on the main thread to avoid clobbering package files and are batched
+        # into one save per modified package.
+        cache = _PackageCache()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+                futures = {
+                    executor.submit(discover_package_versions, pkg_file, args.max_versions, github_token): pkg_file
+                    for pkg_file in package_files
+                }
+
+                for future in as_completed(futures):
+                    pkg_file = futures[future]
+                    try:
+                        print(f"\nProcessing {pkg_file.name}...")
+                        versions = future.result()
+
+                        if versions:
+                            added, skipped = add_versions_to_package(pkg_file, versions, args.dry_run, cache)
+                            total_added += added
+                            total_skipped += skipped
+                        else:
+                            print(f"  No new versions discovered")
+                    except Exception as e:
+                        print(f"  ⚠️  Error processing {pkg_file.name}: {e}", file=sys.stderr)
+                        failed_packages.append(pkg_file.name)
+                        # Continue with other packages instead of failing completely
+                        continue
+        finally:
+            cache.flush()
 
         print(f"\nSummary: Added {total_added} version(s), skipped {total_skipped} version(s)")
         if failed_packages:
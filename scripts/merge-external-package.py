@@ -11,23 +11,35 @@ Usage:
 If package-name is not provided, it will be extracted from the JSON file.
 """
 
-import json
 import sys
 import os
 from pathlib import Path
 
+from _tsi_json import WRITE_BUFFER_SIZE, dump, loads
+
 
 def load_json(filepath):
     """Load and parse a JSON file."""
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    return loads(Path(filepath).read_bytes())
 
 
 def save_json(filepath, data):
     """Save data as formatted JSON."""
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
-        f.write('\n')
+    with open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        dump(data, f)
+        f.write(b'\n')
+
+
+def _without_name(d):
+    """
+    Return a copy of a package/version dict without its 'name' key.
+
+    Not memoized: each dict is stripped at most once per merge, and the
+    copy is stored in the versions list, so it must not be shared.
+    """
+    out = dict(d)
+    out.pop('name', None)
+    return out
 
 
 def merge_package_version(external_pkg, packages_dir, package_name=None):
@@ -59,7 +71,7 @@ def merge_package_version(external_pkg, packages_dir, package_name=None):
         # Convert single-version format to multi-version format if needed
         if 'versions' not in existing_pkg and 'version' in existing_pkg:
             # This is a single-version format, convert to multi-version
-            existing_version = {k: v for k, v in existing_pkg.items() if k != 'name'}
+            existing_version = _without_name(existing_pkg)
             existing_pkg = {
                 "name": existing_pkg.get('name', package_name),
                 "versions": [existing_version]
@@ -76,24 +88,22 @@ def merge_package_version(external_pkg, packages_dir, package_name=None):
     if not new_version:
         raise ValueError("Version not found in external package definition")
 
-    # Check if this version already exists
+    # Index existing versions once (first occurrence wins, like a linear scan)
     versions = existing_pkg.get('versions', [])
-    version_exists = any(v.get('version') == new_version for v in versions)
+    idx = {}
+    for i, v in enumerate(versions):
+        idx.setdefault(v.get('version'), i)
+    i = idx.get(new_version)
+    version_exists = i is not None
 
-    was_updated = False
+    version_obj = _without_name(external_pkg)
     if version_exists:
-        # Update existing version
-        for i, v in enumerate(versions):
-            if v.get('version') == new_version:
-                # Merge the new definition, keeping the version object structure
-                versions[i] = {k: v for k, v in external_pkg.items() if k != 'name'}
-                was_updated = True
-                break
+        # Update existing version, keeping the version object structure
+        versions[i] = version_obj
     else:
         # Add new version (insert at the beginning to keep latest first)
-        version_obj = {k: v for k, v in external_pkg.items() if k != 'name'}
         versions.insert(0, version_obj)
-        was_updated = True
+    was_updated = True
 
     # Ensure versions array exists
     existing_pkg['versions'] = versions
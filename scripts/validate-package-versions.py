@@ -1,66 +1,79 @@
 #!/usr/bin/env python3
 """Validate versions array in multi-version package files."""
 
-import json
 import sys
 
+from _tsi_json import loads
+
 def validate_versions(pkg_file):
-    """Validate all versions in a multi-version package file."""
-    with open(pkg_file, 'r') as f:
-        data = json.load(f)
+    """
+    Validate all versions in a multi-version package file.
+
+    Returns:
+        Tuple of (pkg_file, list of error messages)
+    """
+    with open(pkg_file, 'rb') as f:
+        data = loads(f.read())
 
     versions = data.get('versions', [])
     valid_types = ['git', 'tarball', 'zip', 'local']
     valid_build_systems = ['autotools', 'cmake', 'meson', 'make', 'cargo', 'custom']
     array_fields = ['dependencies', 'build_dependencies', 'configure_args', 'cmake_args', 'make_args', 'patches']
 
-    failed = False
+    errs = []
 
     for i, version in enumerate(versions):
         if 'version' not in version:
-            print(f'❌ Version {i+1} missing version field in {pkg_file}')
-            failed = True
+            errs.append(f'❌ Version {i+1} missing version field in {pkg_file}')
             continue
 
         if 'source' not in version:
-            print(f'❌ Version {i+1} missing source field in {pkg_file}')
-            failed = True
+            errs.append(f'❌ Version {i+1} missing source field in {pkg_file}')
             continue
 
         source = version.get('source', {})
         if not isinstance(source, dict) or 'type' not in source or 'url' not in source:
-            print(f'❌ Version {i+1} has invalid or missing source object in {pkg_file}')
-            failed = True
+            errs.append(f'❌ Version {i+1} has invalid or missing source object in {pkg_file}')
             continue
 
         source_type = source.get('type', '')
         if source_type not in valid_types:
-            print(f'❌ Version {i+1} has invalid source type {source_type} in {pkg_file}')
-            failed = True
+            errs.append(f'❌ Version {i+1} has invalid source type {source_type} in {pkg_file}')
             continue
 
         build_system = version.get('build_system', '')
         if build_system and build_system not in valid_build_systems:
-            print(f'❌ Version {i+1} has invalid build_system {build_system} in {pkg_file}')
-            failed = True
+            errs.append(f'❌ Version {i+1} has invalid build_system {build_system} in {pkg_file}')
             continue
 
         for field in array_fields:
-            if field in version and not isinstance(version[field], list):
-                print(f'❌ Version {i+1} field {field} must be an array in {pkg_file}')
-                failed = True
+            # Missing fields are fine; present ones (even null) must be lists
+            if not isinstance(version.get(field, []), list):
+                errs.append(f'❌ Version {i+1} field {field} must be an array in {pkg_file}')
 
-        if 'env' in version and not isinstance(version.get('env'), dict):
-            print(f'❌ Version {i+1} field env must be an object in {pkg_file}')
-            failed = True
+        if not isinstance(version.get('env', {}), dict):
+            errs.append(f'❌ Version {i+1} field env must be an object in {pkg_file}')
 
-    if failed:
-        sys.exit(1)
+    return pkg_file, errs
 
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print(f'Usage: {sys.argv[0]} <package-file>')
+    if len(sys.argv) < 2:
+        print(f'Usage: {sys.argv[0]} <package-file> [<package-file>...]')
         sys.exit(1)
 
-    validate_versions(sys.argv[1])
+    files = sys.argv[1:]
+    if len(files) == 1:
+        results = [validate_versions(files[0])]
+    else:
+        # One interpreter for the whole set; parse files in parallel.
+        # Imported here so single-file runs don't pay for multiprocessing.
+        from multiprocessing import Pool
+        with Pool() as pool:
+            results = pool.map(validate_versions, files)
+
+    errs = [err for _, file_errs in results for err in file_errs]
+    if errs:
+        # One write for all files; stdout so CI still shows it with 2>/dev/null
+        sys.stdout.write('\n'.join(errs) + '\n')
+        sys.exit(1)
 
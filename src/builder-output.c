@@ -19,6 +19,16 @@ static void get_compiler_dir(char *compiler_dir, size_t compiler_dir_size) {
 
     compiler_dir[0] = '\0';
 
+    // The compiler location doesn't change during a run; look it up once
+    // (this is called for every build and install step)
+    static char cached_dir[512] = "";
+    static bool cached = false;
+    if (cached) {
+        snprintf(compiler_dir, compiler_dir_size, "%s", cached_dir);
+        return;
+    }
+    cached = true;
+
     // Find C compiler location (gcc, clang, or cc)
     const char *compilers[] = {"gcc", "clang", "cc"};
     char compiler_path[512] = "";
@@ -28,6 +38,7 @@ static void get_compiler_dir(char *compiler_dir, size_t compiler_dir_size) {
         snprintf(cmd, sizeof(cmd), "which %s 2>/dev/null", compilers[i]);
         FILE *pipe = popen(cmd, "r");
         if (pipe) {
+            bool found = false;
             if (fgets(compiler_path, sizeof(compiler_path), pipe)) {
                 // Remove newline
                 size_t len = strlen(compiler_path);
@@ -39,16 +50,31 @@ static void get_compiler_dir(char *compiler_dir, size_t compiler_dir_size) {
                 if (last_slash) {
                     *last_slash = '\0';
                     if (strlen(compiler_path) > 0) {
-                        strncpy(compiler_dir, compiler_path, compiler_dir_size - 1);
-                        compiler_dir[compiler_dir_size - 1] = '\0';
+                        memcpy(cached_dir, compiler_path, strlen(compiler_path) + 1);
                         log_developer("Found C compiler (%s) in: %s", compilers[i], compiler_path);
-                        break;
+                        found = true;
                     }
                 }
             }
             pclose(pipe);
+            if (found) {
+                break;
+            }
         }
     }
+
+    snprintf(compiler_dir, compiler_dir_size, "%s", cached_dir);
+}
+
+// Clear compiler_dir if PATH already has it (TSI bin or /bin), so the build
+// environment doesn't carry the same directory twice
+static void drop_redundant_compiler_dir(char *compiler_dir, const char *main_install_dir) {
+    char tsi_bin[1024];
+    snprintf(tsi_bin, sizeof(tsi_bin), "%s/bin", main_install_dir ? main_install_dir : "");
+    if (strcmp(compiler_dir, "/bin") == 0 || strcmp(compiler_dir, tsi_bin) == 0) {
+        log_developer("C compiler directory %s is already in PATH", compiler_dir);
+        compiler_dir[0] = '\0';
+    }
 }
 
 // Helper function to get minimal bootstrap PATH (only essential system tools)
@@ -75,7 +101,7 @@ static void get_bootstrap_path(char *bootstrap_path, size_t bootstrap_size) {
     // Add /bin for basic POSIX shell (sh) and minimal utilities
     // This is typically provided by the system, not user-installed
     struct stat st;
-    if (stat("/bin", &st) == 0 && S_ISDIR(st.st_mode)) {
+    if (strcmp(bootstrap_path, "/bin") != 0 && stat("/bin", &st) == 0 && S_ISDIR(st.st_mode)) {
         if (strlen(bootstrap_path) > 0) {
             strncat(bootstrap_path, ":/bin", bootstrap_size - strlen(bootstrap_path) - 1);
         } else {
@@ -87,6 +113,23 @@ static void get_bootstrap_path(char *bootstrap_path, size_t bootstrap_size) {
     log_developer("Bootstrap PATH (C compiler + /bin only): %s", bootstrap_path);
 }
 
+// Last lines of a command's output, kept for error reporting
+#define OUTPUT_TAIL_LINES 50
+typedef struct {
+    char lines[OUTPUT_TAIL_LINES][1024];
+    size_t count;  // total lines seen; the ring holds the last OUTPUT_TAIL_LINES
+} OutputTail;
+
+static void output_tail_log(const OutputTail *tail) {
+    size_t first = tail->count > OUTPUT_TAIL_LINES ? tail->count - OUTPUT_TAIL_LINES : 0;
+    if (first > 0) {
+        log_error("  ... (%zu earlier lines)", first);
+    }
+    for (size_t i = first; i < tail->count; i++) {
+        log_error("  %s", tail->lines[i % OUTPUT_TAIL_LINES]);
+    }
+}
+
 // Helper function to execute command and capture output line by line
 static bool execute_with_output(const char *cmd, const char *step_name, const char *package_name, void (*output_callback)(const char *line, void *userdata), void *userdata) {
     log_developer("Executing %s command for package: %s", step_name ? step_name : "build", package_name);
@@ -102,14 +145,9 @@ static bool execute_with_output(const char *cmd, const char *step_name, const ch
     char line[1024];
     size_t line_pos = 0;
 
-    // Set line buffering for immediate output
-    setvbuf(pipe, NULL, _IOLBF, 0);
-
-    // Track output for logging (especially errors)
-    char error_output[8192] = "";
-    size_t error_output_len = 0;
-    size_t line_count = 0;
-    const size_t max_error_lines = 50;  // Limit error output to last 50 lines
+    // Track the output tail for error logging in a ring buffer (O(1) per line)
+    static OutputTail tail;
+    tail.count = 0;
 
     while (fgets(buffer, sizeof(buffer), pipe) != NULL) {
         // Process buffer character by character to handle partial lines
@@ -117,38 +155,14 @@ static bool execute_with_output(const char *cmd, const char *step_name, const ch
             if (buffer[i] == '\n' || buffer[i] == '\r') {
                 if (line_pos > 0) {
                     line[line_pos] = '\0';
-                    line_count++;
 
                     // Log each line at DEBUG level
                     log_debug("%s output: %s", step_name ? step_name : "build", line);
 
-                    // Keep last max_error_lines for error logging
-                    if (line_count > max_error_lines) {
-                        // Remove first line from error_output buffer
-                        char *first_newline = strchr(error_output, '\n');
-                        if (first_newline) {
-                            size_t remaining = strlen(first_newline + 1);
-                            memmove(error_output, first_newline + 1, remaining + 1);
-                            error_output_len = remaining;
-                        } else {
-                            error_output[0] = '\0';
-                            error_output_len = 0;
-                        }
-                    }
-
-                    // Append to error output buffer
-                    size_t line_len = strlen(line);
-                    if (error_output_len + line_len + 2 < sizeof(error_output)) {
-                        if (error_output_len > 0) {
-                            error_output[error_output_len++] = '\n';
-                        }
-                        memcpy(error_output + error_output_len, line, line_len);
-                        error_output_len += line_len;
-                        error_output[error_output_len] = '\0';
-                    }
+                    memcpy(tail.lines[tail.count % OUTPUT_TAIL_LINES], line, line_pos + 1);
+                    tail.count++;
 
-                    // Only call callback for non-empty lines
-                    if (line_pos > 0 && output_callback) {
+                    if (output_callback) {
                         output_callback(line, userdata);
                     }
                     line_pos = 0;
@@ -162,6 +176,8 @@ static bool execute_with_output(const char *cmd, const char *step_name, const ch
     // Handle last line if no newline
     if (line_pos > 0) {
         line[line_pos] = '\0';
+        memcpy(tail.lines[tail.count % OUTPUT_TAIL_LINES], line, line_pos + 1);
+        tail.count++;
         if (output_callback) {
             output_callback(line, userdata);
         }
@@ -178,57 +194,17 @@ static bool execute_with_output(const char *cmd, const char *step_name, const ch
             log_debug("%s completed successfully for package: %s (exit code: %d)", step_name ? step_name : "build", package_name, exit_code);
         } else {
             log_error("%s failed for package: %s (exit code: %d)", step_name ? step_name : "build", package_name, exit_code);
-            // Log error output if available
-            if (error_output_len > 0) {
+            if (tail.count > 0) {
                 log_error("Error output from %s:", step_name ? step_name : "build");
-                // Log error output line by line
-                char *error_line = error_output;
-                size_t logged_lines = 0;
-                while (error_line && *error_line && logged_lines < max_error_lines) {
-                    char *newline = strchr(error_line, '\n');
-                    if (newline) {
-                        *newline = '\0';
-                    }
-                    if (strlen(error_line) > 0) {
-                        log_error("  %s", error_line);
-                        logged_lines++;
-                    }
-                    if (newline) {
-                        *newline = '\n';
-                        error_line = newline + 1;
-                    } else {
-                        break;
-                    }
-                }
-                if (logged_lines >= max_error_lines) {
-                    log_error("  ... (output truncated)");
-                }
+                output_tail_log(&tail);
             }
         }
     } else if (WIFSIGNALED(status)) {
         exit_code = WTERMSIG(status);
         log_error("%s was terminated by signal %d for package: %s", step_name ? step_name : "build", exit_code, package_name);
-        // Log error output if available
-        if (error_output_len > 0) {
+        if (tail.count > 0) {
             log_error("Output before termination:");
-            char *error_line = error_output;
-            size_t logged_lines = 0;
-            while (error_line && *error_line && logged_lines < max_error_lines) {
-                char *newline = strchr(error_line, '\n');
-                if (newline) {
-                    *newline = '\0';
-                }
-                if (strlen(error_line) > 0) {
-                    log_error("  %s", error_line);
-                    logged_lines++;
-                }
-                if (newline) {
-                    *newline = '\n';
-                    error_line = newline + 1;
-                } else {
-                    break;
-                }
-            }
+            output_tail_log(&tail);
         }
         success = false;
     } else {
@@ -244,6 +220,9 @@ bool builder_build_with_output(BuilderConfig *config, Package *pkg, const char *
         log_error("builder_build_with_output called with invalid parameters");
         return false;
     }
+    if (!package_load_build_config(pkg)) {
+        return false;
+    }
 
     log_info("Building package: %s@%s (source_dir=%s, build_dir=%s)",
              pkg->name, pkg->version ? pkg->version : "latest", source_dir, build_dir);
@@ -366,6 +345,7 @@ bool builder_build_with_output(BuilderConfig *config, Package *pkg, const char *
             // Always include C compiler and /bin in PATH (these are basic system tools, not TSI packages)
             char compiler_dir[512] = "";
             get_compiler_dir(compiler_dir, sizeof(compiler_dir));
+            drop_redundant_compiler_dir(compiler_dir, main_install_dir);
 
             // Build PATH: TSI bin, compiler dir, /bin (for sh and basic POSIX utilities)
             struct stat st;
@@ -389,6 +369,14 @@ bool builder_build_with_output(BuilderConfig *config, Package *pkg, const char *
         }
     }
 
+    // Compiler cache (CMake gets launcher arguments at configure time instead)
+    if (!pkg->build_system || strcmp(pkg->build_system, "cmake") != 0) {
+        builder_compiler_cache_env(config->prefix, main_install_dir, env, sizeof(env));
+    }
+
+    // Jobserver for make invocations nested under cmake/meson/custom builds
+    builder_jobserver_env(pkg->build_system, main_install_dir, env, sizeof(env));
+
     // Apply package-specific environment variables
     if (pkg->env_count > 0) {
         for (size_t i = 0; i < pkg->env_count; i++) {
@@ -459,10 +447,15 @@ bool builder_build_with_output(BuilderConfig *config, Package *pkg, const char *
                 }
             }
         }
+        // Build in parallel unless the package pins its own job count
+        char jobs_flag[32] = "";
+        if (!builder_has_jobs_arg(pkg->make_args, pkg->make_args_count)) {
+            snprintf(jobs_flag, sizeof(jobs_flag), " -j%d", builder_get_jobs());
+        }
         if (cflags_env) {
-            snprintf(cmd, sizeof(cmd), "cd '%s' && %s make CFLAGS='%s' 2>&1", source_dir, env, cflags_env);
+            snprintf(cmd, sizeof(cmd), "cd '%s' && %s make%s CFLAGS='%s' 2>&1", source_dir, env, jobs_flag, cflags_env);
         } else {
-            snprintf(cmd, sizeof(cmd), "cd '%s' && %s make 2>&1", source_dir, env);
+            snprintf(cmd, sizeof(cmd), "cd '%s' && %s make%s 2>&1", source_dir, env, jobs_flag);
         }
         for (size_t i = 0; i < pkg->make_args_count; i++) {
             strcat(cmd, " ");
@@ -476,10 +469,15 @@ bool builder_build_with_output(BuilderConfig *config, Package *pkg, const char *
     } else if (strcmp(build_system, "cmake") == 0) {
         // CMake configure
         log_debug("Running cmake configure for package: %s", pkg->name);
-        size_t cmd_len = 1024;
+        char generator_args[1200];
+        builder_cmake_generator_args(pkg, main_install_dir, build_dir, generator_args, sizeof(generator_args));
+        char launcher_args[2200];
+        builder_compiler_cache_cmake_args(main_install_dir, launcher_args, sizeof(launcher_args));
+        size_t cmd_len = strlen(env) + strlen(generator_args) + strlen(launcher_args) + strlen(source_dir) +
+                         2 * strlen(build_dir) + strlen(config->install_dir) + 128;
         char *cmd_buf = malloc(cmd_len);
-        snprintf(cmd_buf, cmd_len, "cd '%s' && %s cmake -S '%s' -B '%s' -DCMAKE_INSTALL_PREFIX='%s' 2>&1",
-                 build_dir, env, source_dir, build_dir, config->install_dir);
+        snprintf(cmd_buf, cmd_len, "cd '%s' && %s cmake -S '%s' -B '%s'%s%s -DCMAKE_INSTALL_PREFIX='%s' 2>&1",
+                 build_dir, env, source_dir, build_dir, generator_args, launcher_args, config->install_dir);
         for (size_t i = 0; i < pkg->cmake_args_count; i++) {
             size_t needed = strlen(cmd_buf) + strlen(pkg->cmake_args[i]) + 2;
             if (needed > cmd_len) {
@@ -500,7 +498,11 @@ bool builder_build_with_output(BuilderConfig *config, Package *pkg, const char *
         log_debug("Running cmake build for package: %s", pkg->name);
         cmd_len = 1024;
         cmd_buf = malloc(cmd_len);
-        snprintf(cmd_buf, cmd_len, "cd '%s' && %s cmake --build '%s' 2>&1", build_dir, env, build_dir);
+        if (builder_has_jobs_arg(pkg->make_args, pkg->make_args_count)) {
+            snprintf(cmd_buf, cmd_len, "cd '%s' && %s cmake --build '%s' 2>&1", build_dir, env, build_dir);
+        } else {
+            snprintf(cmd_buf, cmd_len, "cd '%s' && %s cmake --build '%s' --parallel %d 2>&1", build_dir, env, build_dir, builder_get_jobs());
+        }
         for (size_t i = 0; i < pkg->make_args_count; i++) {
             size_t needed = strlen(cmd_buf) + strlen(pkg->make_args[i]) + 2;
             if (needed > cmd_len) {
@@ -521,7 +523,11 @@ bool builder_build_with_output(BuilderConfig *config, Package *pkg, const char *
         log_debug("Running make for package: %s", pkg->name);
         size_t cmd_len = 1024;
         char *cmd_buf = malloc(cmd_len);
-        snprintf(cmd_buf, cmd_len, "cd '%s' && %s make", source_dir, env);
+        if (builder_has_jobs_arg(pkg->make_args, pkg->make_args_count)) {
+            snprintf(cmd_buf, cmd_len, "cd '%s' && %s make", source_dir, env);
+        } else {
+            snprintf(cmd_buf, cmd_len, "cd '%s' && %s make -j%d", source_dir, env, builder_get_jobs());
+        }
         for (size_t i = 0; i < pkg->make_args_count; i++) {
             size_t needed = strlen(cmd_buf) + strlen(pkg->make_args[i]) + 2;
             if (needed > cmd_len) {
@@ -554,8 +560,14 @@ bool builder_build_with_output(BuilderConfig *config, Package *pkg, const char *
             return false;
         }
 
+        // Run ninja directly when available; meson compile wraps it anyway
         log_debug("Running meson compile for package: %s", pkg->name);
-        snprintf(cmd, sizeof(cmd), "cd '%s' && %s meson compile -C '%s' 2>&1", build_dir, env, build_dir);
+        const char *ninja = builder_find_tool("ninja", main_install_dir);
+        if (ninja) {
+            snprintf(cmd, sizeof(cmd), "cd '%s' && %s '%s' -C '%s' -j %d 2>&1", build_dir, env, ninja, build_dir, builder_get_jobs());
+        } else {
+            snprintf(cmd, sizeof(cmd), "cd '%s' && %s meson compile -C '%s' -j %d 2>&1", build_dir, env, build_dir, builder_get_jobs());
+        }
         if (!execute_with_output(cmd, "meson compile", pkg->name, output_callback, userdata)) {
             log_error("Meson compile failed for package: %s", pkg->name);
             return false;
@@ -639,6 +651,9 @@ bool builder_install_with_output(BuilderConfig *config, Package *pkg, const char
         log_error("builder_install_with_output called with invalid parameters");
         return false;
     }
+    if (!package_load_build_config(pkg)) {
+        return false;
+    }
 
     log_info("Installing package: %s@%s (install_dir=%s)",
              pkg->name, pkg->version ? pkg->version : "latest", config->install_dir);
@@ -734,6 +749,7 @@ bool builder_install_with_output(BuilderConfig *config, Package *pkg, const char
             // Always include C compiler and /bin in PATH (these are basic system tools, not TSI packages)
             char compiler_dir[512] = "";
             get_compiler_dir(compiler_dir, sizeof(compiler_dir));
+            drop_redundant_compiler_dir(compiler_dir, main_install_dir);
 
             // Build PATH: TSI bin, compiler dir, /bin (for sh and basic POSIX utilities)
             struct stat st;
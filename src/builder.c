@@ -1,6 +1,7 @@
 #include "builder.h"
 #include "package.h"
 #include "log.h"
+#include "config.h"
 #include <stdlib.h>
 #include <string.h>
 #include <stdio.h>
@@ -9,6 +10,7 @@
 #include <errno.h>
 #include <sys/wait.h>
 #include <dirent.h>
+#include <fcntl.h>
 
 // Helper function to execute command and capture output
 // Returns exit code (0 = success, non-zero = failure)
@@ -61,30 +63,39 @@ static int execute_build_command(const char *command, const char *step_name, con
     // Log exit code
     if (status == 0) {
         log_debug("%s completed successfully for package: %s (exit code: %d)", step_name, package_name, status);
+        unlink(tmp_file);
     } else {
         log_error("%s failed for package: %s (exit code: %d)", step_name, package_name, status);
 
-        // Read and log error output
+        // Log the tail of the output (errors are at the end), streamed through a
+        // ring of the last lines so large logs are never held in memory
         FILE *f = fopen(tmp_file, "r");
         if (f) {
+            enum { TAIL_LINES = 50 };
+            static char tail[TAIL_LINES][1024];
             char line[1024];
             size_t line_count = 0;
-            log_error("Error output from %s:", step_name);
-            while (fgets(line, sizeof(line), f) && line_count < 50) {  // Limit to 50 lines
+            while (fgets(line, sizeof(line), f)) {
                 // Remove trailing newline
                 size_t len = strlen(line);
                 if (len > 0 && line[len-1] == '\n') {
                     line[len-1] = '\0';
                 }
                 if (strlen(line) > 0) {
-                    log_error("  %s", line);
+                    memcpy(tail[line_count % TAIL_LINES], line, strlen(line) + 1);
                     line_count++;
                 }
             }
-            if (line_count >= 50) {
-                log_error("  ... (output truncated, see %s for full output)", tmp_file);
-            }
             fclose(f);
+
+            log_error("Error output from %s:", step_name);
+            size_t first = line_count > TAIL_LINES ? line_count - TAIL_LINES : 0;
+            if (first > 0) {
+                log_error("  ... (%zu earlier lines, see %s for full output)", first, tmp_file);
+            }
+            for (size_t i = first; i < line_count; i++) {
+                log_error("  %s", tail[i % TAIL_LINES]);
+            }
             log_developer("Full build output saved to: %s", tmp_file);
         } else {
             log_warning("Could not read build output file: %s (errno: %d)", tmp_file, errno);
@@ -125,6 +136,315 @@ void builder_config_free(BuilderConfig *config) {
     free(config);
 }
 
+static int g_builder_jobs = 0;
+
+int builder_get_jobs(void) {
+    if (g_builder_jobs > 0) {
+        return g_builder_jobs;
+    }
+
+    g_builder_jobs = config_get_jobs();
+    if (g_builder_jobs <= 0) {
+        long cpus = sysconf(_SC_NPROCESSORS_ONLN);
+        g_builder_jobs = cpus > 0 ? (int)cpus : 1;
+    }
+    log_debug("Using %d parallel build job(s)", g_builder_jobs);
+    return g_builder_jobs;
+}
+
+void builder_set_jobs(int jobs) {
+    g_builder_jobs = jobs > 0 ? jobs : 1;
+}
+
+bool builder_is_build_tool(const char *name) {
+    // Bootstrap toolchain and build systems: builds pick these up from the TSI
+    // bin directory without declaring them as dependencies
+    static const char *tools[] = {
+        "m4", "ncurses", "bash", "coreutils", "diffutils", "gawk", "grep", "sed",
+        "make", "patch", "tar", "gzip", "xz", "binutils", "gcc",
+        "autoconf", "automake", "libtool", "pkg-config", "pkgconf",
+        "cmake", "ninja", "meson", "perl", "python", "python3"
+    };
+    if (!name) return false;
+    for (size_t i = 0; i < sizeof(tools) / sizeof(tools[0]); i++) {
+        if (strcmp(name, tools[i]) == 0) {
+            return true;
+        }
+    }
+    return false;
+}
+
+bool builder_has_jobs_arg(char **args, size_t args_count) {
+    for (size_t i = 0; i < args_count; i++) {
+        if (!args[i]) continue;
+        if (strncmp(args[i], "-j", 2) == 0 || strncmp(args[i], "--jobs", 6) == 0 ||
+            strncmp(args[i], "--parallel", 10) == 0) {
+            return true;
+        }
+    }
+    return false;
+}
+
+const char* builder_find_tool(const char *tool_name, const char *main_install_dir) {
+    // Prefer TSI-installed tool (re-checked each time, it may be installed mid-run)
+    static char tsi_tool[1024];
+    if (main_install_dir) {
+        snprintf(tsi_tool, sizeof(tsi_tool), "%s/bin/%s", main_install_dir, tool_name);
+        struct stat st;
+        if (stat(tsi_tool, &st) == 0 && (st.st_mode & S_IXUSR)) {
+            return tsi_tool;
+        }
+    }
+
+    // Strict isolation: only TSI-installed tools
+    if (config_is_strict_isolation()) {
+        return NULL;
+    }
+
+    // System tools are looked up once per process
+    static struct {
+        char name[32];
+        char path[1024];
+    } system_tools[8];
+    static size_t system_tools_count = 0;
+    for (size_t i = 0; i < system_tools_count; i++) {
+        if (strcmp(system_tools[i].name, tool_name) == 0) {
+            return system_tools[i].path[0] != '\0' ? system_tools[i].path : NULL;
+        }
+    }
+
+    char path[1024] = "";
+    char cmd[256];
+    snprintf(cmd, sizeof(cmd), "command -v %s 2>/dev/null", tool_name);
+    FILE *pipe = popen(cmd, "r");
+    if (pipe) {
+        if (fgets(path, sizeof(path), pipe)) {
+            size_t len = strlen(path);
+            if (len > 0 && path[len - 1] == '\n') {
+                path[len - 1] = '\0';
+            }
+            // Only accept absolute paths (not aliases/functions)
+            if (path[0] != '/') {
+                path[0] = '\0';
+            }
+        }
+        pclose(pipe);
+    }
+    if (path[0] != '\0') {
+        log_debug("Found system %s: %s", tool_name, path);
+    }
+
+    if (system_tools_count < sizeof(system_tools) / sizeof(system_tools[0]) &&
+        strlen(tool_name) < sizeof(system_tools[0].name)) {
+        size_t i = system_tools_count++;
+        strcpy(system_tools[i].name, tool_name);
+        strcpy(system_tools[i].path, path);
+        return system_tools[i].path[0] != '\0' ? system_tools[i].path : NULL;
+    }
+    // Cache full: hand back a copy that stays valid until the next uncached lookup
+    static char uncached[1024];
+    strcpy(uncached, path);
+    return uncached[0] != '\0' ? uncached : NULL;
+}
+
+const char* builder_find_compiler_cache(const char *main_install_dir) {
+    const char *setting = config_get_compiler_cache();
+    if (setting && strcmp(setting, "none") == 0) {
+        return NULL;
+    }
+    if (setting) {
+        return builder_find_tool(setting, main_install_dir);
+    }
+    // Auto: sccache first, then ccache
+    const char *cache = builder_find_tool("sccache", main_install_dir);
+    if (!cache) {
+        cache = builder_find_tool("ccache", main_install_dir);
+    }
+    return cache;
+}
+
+// Compilers a build picks up when no cache is involved: $CC/$CXX if set,
+// otherwise the first of gcc, clang and cc that is installed (the search that
+// puts the C compiler's directory in the build PATH) with its C++ counterpart.
+// Wrapping exactly these keeps the cache from switching compilers.
+static void compiler_cache_compilers(const char *main_install_dir, char *cc, size_t cc_size, char *cxx, size_t cxx_size) {
+    cc[0] = '\0';
+    cxx[0] = '\0';
+    const char *env_cc = getenv("CC");
+    const char *env_cxx = getenv("CXX");
+    if (env_cc && env_cc[0] != '\0') {
+        snprintf(cc, cc_size, "%s", env_cc);
+    }
+    if (env_cxx && env_cxx[0] != '\0') {
+        snprintf(cxx, cxx_size, "%s", env_cxx);
+    }
+
+    static const char *compilers[][2] = {{"gcc", "g++"}, {"clang", "clang++"}, {"cc", "c++"}};
+    for (size_t i = 0; i < sizeof(compilers) / sizeof(compilers[0]) && (cc[0] == '\0' || cxx[0] == '\0'); i++) {
+        const char *found = builder_find_tool(compilers[i][0], main_install_dir);
+        if (!found) continue;
+        if (cc[0] == '\0') {
+            snprintf(cc, cc_size, "%s", found);
+        }
+        if (cxx[0] == '\0') {
+            found = builder_find_tool(compilers[i][1], main_install_dir);
+            if (found) {
+                snprintf(cxx, cxx_size, "%s", found);
+            }
+        }
+        break;
+    }
+}
+
+void builder_compiler_cache_env(const char *prefix, const char *main_install_dir, char *env, size_t env_size) {
+    const char *cache = builder_find_compiler_cache(main_install_dir);
+    if (!cache || !env || env_size == 0) return;
+    char cache_path[1024];
+    snprintf(cache_path, sizeof(cache_path), "%s", cache);
+
+    char cc[1024], cxx[1024];
+    compiler_cache_compilers(main_install_dir, cc, sizeof(cc), cxx, sizeof(cxx));
+    if (cc[0] == '\0' && cxx[0] == '\0') {
+        log_debug("No C or C++ compiler found to wrap with %s", cache_path);
+        return;
+    }
+
+    // Wrap the compiler and keep the cache under the TSI prefix so it survives between installs
+    char cache_env[4608] = "";
+    size_t len = 0;
+    if (cc[0] != '\0') {
+        len += (size_t)snprintf(cache_env + len, sizeof(cache_env) - len, " CC='%s %s'", cache_path, cc);
+    }
+    if (cxx[0] != '\0' && len < sizeof(cache_env)) {
+        len += (size_t)snprintf(cache_env + len, sizeof(cache_env) - len, " CXX='%s %s'", cache_path, cxx);
+    }
+    const char *base = strrchr(cache_path, '/') ? strrchr(cache_path, '/') + 1 : cache_path;
+    if (len < sizeof(cache_env)) {
+        snprintf(cache_env + len, sizeof(cache_env) - len, " %s='%s/%s'",
+                 strcmp(base, "sccache") == 0 ? "SCCACHE_DIR" : "CCACHE_DIR", prefix,
+                 strcmp(base, "sccache") == 0 ? "sccache" : "ccache");
+    }
+    if (strlen(env) + strlen(cache_env) < env_size) {
+        strcat(env, cache_env);
+        log_developer("Using compiler cache: %s (CC=%s, CXX=%s)", cache_path, cc, cxx);
+    }
+}
+
+// GNU make >= 4.2 understands --jobserver-auth=R,W (older makes reject it)
+static bool builder_make_supports_jobserver(const char *main_install_dir) {
+    static int supported = -1;
+    if (supported >= 0) {
+        return supported == 1;
+    }
+
+    supported = 0;
+    const char *make = builder_find_tool("make", main_install_dir);
+    if (!make) {
+        return false;
+    }
+    char cmd[1100];
+    snprintf(cmd, sizeof(cmd), "'%s' --version 2>/dev/null", make);
+    FILE *fp = popen(cmd, "r");
+    if (!fp) {
+        return false;
+    }
+    char line[256];
+    int major = 0, minor = 0;
+    if (fgets(line, sizeof(line), fp) && sscanf(line, "GNU Make %d.%d", &major, &minor) == 2) {
+        supported = (major > 4 || (major == 4 && minor >= 2)) ? 1 : 0;
+    }
+    pclose(fp);
+    log_developer("GNU make jobserver %s (make %d.%d)", supported ? "available" : "unavailable", major, minor);
+    return supported == 1;
+}
+
+void builder_jobserver_env(const char *build_system, const char *main_install_dir, char *env, size_t env_size) {
+    // Top-level make (autotools/make) already runs its own jobserver via -jN
+    if (!build_system || !env || env_size == 0) return;
+    if (strcmp(build_system, "cmake") != 0 && strcmp(build_system, "meson") != 0 &&
+        strcmp(build_system, "custom") != 0) {
+        return;
+    }
+    if (!builder_make_supports_jobserver(main_install_dir)) return;
+
+    // One pipe for the whole run; the fds are inherited by the build commands
+    static int fds[2] = {-1, -1};
+    if (fds[0] < 0) {
+        if (pipe(fds) != 0) {
+            log_debug("Failed to create jobserver pipe: %s", strerror(errno));
+            fds[0] = fds[1] = -1;
+            return;
+        }
+    }
+
+    // Builds run one after another, so reset the token count for each one
+    // (drops tokens leaked by a killed sub-make). Each make holds one implicit token.
+    char tokens[1024];
+    int flags = fcntl(fds[0], F_GETFL);
+    fcntl(fds[0], F_SETFL, flags | O_NONBLOCK);
+    while (read(fds[0], tokens, sizeof(tokens)) > 0) {
+    }
+    fcntl(fds[0], F_SETFL, flags);
+    int jobs = builder_get_jobs();
+    size_t count = jobs > 1 ? (size_t)(jobs - 1) : 0;
+    if (count > sizeof(tokens)) count = sizeof(tokens);
+    memset(tokens, '+', count);
+    if (count > 0 && write(fds[1], tokens, count) != (ssize_t)count) {
+        log_debug("Failed to fill jobserver pipe");
+        return;
+    }
+
+    char makeflags[128];
+    snprintf(makeflags, sizeof(makeflags), " MAKEFLAGS='-j%d --jobserver-auth=%d,%d'", jobs, fds[0], fds[1]);
+    if (strlen(env) + strlen(makeflags) < env_size) {
+        strcat(env, makeflags);
+        log_developer("Passing GNU make jobserver to sub-builds (%d jobs)", jobs);
+    }
+}
+
+void builder_compiler_cache_cmake_args(const char *main_install_dir, char *args, size_t size) {
+    if (!args || size == 0) return;
+    args[0] = '\0';
+    const char *cache = builder_find_compiler_cache(main_install_dir);
+    if (cache) {
+        snprintf(args, size, " -DCMAKE_C_COMPILER_LAUNCHER='%s' -DCMAKE_CXX_COMPILER_LAUNCHER='%s'", cache, cache);
+    }
+}
+
+void builder_cmake_generator_args(Package *pkg, const char *main_install_dir, const char *build_dir,
+                                  char *generator_args, size_t size) {
+    if (!generator_args || size == 0) return;
+    generator_args[0] = '\0';
+
+    // Package selects its own generator
+    for (size_t i = 0; i < pkg->cmake_args_count; i++) {
+        if (pkg->cmake_args[i] && strncmp(pkg->cmake_args[i], "-G", 2) == 0) {
+            return;
+        }
+    }
+
+    // An existing build tree is bound to the generator it was configured with
+    char cache_file[1024];
+    snprintf(cache_file, sizeof(cache_file), "%s/CMakeCache.txt", build_dir);
+    struct stat st;
+    if (stat(cache_file, &st) == 0) {
+        log_developer("Reusing generator of existing CMake build tree: %s", build_dir);
+        return;
+    }
+
+    const char *generator = config_get_cmake_generator();
+    if (generator) {
+        snprintf(generator_args, size, " -G '%s'", generator);
+        return;
+    }
+
+    const char *ninja = builder_find_tool("ninja", main_install_dir);
+    if (ninja) {
+        // Absolute CMAKE_MAKE_PROGRAM so the restricted build PATH doesn't matter
+        snprintf(generator_args, size, " -G Ninja -DCMAKE_MAKE_PROGRAM='%s'", ninja);
+    }
+}
+
 void builder_config_set_package_dir(BuilderConfig *config, const char *package_name, const char *package_version) {
     if (!config || !package_name) return;
 
@@ -143,7 +463,60 @@ void builder_config_set_package_dir(BuilderConfig *config, const char *package_n
     config->install_dir = strdup(package_dir);
 }
 
+// Apply all patches with one tool invocation: the concatenated patches are
+// piped into git apply (or patch -p1 after a --dry-run), which is
+// all-or-nothing, so a failure leaves the tree untouched for the per-patch
+// fallback. GIT_CEILING_DIRECTORIES keeps git from treating a parent
+// repository as the tree to patch.
+static bool apply_patches_batched(const char *source_dir, char **patches, size_t patches_count) {
+    size_t cmd_size = 2 * strlen(source_dir) + 256;
+    for (size_t i = 0; i < patches_count; i++) {
+        cmd_size += strlen(patches[i]) + 3;
+    }
+    char *cat_cmd = malloc(cmd_size);
+    char *cmd = malloc(2 * cmd_size);
+    if (!cat_cmd || !cmd) {
+        free(cat_cmd);
+        free(cmd);
+        return false;
+    }
+    size_t len = (size_t)snprintf(cat_cmd, cmd_size, "cat");
+    for (size_t i = 0; i < patches_count; i++) {
+        len += (size_t)snprintf(cat_cmd + len, cmd_size - len, " '%s'", patches[i]);
+    }
+
+    char parent[1024];
+    snprintf(parent, sizeof(parent), "%s", source_dir);
+    char *slash = strrchr(parent, '/');
+    if (slash && slash != parent) {
+        *slash = '\0';
+    }
+
+    bool applied;
+    if (system("command -v git >/dev/null 2>&1") == 0) {
+        snprintf(cmd, 2 * cmd_size,
+                 "cd '%s' && %s | GIT_CEILING_DIRECTORIES='%s' git apply --whitespace=nowarn - 2>/dev/null",
+                 source_dir, cat_cmd, parent);
+        applied = system(cmd) == 0;
+    } else {
+        snprintf(cmd, 2 * cmd_size, "cd '%s' && %s | patch -p1 --dry-run -s >/dev/null 2>&1 && %s | patch -p1 -s",
+                 source_dir, cat_cmd, cat_cmd);
+        applied = system(cmd) == 0;
+    }
+    free(cat_cmd);
+    free(cmd);
+    return applied;
+}
+
 bool builder_apply_patches(const char *source_dir, char **patches, size_t patches_count) {
+    if (patches_count > 1 && apply_patches_batched(source_dir, patches, patches_count)) {
+        log_debug("Applied %zu patches in one pass", patches_count);
+        return true;
+    }
+    if (patches_count > 1) {
+        log_debug("Batched patch application failed, applying patches one by one");
+    }
+
     for (size_t i = 0; i < patches_count; i++) {
         char cmd[1024];
         snprintf(cmd, sizeof(cmd), "cd '%s' && patch -p1 -i '%s'", source_dir, patches[i]);
@@ -167,6 +540,9 @@ bool builder_build(BuilderConfig *config, Package *pkg, const char *source_dir,
         log_error("builder_build called with invalid parameters");
         return false;
     }
+    if (!package_load_build_config(pkg)) {
+        return false;
+    }
 
     log_info("Building package: %s@%s (source_dir=%s, build_dir=%s)",
              pkg->name, pkg->version ? pkg->version : "latest", source_dir, build_dir);
@@ -424,6 +800,14 @@ bool builder_build(BuilderConfig *config, Package *pkg, const char *source_dir,
                  main_install_dir, main_install_dir, main_install_dir, main_install_dir, main_install_dir);
     }
 
+    // Compiler cache (CMake gets launcher arguments at configure time instead)
+    if (!pkg->build_system || strcmp(pkg->build_system, "cmake") != 0) {
+        builder_compiler_cache_env(config->prefix, main_install_dir, env, sizeof(env));
+    }
+
+    // Jobserver for make invocations nested under cmake/meson/custom builds
+    builder_jobserver_env(pkg->build_system, main_install_dir, env, sizeof(env));
+
     // Apply package-specific environment variables
     if (pkg->env_count > 0) {
         for (size_t i = 0; i < pkg->env_count; i++) {
@@ -661,10 +1045,15 @@ bool builder_build(BuilderConfig *config, Package *pkg, const char *source_dir,
                 }
             }
         }
+        // Build in parallel unless the package pins its own job count
+        char jobs_flag[32] = "";
+        if (!builder_has_jobs_arg(pkg->make_args, pkg->make_args_count)) {
+            snprintf(jobs_flag, sizeof(jobs_flag), " -j%d", builder_get_jobs());
+        }
         if (cflags_env) {
-            snprintf(cmd, cmd_len, "cd '%s' && %s make CFLAGS='%s'", source_dir, env, cflags_env);
+            snprintf(cmd, cmd_len, "cd '%s' && %s make%s CFLAGS='%s'", source_dir, env, jobs_flag, cflags_env);
         } else {
-            snprintf(cmd, cmd_len, "cd '%s' && %s make", source_dir, env);
+            snprintf(cmd, cmd_len, "cd '%s' && %s make%s", source_dir, env, jobs_flag);
         }
         for (size_t i = 0; i < pkg->make_args_count; i++) {
             size_t needed = strlen(cmd) + strlen(pkg->make_args[i]) + 2;
@@ -691,10 +1080,15 @@ bool builder_build(BuilderConfig *config, Package *pkg, const char *source_dir,
     } else if (strcmp(build_system, "cmake") == 0) {
         // CMake configure
         log_debug("Running cmake configure for package: %s", pkg->name);
-        size_t cmd_len = 1024;
+        char generator_args[1200];
+        builder_cmake_generator_args(pkg, main_install_dir, build_dir, generator_args, sizeof(generator_args));
+        char launcher_args[2200];
+        builder_compiler_cache_cmake_args(main_install_dir, launcher_args, sizeof(launcher_args));
+        size_t cmd_len = strlen(env) + strlen(generator_args) + strlen(launcher_args) + strlen(source_dir) +
+                         2 * strlen(build_dir) + strlen(config->install_dir) + 128;
         char *cmd = malloc(cmd_len);
-        snprintf(cmd, cmd_len, "cd '%s' && %s cmake -S '%s' -B '%s' -DCMAKE_INSTALL_PREFIX='%s'",
-                 build_dir, env, source_dir, build_dir, config->install_dir);
+        snprintf(cmd, cmd_len, "cd '%s' && %s cmake -S '%s' -B '%s'%s%s -DCMAKE_INSTALL_PREFIX='%s'",
+                 build_dir, env, source_dir, build_dir, generator_args, launcher_args, config->install_dir);
         for (size_t i = 0; i < pkg->cmake_args_count; i++) {
             size_t needed = strlen(cmd) + strlen(pkg->cmake_args[i]) + 2;
             if (needed > cmd_len) {
@@ -715,7 +1109,11 @@ bool builder_build(BuilderConfig *config, Package *pkg, const char *source_dir,
         log_debug("Running cmake build for package: %s", pkg->name);
         cmd_len = 1024;
         cmd = malloc(cmd_len);
-        snprintf(cmd, cmd_len, "cd '%s' && %s cmake --build '%s'", build_dir, env, build_dir);
+        if (builder_has_jobs_arg(pkg->make_args, pkg->make_args_count)) {
+            snprintf(cmd, cmd_len, "cd '%s' && %s cmake --build '%s'", build_dir, env, build_dir);
+        } else {
+            snprintf(cmd, cmd_len, "cd '%s' && %s cmake --build '%s' --parallel %d", build_dir, env, build_dir, builder_get_jobs());
+        }
         for (size_t i = 0; i < pkg->make_args_count; i++) {
             size_t needed = strlen(cmd) + strlen(pkg->make_args[i]) + 2;
             if (needed > cmd_len) {
@@ -737,7 +1135,11 @@ bool builder_build(BuilderConfig *config, Package *pkg, const char *source_dir,
         log_debug("Running make for package: %s", pkg->name);
         size_t cmd_len = 1024;
         char *cmd = malloc(cmd_len);
-        snprintf(cmd, cmd_len, "cd '%s' && %s make", source_dir, env);
+        if (builder_has_jobs_arg(pkg->make_args, pkg->make_args_count)) {
+            snprintf(cmd, cmd_len, "cd '%s' && %s make", source_dir, env);
+        } else {
+            snprintf(cmd, cmd_len, "cd '%s' && %s make -j%d", source_dir, env, builder_get_jobs());
+        }
         for (size_t i = 0; i < pkg->make_args_count; i++) {
             size_t needed = strlen(cmd) + strlen(pkg->make_args[i]) + 2;
             if (needed > cmd_len) {
@@ -773,15 +1175,20 @@ bool builder_build(BuilderConfig *config, Package *pkg, const char *source_dir,
             return false;
         }
 
-        // Meson compile
+        // Meson compile (run ninja directly when available; meson compile wraps it anyway)
         log_debug("Running meson compile for package: %s", pkg->name);
-        cmd_len = 1024;
+        cmd_len = 2048;
         cmd = malloc(cmd_len);
         if (!cmd) {
             log_error("Failed to allocate memory for meson compile command");
             return false;
         }
-        snprintf(cmd, cmd_len, "cd '%s' && %s meson compile -C '%s'", build_dir, env, build_dir);
+        const char *ninja = builder_find_tool("ninja", main_install_dir);
+        if (ninja) {
+            snprintf(cmd, cmd_len, "cd '%s' && %s '%s' -C '%s' -j %d", build_dir, env, ninja, build_dir, builder_get_jobs());
+        } else {
+            snprintf(cmd, cmd_len, "cd '%s' && %s meson compile -C '%s' -j %d", build_dir, env, build_dir, builder_get_jobs());
+        }
         result = execute_build_command(cmd, "meson compile", pkg->name);
         free(cmd);
         if (result != 0) {
@@ -861,6 +1268,9 @@ bool builder_install(BuilderConfig *config, Package *pkg, const char *source_dir
         log_error("builder_install called with invalid parameters");
         return false;
     }
+    if (!package_load_build_config(pkg)) {
+        return false;
+    }
 
     log_info("Installing package: %s@%s (install_dir=%s)",
              pkg->name, pkg->version ? pkg->version : "latest", config->install_dir);
@@ -26,6 +26,28 @@ bool builder_install_with_output(BuilderConfig *config, Package *pkg, const char
 bool builder_create_symlinks(const BuilderConfig *config, const char *package_name, const char *package_version);
 bool builder_apply_patches(const char *source_dir, char **patches, size_t patches_count);
 
+// Number of parallel build jobs (tsi.cfg "jobs", or number of online CPUs)
+int builder_get_jobs(void);
+// Override the number of parallel build jobs (e.g. for builds running side by side)
+void builder_set_jobs(int jobs);
+// Whether a package provides build tools that other builds use implicitly from PATH
+bool builder_is_build_tool(const char *name);
+// Whether build args already request a job count (-j/--jobs/--parallel)
+bool builder_has_jobs_arg(char **args, size_t args_count);
+// Find a build tool (TSI-installed first, system unless strict isolation); returns NULL if not found
+const char* builder_find_tool(const char *tool_name, const char *main_install_dir);
+// Find the compiler cache to use (tsi.cfg "compiler_cache", default: sccache or ccache)
+const char* builder_find_compiler_cache(const char *main_install_dir);
+// Append CC/CXX compiler cache wrappers and cache dir to a build env string
+void builder_compiler_cache_env(const char *prefix, const char *main_install_dir, char *env, size_t env_size);
+// Append MAKEFLAGS with a GNU make jobserver (cmake/meson/custom builds) to a build env string
+void builder_jobserver_env(const char *build_system, const char *main_install_dir, char *env, size_t env_size);
+// Fill args with CMake compiler launcher arguments ("" = no compiler cache)
+void builder_compiler_cache_cmake_args(const char *main_install_dir, char *args, size_t size);
+// Fill generator_args with the cmake -G arguments to use for build_dir ("" = CMake default)
+void builder_cmake_generator_args(Package *pkg, const char *main_install_dir, const char *build_dir,
+                                  char *generator_args, size_t size);
+
 #ifdef __cplusplus
 }
 #endif
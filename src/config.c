@@ -20,6 +20,9 @@
 // This is initialized with defaults and loaded from tsi.cfg at startup
 static TsiConfig g_config = {
     .strict_isolation = false,
+    .jobs = 0,
+    .cmake_generator = "",
+    .compiler_cache = "",
     .initialized = false
 };
 
@@ -80,6 +83,21 @@ static bool config_create_default(const char *tsi_prefix) {
     fprintf(fp, "# During bootstrap, minimal system tools (gcc, /bin/sh) are still used\n");
     fprintf(fp, "# Set to 'true' to enable strict isolation, 'false' to disable (default)\n");
     fprintf(fp, "strict_isolation=false\n");
+    fprintf(fp, "\n");
+    fprintf(fp, "# Parallel Build Jobs\n");
+    fprintf(fp, "# Number of jobs passed to make/cmake/meson when building packages\n");
+    fprintf(fp, "# Set to '0' to use the number of online CPUs (default)\n");
+    fprintf(fp, "jobs=0\n");
+    fprintf(fp, "\n");
+    fprintf(fp, "# CMake Generator\n");
+    fprintf(fp, "# 'auto' uses Ninja when it is installed, otherwise CMake's default\n");
+    fprintf(fp, "# Any other value is passed to cmake -G (e.g. 'Unix Makefiles')\n");
+    fprintf(fp, "cmake_generator=auto\n");
+    fprintf(fp, "\n");
+    fprintf(fp, "# Compiler Cache\n");
+    fprintf(fp, "# 'auto' wraps compilers with sccache or ccache when installed\n");
+    fprintf(fp, "# Set to 'ccache' or 'sccache' to pick one, 'none' to disable\n");
+    fprintf(fp, "compiler_cache=auto\n");
 
     fclose(fp);
     log_info("Created default config file: %s", config_path);
@@ -177,6 +195,41 @@ bool config_load(const char *tsi_prefix) {
                 log_warning("Invalid value for strict_isolation in config: %s (expected true/false/1/0/yes/no)", value);
             }
         }
+
+        // Parse jobs
+        if (strcmp(key, "jobs") == 0) {
+            char *end = NULL;
+            long jobs = strtol(value, &end, 10);
+            if (end != value && *end == '\0' && jobs >= 0 && jobs <= 1024) {
+                g_config.jobs = (int)jobs;
+                log_debug("Parallel build jobs set to %d in config", g_config.jobs);
+            } else {
+                log_warning("Invalid value for jobs in config: %s (expected a number, 0 = auto)", value);
+            }
+        }
+
+        // Parse cmake_generator
+        if (strcmp(key, "cmake_generator") == 0) {
+            if (strcmp(value, "auto") == 0) {
+                g_config.cmake_generator[0] = '\0';
+            } else {
+                strncpy(g_config.cmake_generator, value, sizeof(g_config.cmake_generator) - 1);
+                g_config.cmake_generator[sizeof(g_config.cmake_generator) - 1] = '\0';
+                log_debug("CMake generator set to '%s' in config", g_config.cmake_generator);
+            }
+        }
+
+        // Parse compiler_cache
+        if (strcmp(key, "compiler_cache") == 0) {
+            if (strcmp(value, "auto") == 0) {
+                g_config.compiler_cache[0] = '\0';
+            } else if (strcmp(value, "none") == 0 || strcmp(value, "ccache") == 0 || strcmp(value, "sccache") == 0) {
+                strcpy(g_config.compiler_cache, value);
+                log_debug("Compiler cache set to '%s' in config", g_config.compiler_cache);
+            } else {
+                log_warning("Invalid value for compiler_cache in config: %s (expected auto/ccache/sccache/none)", value);
+            }
+        }
     }
 
     fclose(fp);
@@ -185,6 +238,18 @@ bool config_load(const char *tsi_prefix) {
     return true;
 }
 
+int config_get_jobs(void) {
+    return g_config.jobs;
+}
+
+const char* config_get_cmake_generator(void) {
+    return g_config.cmake_generator[0] != '\0' ? g_config.cmake_generator : NULL;
+}
+
+const char* config_get_compiler_cache(void) {
+    return g_config.compiler_cache[0] != '\0' ? g_config.compiler_cache : NULL;
+}
+
 bool config_is_strict_isolation(void) {
     if (!g_config.initialized) {
         // If not initialized, return false (default)
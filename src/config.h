@@ -21,6 +21,9 @@ extern "C" {
 // Configuration structure
 typedef struct {
     bool strict_isolation;  // Strict isolation mode (only TSI packages after bootstrap)
+    int jobs;                // Parallel build jobs (0 = number of online CPUs)
+    char cmake_generator[64]; // CMake generator ("" = Ninja when available)
+    char compiler_cache[32];  // Compiler cache ("" = sccache/ccache when available, "none" = off)
     bool initialized;        // Whether config has been loaded
 } TsiConfig;
 
@@ -34,6 +37,15 @@ bool config_load(const char *tsi_prefix);
 // Check if strict isolation is enabled
 bool config_is_strict_isolation(void);
 
+// Get configured number of parallel build jobs (0 = auto-detect)
+int config_get_jobs(void);
+
+// Get configured CMake generator, or NULL to auto-select (Ninja when available)
+const char* config_get_cmake_generator(void);
+
+// Get configured compiler cache ("none", a tool name), or NULL to auto-detect
+const char* config_get_compiler_cache(void);
+
 // Get config file path
 void config_get_path(char *path, size_t size, const char *tsi_prefix);
 
@@ -6,6 +6,7 @@
 #include <sys/stat.h>
 #include <unistd.h>
 #include <dirent.h>
+#include <fcntl.h>
 
 Database* database_new(const char *db_dir) {
     log_developer("database_new called with db_dir='%s'", db_dir);
@@ -53,24 +54,132 @@ Database* database_new(const char *db_dir) {
     return db;
 }
 
+static void installed_package_free(InstalledPackage *pkg) {
+    free(pkg->name);
+    free(pkg->version);
+    free(pkg->install_path);
+    for (size_t j = 0; j < pkg->dependencies_count; j++) {
+        free(pkg->dependencies[j]);
+    }
+    free(pkg->dependencies);
+}
+
+static void database_clear_changes(Database *db) {
+    for (size_t i = 0; i < db->changed_count; i++) {
+        free(db->changed[i]);
+    }
+    free(db->changed);
+    db->changed = NULL;
+    db->changed_count = 0;
+}
+
 void database_free(Database *db) {
     if (!db) return;
 
     free(db->db_path);
 
     for (size_t i = 0; i < db->packages_count; i++) {
-        free(db->packages[i].name);
-        free(db->packages[i].version);
-        free(db->packages[i].install_path);
-        for (size_t j = 0; j < db->packages[i].dependencies_count; j++) {
-            free(db->packages[i].dependencies[j]);
-        }
-        free(db->packages[i].dependencies);
+        installed_package_free(&db->packages[i]);
     }
     free(db->packages);
+    free(db->name_index);
+    database_clear_changes(db);
     free(db);
 }
 
+// FNV-1a hash of a package name for the name index
+static size_t name_hash(const char *name) {
+    size_t hash = 2166136261u;
+    for (const unsigned char *p = (const unsigned char *)name; *p; p++) {
+        hash ^= *p;
+        hash *= 16777619u;
+    }
+    return hash;
+}
+
+// Rebuild the name -> package index after packages were loaded, added or removed.
+// Dependency walks ask about the same names over and over; the index turns each
+// question into a hash probe instead of a scan over every installed package.
+static void database_rebuild_index(Database *db) {
+    free(db->name_index);
+    db->name_index = NULL;
+    db->name_index_size = 0;
+    if (db->packages_count == 0) return;
+
+    size_t size = 16;
+    while (size < db->packages_count * 2) size *= 2;
+    db->name_index = calloc(size, sizeof(size_t));
+    if (!db->name_index) return; // Lookups fall back to scanning
+    db->name_index_size = size;
+
+    for (size_t i = 0; i < db->packages_count; i++) {
+        size_t slot = name_hash(db->packages[i].name) & (size - 1);
+        while (db->name_index[slot] != 0) {
+            slot = (slot + 1) & (size - 1);
+        }
+        db->name_index[slot] = i + 1;
+    }
+}
+
+// Index the package just appended to db->packages. The table is only rebuilt
+// when it has to grow, so recording an install's packages one by one (inside a
+// batch) doesn't rehash every installed package each time.
+static void database_index_appended(Database *db) {
+    size_t size = db->name_index_size;
+    if (size == 0 || db->packages_count * 2 > size) {
+        database_rebuild_index(db);
+        return;
+    }
+    size_t i = db->packages_count - 1;
+    size_t slot = name_hash(db->packages[i].name) & (size - 1);
+    while (db->name_index[slot] != 0) {
+        slot = (slot + 1) & (size - 1);
+    }
+    db->name_index[slot] = i + 1;
+}
+
+// Find a package's position in db->packages, or -1 if it isn't installed
+static long database_find(const Database *db, const char *package_name) {
+    if (db->name_index_size == 0) {
+        for (size_t i = 0; i < db->packages_count; i++) {
+            if (strcmp(db->packages[i].name, package_name) == 0) {
+                return (long)i;
+            }
+        }
+        return -1;
+    }
+
+    size_t mask = db->name_index_size - 1;
+    for (size_t slot = name_hash(package_name) & mask; db->name_index[slot] != 0; slot = (slot + 1) & mask) {
+        size_t i = db->name_index[slot] - 1;
+        if (strcmp(db->packages[i].name, package_name) == 0) {
+            return (long)i;
+        }
+    }
+    return -1;
+}
+
+static bool database_changed(const Database *db, const char *package_name) {
+    for (size_t i = 0; i < db->changed_count; i++) {
+        if (strcmp(db->changed[i], package_name) == 0) {
+            return true;
+        }
+    }
+    return false;
+}
+
+// Remember that package_name was added or removed, for database_merge
+static void database_record_change(Database *db, const char *package_name) {
+    if (database_changed(db, package_name)) return;
+    char **grown = realloc(db->changed, sizeof(char*) * (db->changed_count + 1));
+    if (!grown) return;
+    db->changed = grown;
+    db->changed[db->changed_count] = strdup(package_name);
+    if (db->changed[db->changed_count]) {
+        db->changed_count++;
+    }
+}
+
 // Simple helper to extract quoted string value from a line
 static char* extract_string_value(const char *line, const char *key) {
     char pattern[256];
@@ -102,6 +211,10 @@ static char* extract_string_value(const char *line, const char *key) {
 }
 
 bool database_load(Database *db) {
+    free(db->name_index);
+    db->name_index = NULL;
+    db->name_index_size = 0;
+
     FILE *f = fopen(db->db_path, "r");
     if (!f) {
         db->packages_count = 0;
@@ -270,16 +383,86 @@ bool database_load(Database *db) {
     }
 
     fclose(f);
+    database_rebuild_index(db);
     return true;
 }
 
+// Bring db up to date with the database file before it is overwritten (with
+// the lock held): another tsi process may have saved it since db was loaded.
+// Its records are taken from the file, except for the packages db added or
+// removed itself, which keep db's state.
+static void database_merge(Database *db) {
+    Database disk = {0};
+    disk.db_path = db->db_path;
+    if (!database_load(&disk)) return;
+    free(disk.name_index);
+
+    InstalledPackage *merged = malloc(sizeof(InstalledPackage) * (disk.packages_count + db->packages_count + 1));
+    if (!merged) {
+        for (size_t i = 0; i < disk.packages_count; i++) {
+            installed_package_free(&disk.packages[i]);
+        }
+        free(disk.packages);
+        return;
+    }
+    size_t count = 0;
+    for (size_t i = 0; i < disk.packages_count; i++) {
+        if (database_changed(db, disk.packages[i].name)) {
+            installed_package_free(&disk.packages[i]);
+        } else {
+            merged[count++] = disk.packages[i];
+        }
+    }
+    for (size_t i = 0; i < db->packages_count; i++) {
+        if (database_changed(db, db->packages[i].name)) {
+            merged[count++] = db->packages[i];
+        } else {
+            installed_package_free(&db->packages[i]);
+        }
+    }
+    free(disk.packages);
+    free(db->packages);
+    db->packages = merged;
+    db->packages_count = count;
+    database_rebuild_index(db);
+    database_clear_changes(db);
+}
+
 bool database_save(Database *db) {
     log_debug("Saving database to: %s (%zu packages)", db->db_path, db->packages_count);
-    FILE *f = fopen(db->db_path, "w");
+    // Write to a temporary file and rename it over the database, so an
+    // interrupted save never leaves a truncated installed.json behind
+    char tmp_path[1024];
+    snprintf(tmp_path, sizeof(tmp_path), "%s.tmp", db->db_path);
+
+    // Serialize saves between concurrent tsi processes (POSIX record lock,
+    // released when the lock file is closed). The file is re-read and merged
+    // under the lock, so records saved by another process in the meantime
+    // are kept.
+    char lock_path[1024];
+    snprintf(lock_path, sizeof(lock_path), "%s.lock", db->db_path);
+    int lock_fd = open(lock_path, O_RDWR | O_CREAT, 0644);
+    if (lock_fd >= 0) {
+        struct flock lock = {0};
+        lock.l_type = F_WRLCK;
+        lock.l_whence = SEEK_SET;
+        if (fcntl(lock_fd, F_SETLKW, &lock) != 0) {
+            log_warning("Failed to lock database, saving without lock: %s", lock_path);
+        }
+    } else {
+        log_debug("Could not open database lock file: %s", lock_path);
+    }
+    database_merge(db);
+
+    FILE *f = fopen(tmp_path, "w");
     if (!f) {
-        log_error("Failed to open database file for writing: %s", db->db_path);
+        log_error("Failed to open database file for writing: %s", tmp_path);
+        if (lock_fd >= 0) close(lock_fd);
         return false;
     }
+    // Fully buffered: the whole database normally goes out in a single write()
+    static char write_buffer[64 * 1024];
+    setvbuf(f, write_buffer, _IOFBF, sizeof(write_buffer));
 
     fprintf(f, "{\n");
     fprintf(f, "  \"installed\": [\n");
@@ -305,17 +488,42 @@ bool database_save(Database *db) {
     fprintf(f, "  ]\n");
     fprintf(f, "}\n");
 
-    fclose(f);
+    bool written = fclose(f) == 0 && rename(tmp_path, db->db_path) == 0;
+    if (lock_fd >= 0) close(lock_fd);
+    if (!written) {
+        log_error("Failed to write database file: %s", db->db_path);
+        unlink(tmp_path);
+        return false;
+    }
+    db->dirty = false;
     return true;
 }
 
-bool database_is_installed(const Database *db, const char *package_name) {
-    for (size_t i = 0; i < db->packages_count; i++) {
-        if (strcmp(db->packages[i].name, package_name) == 0) {
-            return true;
-        }
+void database_begin_batch(Database *db) {
+    if (!db) return;
+    db->batch_depth++;
+}
+
+bool database_end_batch(Database *db) {
+    if (!db || db->batch_depth == 0) return false;
+    db->batch_depth--;
+    if (db->batch_depth > 0 || !db->dirty) {
+        return true;
     }
-    return false;
+    return database_save(db);
+}
+
+// Save now, or mark the database dirty when inside a batch
+static bool database_commit(Database *db) {
+    if (db->batch_depth > 0) {
+        db->dirty = true;
+        return true;
+    }
+    return database_save(db);
+}
+
+bool database_is_installed(const Database *db, const char *package_name) {
+    return database_find(db, package_name) >= 0;
 }
 
 bool database_add_package(Database *db, const char *name, const char *version, const char *install_path, const char **deps, size_t deps_count) {
@@ -344,7 +552,9 @@ bool database_add_package(Database *db, const char *name, const char *version, c
     }
 
     db->packages_count++;
-    bool saved = database_save(db);
+    database_index_appended(db);
+    database_record_change(db, name);
+    bool saved = database_commit(db);
     if (saved) {
         log_info("Package added to database: %s@%s", name, version ? version : "latest");
     } else {
@@ -358,14 +568,9 @@ bool database_remove_package(Database *db, const char *package_name) {
     for (size_t i = 0; i < db->packages_count; i++) {
         if (strcmp(db->packages[i].name, package_name) == 0) {
             log_info("Package found in database, removing: %s@%s", db->packages[i].name, db->packages[i].version ? db->packages[i].version : "unknown");
+            database_record_change(db, package_name);
             // Free package data
-            free(db->packages[i].name);
-            free(db->packages[i].version);
-            free(db->packages[i].install_path);
-            for (size_t j = 0; j < db->packages[i].dependencies_count; j++) {
-                free(db->packages[i].dependencies[j]);
-            }
-            free(db->packages[i].dependencies);
+            installed_package_free(&db->packages[i]);
 
             // Move remaining packages
             if (i < db->packages_count - 1) {
@@ -375,7 +580,8 @@ bool database_remove_package(Database *db, const char *package_name) {
 
             db->packages_count--;
             db->packages = realloc(db->packages, sizeof(InstalledPackage) * db->packages_count);
-            bool saved = database_save(db);
+            database_rebuild_index(db);
+            bool saved = database_commit(db);
             if (saved) {
                 log_info("Package removed from database: %s", package_name);
             } else {
@@ -389,12 +595,8 @@ bool database_remove_package(Database *db, const char *package_name) {
 }
 
 InstalledPackage* database_get_package(const Database *db, const char *package_name) {
-    for (size_t i = 0; i < db->packages_count; i++) {
-        if (strcmp(db->packages[i].name, package_name) == 0) {
-            return &db->packages[i];
-        }
-    }
-    return NULL;
+    long i = database_find(db, package_name);
+    return i >= 0 ? &db->packages[i] : NULL;
 }
 
 char** database_list_installed(const Database *db, size_t *count) {
@@ -21,6 +21,12 @@ typedef struct {
     char *db_path;
     InstalledPackage *packages;
     size_t packages_count;
+    int batch_depth;  // > 0 while inside database_begin_batch/database_end_batch
+    bool dirty;       // changes not yet written because of a batch
+    size_t *name_index;       // open-addressing hash table of package index + 1 (0 = empty slot)
+    size_t name_index_size;   // number of slots (power of two, 0 = no index)
+    char **changed;           // names added or removed since the last save, merged into the file on save
+    size_t changed_count;
 } Database;
 
 // Database functions
@@ -28,6 +34,9 @@ Database* database_new(const char *db_dir);
 void database_free(Database *db);
 bool database_load(Database *db);
 bool database_save(Database *db);
+// Defer saves from add/remove until the matching database_end_batch (batches nest)
+void database_begin_batch(Database *db);
+bool database_end_batch(Database *db);
 bool database_is_installed(const Database *db, const char *package_name);
 bool database_add_package(Database *db, const char *name, const char *version, const char *install_path, const char **deps, size_t deps_count);
 bool database_remove_package(Database *db, const char *package_name);
@@ -3,14 +3,21 @@
 #include "log.h"
 #include <stdlib.h>
 #include <string.h>
+#include <strings.h>
 #include <stdio.h>
 #include <sys/stat.h>
 #include <unistd.h>
 #include <dirent.h>
+#include <sys/wait.h>
+#include <errno.h>
+#include <time.h>
 #ifdef __APPLE__
 #include <mach-o/dyld.h>
 #endif
 
+// Partial downloads (<archive>.part) older than this are started over
+#define PARTIAL_DOWNLOAD_MAX_AGE (24 * 60 * 60)
+
 // Helper function to get TSI installation prefix
 // Similar to get_tsi_prefix() in main.c but accessible from fetcher
 static const char *get_tsi_prefix_for_fetcher(void) {
@@ -107,10 +114,27 @@ static bool tool_available(const char *tool_name) {
         }
     }
 
-    // Check system PATH using command -v
+    // Check system PATH using command -v (remembered: PATH doesn't change during a run)
+    static struct {
+        char name[32];
+        bool available;
+    } path_cache[16];
+    static size_t path_cache_count = 0;
+    for (size_t i = 0; i < path_cache_count; i++) {
+        if (strcmp(path_cache[i].name, tool_name) == 0) {
+            return path_cache[i].available;
+        }
+    }
+
     char cmd[256];
     snprintf(cmd, sizeof(cmd), "command -v %s >/dev/null 2>&1", tool_name);
-    return system(cmd) == 0;
+    bool available = system(cmd) == 0;
+    if (path_cache_count < sizeof(path_cache) / sizeof(path_cache[0]) && strlen(tool_name) < sizeof(path_cache[0].name)) {
+        strcpy(path_cache[path_cache_count].name, tool_name);
+        path_cache[path_cache_count].available = available;
+        path_cache_count++;
+    }
+    return available;
 }
 
 // Check if wget is BusyBox version (doesn't support --progress option)
@@ -304,6 +328,62 @@ void fetcher_free(SourceFetcher *fetcher) {
     free(fetcher);
 }
 
+// Compute the SHA-256 of a file with sha256sum (or shasum -a 256 on macOS)
+static bool file_sha256(const char *path, char *hex, size_t hex_size) {
+    char cmd[1200];
+    if (tool_available("sha256sum")) {
+        snprintf(cmd, sizeof(cmd), "%s '%s' 2>/dev/null", find_tool("sha256sum"), path);
+    } else if (tool_available("shasum")) {
+        snprintf(cmd, sizeof(cmd), "%s -a 256 '%s' 2>/dev/null", find_tool("shasum"), path);
+    } else {
+        log_warning("No sha256sum or shasum available, cannot verify: %s", path);
+        return false;
+    }
+
+    FILE *fp = popen(cmd, "r");
+    if (!fp) return false;
+    char line[1300];
+    bool ok = fgets(line, sizeof(line), fp) != NULL;
+    pclose(fp);
+    if (!ok || hex_size < 65) return false;
+
+    size_t len = strspn(line, "0123456789abcdefABCDEF");
+    if (len != 64) return false;
+    memcpy(hex, line, 64);
+    hex[64] = '\0';
+    return true;
+}
+
+// Check a downloaded archive against the sha256 from the package definition
+static bool verify_sha256(const char *path, const char *expected) {
+    char actual[65];
+    if (!file_sha256(path, actual, sizeof(actual))) {
+        return false;
+    }
+    if (strcasecmp(actual, expected) != 0) {
+        log_debug("SHA-256 mismatch for %s: expected %s, got %s", path, expected, actual);
+        return false;
+    }
+    return true;
+}
+
+// Whether the partial download at part is worth resuming. Empty ones and ones
+// left untouched for longer than PARTIAL_DOWNLOAD_MAX_AGE (the file on the
+// server has likely changed since) are removed instead.
+static bool partial_download_resumable(const char *part) {
+    struct stat st;
+    if (stat(part, &st) != 0) {
+        return false;
+    }
+    if (st.st_size == 0 || time(NULL) - st.st_mtime > PARTIAL_DOWNLOAD_MAX_AGE) {
+        log_debug("Discarding stale partial download: %s", part);
+        unlink(part);
+        return false;
+    }
+    log_info("Resuming partial download: %s (%ld bytes)", part, (long)st.st_size);
+    return true;
+}
+
 bool fetcher_download_file(const char *url, const char *dest) {
     log_debug("Downloading file: %s -> %s", url, dest);
 
@@ -317,54 +397,84 @@ bool fetcher_download_file(const char *url, const char *dest) {
     // Check if stdout is a TTY to determine if we should show progress
     bool show_progress = isatty(STDOUT_FILENO);
 
-    char cmd[1024];
-    char *tool_path;
-    const char *tool_name;
-
-    // Select tool and build command
-    if (tool == DOWNLOAD_TOOL_WGET) {
-        tool_path = find_tool("wget");
-        tool_name = "wget";
-
-        // Check if this is BusyBox wget (doesn't support --progress)
-        bool busybox_wget = is_busybox_wget(tool_path);
-
-        if (show_progress && !busybox_wget) {
-            // GNU wget with progress bar
-            snprintf(cmd, sizeof(cmd), "%s --progress=bar:force -O '%s' '%s' 2>&1", tool_path, dest, url);
-        } else if (show_progress && busybox_wget) {
-            // BusyBox wget - use verbose mode instead (shows progress)
-            snprintf(cmd, sizeof(cmd), "%s -O '%s' '%s' 2>&1", tool_path, dest, url);
-        } else {
-            // wget quiet mode
-            snprintf(cmd, sizeof(cmd), "%s -q -O '%s' '%s' 2>/dev/null", tool_path, dest, url);
-        }
-    } else { // DOWNLOAD_TOOL_CURL
-        tool_path = find_tool("curl");
-        tool_name = "curl";
-        if (show_progress) {
-            // curl with progress bar (# shows progress)
-            snprintf(cmd, sizeof(cmd), "%s -# -fSL -o '%s' '%s' 2>&1", tool_path, dest, url);
-        } else {
-            // curl quiet mode
-            snprintf(cmd, sizeof(cmd), "%s -fsSL -o '%s' '%s' 2>/dev/null", tool_path, dest, url);
+    // Download into <dest>.part and rename on success, so an interrupted
+    // download is resumed by the next attempt instead of starting over
+    char part[1024];
+    snprintf(part, sizeof(part), "%s.part", dest);
+    struct stat st;
+    bool resume = partial_download_resumable(part);
+    // A previous complete download is only replaced if the server has a newer one
+    bool have_dest = stat(dest, &st) == 0 && st.st_size > 0;
+
+    char cmd[2048];
+    const char *tool_path = find_tool(tool == DOWNLOAD_TOOL_WGET ? "wget" : "curl");
+    const char *tool_name = tool == DOWNLOAD_TOOL_WGET ? "wget" : "curl";
+    // Check if this is BusyBox wget (doesn't support --progress)
+    bool busybox_wget = tool == DOWNLOAD_TOOL_WGET && is_busybox_wget(tool_path);
+
+    while (true) {
+        // Select tool and build command
+        if (tool == DOWNLOAD_TOOL_WGET) {
+            const char *continue_flag = resume ? "-c " : "";
+            if (show_progress && !busybox_wget) {
+                // GNU wget with progress bar
+                snprintf(cmd, sizeof(cmd), "%s %s--progress=bar:force -O '%s' '%s' 2>&1", tool_path, continue_flag, part, url);
+            } else if (show_progress && busybox_wget) {
+                // BusyBox wget - use verbose mode instead (shows progress)
+                snprintf(cmd, sizeof(cmd), "%s %s-O '%s' '%s' 2>&1", tool_path, continue_flag, part, url);
+            } else {
+                // wget quiet mode
+                snprintf(cmd, sizeof(cmd), "%s -q %s-O '%s' '%s' 2>/dev/null", tool_path, continue_flag, part, url);
+            }
+        } else { // DOWNLOAD_TOOL_CURL
+            // Conditional GET (If-Modified-Since from the existing file, -R keeps server mtimes)
+            const char *cond_start = have_dest ? "-z '" : "";
+            const char *cond_file = have_dest ? dest : "";
+            const char *cond_end = have_dest ? "' " : "";
+            const char *continue_flag = resume ? "-C - " : "";
+            if (show_progress) {
+                // curl with progress bar (# shows progress)
+                snprintf(cmd, sizeof(cmd), "%s -# -fSL -R %s%s%s%s-o '%s' '%s' 2>&1", tool_path, continue_flag, cond_start, cond_file, cond_end, part, url);
+            } else {
+                // curl quiet mode
+                snprintf(cmd, sizeof(cmd), "%s -fsSL -R %s%s%s%s-o '%s' '%s' 2>/dev/null", tool_path, continue_flag, cond_start, cond_file, cond_end, part, url);
+            }
         }
-    }
 
-    log_debug("Using %s to download: %s", tool_name, url);
+        log_debug("Using %s to download: %s", tool_name, url);
 
-    // Execute download
-    int result = system(cmd);
-    if (result == 0) {
-        struct stat st;
-        if (stat(dest, &st) == 0 && st.st_size > 0) {
-            log_info("File downloaded successfully using %s: %s (%ld bytes)", tool_name, dest, (long)st.st_size);
-            return true;
-        } else {
-            log_error("Download completed but file is empty or missing: %s", dest);
-            return false;
+        // Execute download
+        int result = system(cmd);
+        if (result == 0) {
+            if (stat(part, &st) == 0 && st.st_size > 0) {
+                if (rename(part, dest) != 0) {
+                    log_error("Failed to move downloaded file into place: %s -> %s", part, dest);
+                    return false;
+                }
+                log_info("File downloaded successfully using %s: %s (%ld bytes)", tool_name, dest, (long)st.st_size);
+                return true;
+            } else if (have_dest && tool == DOWNLOAD_TOOL_CURL) {
+                // 304 Not Modified: curl leaves the output file untouched
+                unlink(part);
+                log_info("File not modified on server, reusing: %s", dest);
+                return true;
+            } else {
+                log_error("Download completed but file is empty or missing: %s", part);
+                unlink(part);
+                return false;
+            }
         }
-    } else {
+
+        if (resume) {
+            // The server may not support byte ranges (curl exits 33): resuming
+            // would fail on every attempt, so start over once from scratch
+            log_warning("Resuming %s failed (exit code: %d), downloading it from the start", part, result);
+            unlink(part);
+            resume = false;
+            continue;
+        }
+
+        // Keep the partial file so the next attempt can resume it
         log_error("Download failed using %s (exit code: %d)", tool_name, result);
         return false;
     }
@@ -387,6 +497,38 @@ static bool verify_extraction(const char *dest) {
     return file_count > 0;
 }
 
+// Multi-threaded decompressor for tar -I, if one is installed (NULL otherwise)
+static const char *parallel_decompressor(ArchiveFormat format) {
+    static char prog[1100];
+    switch (format) {
+        case ARCHIVE_FORMAT_GZIP:
+            if (tool_available("pigz")) {
+                snprintf(prog, sizeof(prog), "%s", find_tool("pigz"));
+                return prog;
+            }
+            break;
+        case ARCHIVE_FORMAT_XZ:
+            // xz >= 5.4 decompresses multi-block archives in parallel with -T0
+            if (tool_available("xz")) {
+                snprintf(prog, sizeof(prog), "%s -T0", find_tool("xz"));
+                return prog;
+            }
+            break;
+        case ARCHIVE_FORMAT_BZIP2:
+            if (tool_available("lbzip2")) {
+                snprintf(prog, sizeof(prog), "%s", find_tool("lbzip2"));
+                return prog;
+            } else if (tool_available("pbzip2")) {
+                snprintf(prog, sizeof(prog), "%s", find_tool("pbzip2"));
+                return prog;
+            }
+            break;
+        default:
+            break;
+    }
+    return NULL;
+}
+
 bool fetcher_extract_tarball(const char *archive, const char *dest) {
     // Verify archive exists and is not empty
     struct stat st;
@@ -414,6 +556,21 @@ bool fetcher_extract_tarball(const char *archive, const char *dest) {
     char *gzip_path = find_tool("gzip");
     char *xz_path = find_tool("xz");
 
+    // Prefer a parallel decompressor piped into tar; on failure fall back to
+    // tar's built-in decompression below
+    const char *decompressor = parallel_decompressor(format);
+    if (decompressor) {
+        log_debug("Extracting with tar -I '%s'", decompressor);
+        char fast_cmd[4096];
+        snprintf(fast_cmd, sizeof(fast_cmd), "%s -I '%s' -xf '%s' -C '%s' 2>'%s'", tar_path, decompressor, archive, dest, error_file);
+        if (system(fast_cmd) == 0 && verify_extraction(dest)) {
+            log_info("Extraction successful (%s)", decompressor);
+            unlink(error_file);
+            return true;
+        }
+        log_debug("tar -I '%s' failed, using tar's own decompression", decompressor);
+    }
+
     // Extract using the detected format
     switch (format) {
         case ARCHIVE_FORMAT_XZ:
@@ -585,6 +742,33 @@ bool fetcher_extract_tarball(const char *archive, const char *dest) {
 bool fetcher_clone_git(const char *url, const char *dest, const char *branch, const char *tag, const char *commit) {
     char cmd[1024];
 
+    // A specific commit is usually not the tip, so a --depth 1 clone can't reach
+    // it. Use a blobless partial clone instead: full history metadata, but file
+    // contents are only downloaded for the commit that gets checked out.
+    if (commit) {
+        const char *ref = tag ? tag : branch;
+        char branch_arg[300] = "";
+        if (ref) {
+            snprintf(branch_arg, sizeof(branch_arg), "--branch '%s' ", ref);
+        }
+        snprintf(cmd, sizeof(cmd), "git clone --filter=blob:none --no-checkout %s'%s' '%s' 2>/dev/null", branch_arg, url, dest);
+        if (system(cmd) != 0) {
+            // git < 2.19 (no --filter): fall back to a full clone
+            log_debug("Partial clone failed, retrying with a full clone: %s", url);
+            snprintf(cmd, sizeof(cmd), "rm -rf '%s' && git clone --no-checkout %s'%s' '%s' 2>/dev/null", dest, branch_arg, url, dest);
+            if (system(cmd) != 0) {
+                return false;
+            }
+        }
+
+        snprintf(cmd, sizeof(cmd), "cd '%s' && git checkout -q '%s' 2>/dev/null", dest, commit);
+        if (system(cmd) != 0) {
+            log_error("Failed to check out commit %s from %s", commit, url);
+            return false;
+        }
+        return true;
+    }
+
     // Clone repository
     if (tag) {
         snprintf(cmd, sizeof(cmd), "git clone --depth 1 --branch '%s' '%s' '%s' 2>/dev/null", tag, url, dest);
@@ -594,17 +778,53 @@ bool fetcher_clone_git(const char *url, const char *dest, const char *branch, co
         snprintf(cmd, sizeof(cmd), "git clone --depth 1 '%s' '%s' 2>/dev/null", url, dest);
     }
 
-    if (system(cmd) != 0) {
-        return false;
+    return system(cmd) == 0;
+}
+
+// Source directory for a package: <source_dir>/<name>-<version> (or <name> for "latest")
+static void package_source_dir(const SourceFetcher *fetcher, const Package *pkg, char *path, size_t size) {
+    if (pkg->version && strcmp(pkg->version, "latest") != 0) {
+        snprintf(path, size, "%s/%s-%s", fetcher->source_dir, pkg->name, pkg->version);
+    } else {
+        snprintf(path, size, "%s/%s", fetcher->source_dir, pkg->name);
     }
+}
 
-    // Checkout specific commit if needed
-    if (commit) {
-        snprintf(cmd, sizeof(cmd), "cd '%s' && git checkout '%s' 2>/dev/null", dest, commit);
-        system(cmd);
+// Archive path for a package's source_url
+// Prefix the package name unless the file already carries it, so generic
+// names like v1.2.3.tar.gz from different packages don't collide
+static void package_archive_path(const SourceFetcher *fetcher, const Package *pkg, char *path, size_t size) {
+    const char *archive_name = strrchr(pkg->source_url, '/') ? strrchr(pkg->source_url, '/') + 1 : "archive";
+    if (strncmp(archive_name, pkg->name, strlen(pkg->name)) == 0) {
+        snprintf(path, size, "%s/%s", fetcher->source_dir, archive_name);
+    } else {
+        snprintf(path, size, "%s/%s-%s", fetcher->source_dir, pkg->name, archive_name);
     }
+}
 
-    return true;
+// Archives downloaded (or revalidated) by this run; fetcher_fetch uses them
+// without asking the server again
+static char **fresh_archives = NULL;
+static size_t fresh_archives_count = 0;
+
+static bool archive_is_fresh(const char *archive) {
+    for (size_t i = 0; i < fresh_archives_count; i++) {
+        if (strcmp(fresh_archives[i], archive) == 0) {
+            return true;
+        }
+    }
+    return false;
+}
+
+static void mark_archive_fresh(const char *archive) {
+    if (archive_is_fresh(archive)) return;
+    char **grown = realloc(fresh_archives, (fresh_archives_count + 1) * sizeof(char *));
+    if (!grown) return;
+    fresh_archives = grown;
+    char *copy = strdup(archive);
+    if (copy) {
+        fresh_archives[fresh_archives_count++] = copy;
+    }
 }
 
 char* fetcher_fetch(SourceFetcher *fetcher, Package *pkg, bool force) {
@@ -619,11 +839,7 @@ char* fetcher_fetch(SourceFetcher *fetcher, Package *pkg, bool force) {
 
     // Use version-specific directory if version is specified
     char package_dir[512];
-    if (pkg->version && strcmp(pkg->version, "latest") != 0) {
-        snprintf(package_dir, sizeof(package_dir), "%s/%s-%s", fetcher->source_dir, pkg->name, pkg->version);
-    } else {
-        snprintf(package_dir, sizeof(package_dir), "%s/%s", fetcher->source_dir, pkg->name);
-    }
+    package_source_dir(fetcher, pkg, package_dir, sizeof(package_dir));
     log_developer("Package directory: %s", package_dir);
 
     // Check if already exists
@@ -665,70 +881,88 @@ char* fetcher_fetch(SourceFetcher *fetcher, Package *pkg, bool force) {
 
         // Download archive
         char archive[1024];
-        snprintf(archive, sizeof(archive), "%s/%s", fetcher->source_dir, strrchr(pkg->source_url, '/') ? strrchr(pkg->source_url, '/') + 1 : "archive");
-        log_info("Downloading %s archive: %s -> %s", pkg->source_type, pkg->source_url, archive);
+        package_archive_path(fetcher, pkg, archive, sizeof(archive));
+        bool fresh = archive_is_fresh(archive);
+        if (force && !fresh) {
+            unlink(archive);
+        }
 
-        if (!fetcher_download_file(pkg->source_url, archive)) {
-            log_error("Failed to download archive for package: %s", pkg->name);
+        // An archive that already matches the expected checksum needs no network round trip
+        if (pkg->source_sha256 && stat(archive, &st) == 0 && verify_sha256(archive, pkg->source_sha256)) {
+            log_info("Using cached %s archive (sha256 verified): %s", pkg->source_type, archive);
+        } else if (fresh && pkg->source_sha256 && stat(archive, &st) == 0) {
+            fprintf(stderr, "Error: SHA-256 mismatch for %s\n", archive);
+            log_error("SHA-256 verification failed for package: %s (%s)", pkg->name, archive);
+            unlink(archive);
             return NULL;
+        } else if (fresh && stat(archive, &st) == 0) {
+            log_info("Using %s archive downloaded in this run: %s", pkg->source_type, archive);
+        } else {
+            log_info("Downloading %s archive: %s -> %s", pkg->source_type, pkg->source_url, archive);
+
+            if (!fetcher_download_file(pkg->source_url, archive)) {
+                log_error("Failed to download archive for package: %s", pkg->name);
+                return NULL;
+            }
+
+            if (pkg->source_sha256 && !verify_sha256(archive, pkg->source_sha256)) {
+                fprintf(stderr, "Error: SHA-256 mismatch for %s\n", archive);
+                log_error("SHA-256 verification failed for package: %s (%s)", pkg->name, archive);
+                unlink(archive);
+                return NULL;
+            }
         }
 
-        // Create destination directory
-        char cmd[1024];
-        snprintf(cmd, sizeof(cmd), "mkdir -p '%s'", package_dir);
+        // Extract into a staging directory next to the package directory. If the
+        // archive has a single top-level directory, that directory becomes the
+        // package directory with one rename; otherwise the staging directory
+        // does. The package directory only appears once extraction is complete.
+        char staging[1100];
+        snprintf(staging, sizeof(staging), "%s.extract", package_dir);
+        char cmd[2300];
+        snprintf(cmd, sizeof(cmd), "rm -rf '%s' && mkdir -p '%s'", staging, staging);
         system(cmd);
 
         // Extract
-        log_debug("Extracting archive: %s -> %s", archive, package_dir);
-        if (fetcher_extract_tarball(archive, package_dir)) {
+        log_debug("Extracting archive: %s -> %s", archive, staging);
+        if (fetcher_extract_tarball(archive, staging)) {
             log_info("Successfully extracted archive: %s", package_dir);
-            // Move contents if archive has single top-level directory
-            DIR *dir = opendir(package_dir);
+            DIR *dir = opendir(staging);
+            int count = 0;
+            char single_dir[2200] = "";
             if (dir) {
                 struct dirent *entry;
-                int count = 0;
-                char single_dir[1024] = "";
                 while ((entry = readdir(dir)) != NULL) {
                     if (entry->d_name[0] != '.') {
                         count++;
                         if (count == 1) {
-                            snprintf(single_dir, sizeof(single_dir), "%s/%s", package_dir, entry->d_name);
+                            snprintf(single_dir, sizeof(single_dir), "%s/%s", staging, entry->d_name);
                         }
                     }
                 }
                 closedir(dir);
+            }
 
-                if (count == 1) {
-                    // Move contents up one level
-                    char temp[1024];
-                    snprintf(temp, sizeof(temp), "%s/temp", package_dir);
-                    rename(single_dir, temp);
-
-                    dir = opendir(temp);
-                    if (dir) {
-                        while ((entry = readdir(dir)) != NULL) {
-                            if (entry->d_name[0] != '.') {
-                                char src[1024], dst[1024];
-                                int src_len = snprintf(src, sizeof(src), "%s/%s", temp, entry->d_name);
-                                int dst_len = snprintf(dst, sizeof(dst), "%s/%s", package_dir, entry->d_name);
-                                if (src_len >= 0 && (size_t)src_len < sizeof(src) &&
-                                    dst_len >= 0 && (size_t)dst_len < sizeof(dst)) {
-                                    rename(src, dst);
-                                }
-                            }
-                        }
-                        closedir(dir);
-                    }
-                    rmdir(temp);
-                }
+            struct stat single_st;
+            bool moved;
+            if (count == 1 && stat(single_dir, &single_st) == 0 && S_ISDIR(single_st.st_mode)) {
+                moved = rename(single_dir, package_dir) == 0;
+            } else {
+                moved = rename(staging, package_dir) == 0;
+            }
+            int move_errno = errno;
+            snprintf(cmd, sizeof(cmd), "rm -rf '%s'", staging);
+            system(cmd);
+            if (!moved) {
+                log_error("Failed to move extracted sources into place: %s (%s)", package_dir, strerror(move_errno));
+                return NULL;
             }
 
             return strdup(package_dir);
         } else {
             log_error("Failed to extract archive: %s", archive);
-            // Clean up empty directory created for extraction
-            char cmd[1024];
-            snprintf(cmd, sizeof(cmd), "rmdir '%s' 2>/dev/null", package_dir);
+            // Clean up the staging directory created for extraction
+            snprintf(cmd, sizeof(cmd), "rm -rf '%s'", staging);
             system(cmd);
             return NULL;
         }
@@ -739,9 +973,19 @@ char* fetcher_fetch(SourceFetcher *fetcher, Package *pkg, bool force) {
         }
 
         log_info("Copying local source: %s -> %s", pkg->source_url, package_dir);
-        char cmd[1024];
-        snprintf(cmd, sizeof(cmd), "cp -r '%s' '%s' 2>/dev/null", pkg->source_url, package_dir);
-        if (system(cmd) == 0) {
+        char cmd[2200];
+        // Copy-on-write clone where the filesystem supports it (btrfs, XFS, ...);
+        // GNU cp falls back to a normal copy by itself. Builds write into the
+        // source tree, so hardlinks would not be safe here.
+        snprintf(cmd, sizeof(cmd), "cp -a --reflink=auto '%s' '%s' 2>/dev/null", pkg->source_url, package_dir);
+        bool copied = system(cmd) == 0;
+        if (!copied) {
+            // cp without --reflink (BSD/BusyBox); clear any partial copy first
+            log_debug("cp --reflink=auto not supported, using plain copy");
+            snprintf(cmd, sizeof(cmd), "rm -rf '%s' && cp -r '%s' '%s' 2>/dev/null", package_dir, pkg->source_url, package_dir);
+            copied = system(cmd) == 0;
+        }
+        if (copied) {
             struct stat st;
             if (stat(package_dir, &st) == 0) {
                 log_info("Successfully copied local source: %s", package_dir);
@@ -757,3 +1001,196 @@ char* fetcher_fetch(SourceFetcher *fetcher, Package *pkg, bool force) {
     return NULL;
 }
 
+
+// Whether curl supports --parallel and per-transfer %{exitcode} (7.75+)
+static bool curl_supports_batch(const char *curl_path) {
+    char cmd[1100];
+    snprintf(cmd, sizeof(cmd), "%s --version 2>/dev/null", curl_path);
+    FILE *fp = popen(cmd, "r");
+    if (!fp) return false;
+    char line[256] = "";
+    int major = 0, minor = 0;
+    if (fgets(line, sizeof(line), fp)) {
+        sscanf(line, "curl %d.%d", &major, &minor);
+    }
+    pclose(fp);
+    return major > 7 || (major == 7 && minor >= 75);
+}
+
+// Download the archives of several packages with a single curl invocation.
+// curl keeps connections alive across the transfers of one invocation, so
+// archives from the same host share one TCP connection and TLS handshake
+// instead of paying for a new one per file. Downloads go to <archive>.part
+// like fetcher_download_file; finished ones are moved into place and marked
+// fresh. Failed ones lose their partial file, so the per-package retry starts
+// over instead of resuming from a server that may not support byte ranges.
+static void fetcher_download_batch(SourceFetcher *fetcher, Package **pkgs, size_t count, bool force) {
+    if (!tool_available("curl")) return;
+    char *curl_path = find_tool("curl");
+    if (!curl_supports_batch(curl_path)) {
+        log_debug("curl is too old for batch downloads, downloading archives one by one");
+        return;
+    }
+
+    size_t cmd_size = 1024;
+    char *cmd = malloc(cmd_size);
+    if (!cmd) return;
+    size_t len = (size_t)snprintf(cmd, cmd_size, "%s -Z --parallel-max %d", curl_path, FETCHER_MAX_PARALLEL);
+    size_t batched = 0;
+
+    struct stat st;
+    for (size_t i = 0; i < count; i++) {
+        Package *pkg = pkgs[i];
+        if (!pkg || !pkg->source_type || !pkg->source_url) continue;
+        if (strcmp(pkg->source_type, "tarball") != 0 && strcmp(pkg->source_type, "zip") != 0) continue;
+
+        char package_dir[512];
+        package_source_dir(fetcher, pkg, package_dir, sizeof(package_dir));
+        if (!force && stat(package_dir, &st) == 0) continue;
+
+        char archive[1024];
+        package_archive_path(fetcher, pkg, archive, sizeof(archive));
+        if (force) {
+            unlink(archive);
+        } else if (pkg->source_sha256 && stat(archive, &st) == 0 && verify_sha256(archive, pkg->source_sha256)) {
+            continue;
+        }
+        bool have_archive = stat(archive, &st) == 0 && st.st_size > 0;
+        char part[1100];
+        snprintf(part, sizeof(part), "%s.part", archive);
+        bool resume = partial_download_resumable(part);
+
+        // --next starts a new set of per-transfer options; -w reports each transfer's result
+        size_t need = len + 2 * strlen(archive) + strlen(pkg->source_url) + 128;
+        if (need > cmd_size) {
+            cmd_size = need * 2;
+            char *grown = realloc(cmd, cmd_size);
+            if (!grown) {
+                free(cmd);
+                return;
+            }
+            cmd = grown;
+        }
+        len += (size_t)snprintf(cmd + len, cmd_size - len,
+                                "%s -fsSL -R %s-w '%%{exitcode} %%{filename_effective}\\n' %s%s%s-o '%s' '%s'",
+                                batched > 0 ? " --next" : "", resume ? "-C - " : "",
+                                have_archive ? "-z '" : "", have_archive ? archive : "", have_archive ? "' " : "",
+                                part, pkg->source_url);
+        batched++;
+    }
+
+    if (batched < 2) {
+        // A single archive gains nothing from a shared session
+        free(cmd);
+        return;
+    }
+
+    log_info("Downloading %zu archives in one session", batched);
+    log_developer("Batch download command: %s", cmd);
+    FILE *fp = popen(cmd, "r");
+    free(cmd);
+    if (!fp) {
+        log_warning("Failed to start batch download, downloading archives one by one");
+        return;
+    }
+
+    char line[1200];
+    while (fgets(line, sizeof(line), fp)) {
+        line[strcspn(line, "\n")] = '\0';
+        char *space = strchr(line, ' ');
+        if (!space) continue;
+        *space = '\0';
+        const char *part = space + 1;
+        size_t part_len = strlen(part);
+        if (part_len <= 5 || strcmp(part + part_len - 5, ".part") != 0) {
+            continue;
+        }
+        if (strcmp(line, "0") != 0) {
+            log_warning("Batch download of %s failed (curl exit code %s), it is downloaded again on its own", part, line);
+            unlink(part);
+            continue;
+        }
+
+        char archive[1024];
+        snprintf(archive, sizeof(archive), "%.*s", (int)(part_len - 5), part);
+        if (stat(part, &st) == 0 && st.st_size > 0) {
+            if (rename(part, archive) != 0) {
+                log_warning("Failed to move downloaded file into place: %s -> %s", part, archive);
+                continue;
+            }
+            log_info("File downloaded successfully using curl: %s (%ld bytes)", archive, (long)st.st_size);
+        } else if (stat(archive, &st) == 0 && st.st_size > 0) {
+            // 304 Not Modified: curl leaves the output file untouched
+            unlink(part);
+            log_info("File not modified on server, reusing: %s", archive);
+        } else {
+            unlink(part);
+            continue;
+        }
+        mark_archive_fresh(archive);
+    }
+    pclose(fp);
+}
+
+size_t fetcher_fetch_many(SourceFetcher *fetcher, Package **pkgs, size_t count, bool force, bool *fetched) {
+    if (!fetcher || !pkgs || !fetched) return 0;
+
+    size_t max_workers = count < FETCHER_MAX_PARALLEL ? count : FETCHER_MAX_PARALLEL;
+    pid_t *pids = calloc(count, sizeof(pid_t));
+    if (!pids) {
+        log_error("Failed to allocate memory for parallel fetch");
+        return 0;
+    }
+    for (size_t i = 0; i < count; i++) fetched[i] = false;
+
+    log_debug("Fetching %zu package sources with up to %zu workers", count, max_workers);
+
+    // Archives first, over one shared HTTP session; the workers below then only
+    // extract them (and clone git sources)
+    fetcher_download_batch(fetcher, pkgs, count, force);
+
+    // Each source is fetched in a child process (fetching is mostly waiting on
+    // curl/wget/git/tar); buffered output is flushed first so it isn't duplicated
+    fflush(NULL);
+    size_t next = 0, running = 0, ok_count = 0;
+    while (next < count || running > 0) {
+        while (next < count && running < max_workers) {
+            size_t idx = next++;
+            if (!pkgs[idx]) continue;
+            pid_t pid = fork();
+            if (pid == 0) {
+                // Keep the terminal readable: no interleaved progress bars from workers
+                if (!freopen("/dev/null", "w", stdout)) {
+                    _exit(1);
+                }
+                char *dir = fetcher_fetch(fetcher, pkgs[idx], force);
+                fflush(NULL);
+                _exit(dir ? 0 : 1);
+            } else if (pid < 0) {
+                log_warning("fork failed, fetching %s later: %s", pkgs[idx]->name, strerror(errno));
+                continue;
+            }
+            pids[idx] = pid;
+            running++;
+        }
+        if (running == 0) break;
+
+        int status;
+        pid_t done = wait(&status);
+        if (done < 0) break;
+        for (size_t i = 0; i < count; i++) {
+            if (pids[i] == done) {
+                pids[i] = 0;
+                running--;
+                fetched[i] = WIFEXITED(status) && WEXITSTATUS(status) == 0;
+                if (fetched[i]) ok_count++;
+                log_developer("Parallel fetch of %s %s", pkgs[i]->name, fetched[i] ? "succeeded" : "failed");
+                break;
+            }
+        }
+    }
+
+    free(pids);
+    log_debug("Fetched %zu of %zu package sources in parallel", ok_count, count);
+    return ok_count;
+}
@@ -2,6 +2,7 @@
 #define FETCHER_H
 
 #include <stdbool.h>
+#include <stddef.h>
 #include "package.h"
 
 #ifdef __cplusplus
@@ -13,12 +14,17 @@ typedef struct {
     char *source_dir;
 } SourceFetcher;
 
+// Maximum number of sources fetched at once by fetcher_fetch_many
+#define FETCHER_MAX_PARALLEL 8
+
 // Fetcher functions
 SourceFetcher* fetcher_new(const char *source_dir);
 void fetcher_free(SourceFetcher *fetcher);
 char* fetcher_fetch(SourceFetcher *fetcher, Package *pkg, bool force);
 bool fetcher_download_file(const char *url, const char *dest);
 bool fetcher_extract_tarball(const char *archive, const char *dest);
+// Fetch several package sources concurrently; sets fetched[i] for each success and returns the count
+size_t fetcher_fetch_many(SourceFetcher *fetcher, Package **pkgs, size_t count, bool force, bool *fetched);
 bool fetcher_clone_git(const char *url, const char *dest, const char *branch, const char *tag, const char *commit);
 
 #ifdef __cplusplus
@@ -8,6 +8,7 @@
 #include <dirent.h>
 #include <errno.h>
 #include <limits.h>
+#include <sys/wait.h>
 #ifdef __APPLE__
 #include <mach-o/dyld.h>
 #endif
@@ -115,14 +116,14 @@ static void print_usage(const char *prog_name) {
     printf("TSI - TheSourceInstaller\n");
     printf("Usage: %s <command> [options]\n\n", prog_name);
     printf("Commands:\n");
-    printf("  install [--force] [--prefix PATH] <package>  Install a package\n");
-    printf("  remove <package> [package...]                Remove installed package(s)\n");
-    printf("  list                                         List installed packages\n");
-    printf("  info <package>                               Show package information\n");
-    printf("  versions <package>                           List all available versions\n");
-    printf("  update [--repo URL] [--local PATH]           Update package repository\n");
-    printf("  --help                                       Show this help\n");
-    printf("  --version                                    Show version\n");
+    printf("  install [--force] [--prefix PATH] [--jobs N] <package>  Install a package\n");
+    printf("  remove <package> [package...]                           Remove installed package(s)\n");
+    printf("  list                                                    List installed packages\n");
+    printf("  info <package>                                          Show package information\n");
+    printf("  versions <package>                                      List all available versions\n");
+    printf("  update [--repo URL] [--local PATH]                      Update package repository\n");
+    printf("  --help                                                  Show this help\n");
+    printf("  --version                                               Show version\n");
     printf("\n");
 }
 
@@ -138,6 +139,207 @@ static bool package_name_matches(const char *package_spec, const char *name) {
     return (strcmp(package_spec, name) == 0);
 }
 
+// Look up the package for a build order entry ("package" or "package@version")
+static Package *get_build_order_package(Repository *repo, const char *spec) {
+    const char *at_pos = strchr(spec, '@');
+    if (!at_pos) {
+        return repository_get_package(repo, spec);
+    }
+    char name[256];
+    size_t name_len = (size_t)(at_pos - spec);
+    if (name_len >= sizeof(name)) {
+        return NULL;
+    }
+    memcpy(name, spec, name_len);
+    name[name_len] = '\0';
+    return repository_get_package_version(repo, name, at_pos + 1);
+}
+
+// Whether pkg depends (at runtime or at build time) on one of specs[0..count)
+static bool depends_on_any(Package *pkg, char **specs, size_t count) {
+    size_t deps_count = 0;
+    char **deps = package_get_all_dependencies(pkg, &deps_count);
+    for (size_t d = 0; d < deps_count; d++) {
+        char name[256];
+        const char *at = strchr(deps[d], '@');
+        size_t len = at ? (size_t)(at - deps[d]) : strlen(deps[d]);
+        if (len >= sizeof(name)) continue;
+        memcpy(name, deps[d], len);
+        name[len] = '\0';
+        for (size_t k = 0; k < count; k++) {
+            if (specs[k] && package_name_matches(specs[k], name)) {
+                return true;
+            }
+        }
+    }
+    return false;
+}
+
+// Find the run of dependencies starting at build_order[start] that can go to the
+// parallel scheduler: it stops before the main package, unknown packages and build
+// tools (other builds pick those up implicitly, so they are built on their own).
+// Returns the end index.
+static size_t parallel_segment_end(Repository *repo, Package **order_pkgs, char **build_order, size_t start, size_t count,
+                                   const char *package_name) {
+    size_t end = start;
+    while (end < count) {
+        if (!build_order[end] || package_name_matches(build_order[end], package_name)) break;
+        Package *pkg = order_pkgs ? order_pkgs[end] : get_build_order_package(repo, build_order[end]);
+        if (!pkg || builder_is_build_tool(pkg->name)) break;
+        end++;
+    }
+    return end;
+}
+
+// Record a dependency built by a worker: symlinks and database entry
+static void record_parallel_build(BuilderConfig *builder_config, Database *db, Package *pkg) {
+    log_info("Successfully built and installed dependency: %s@%s", pkg->name, pkg->version ? pkg->version : "latest");
+    builder_config_set_package_dir(builder_config, pkg->name, pkg->version);
+    if (pkg->version) {
+        printf("Installed %s %s\n", pkg->name, pkg->version);
+    } else {
+        printf("Installed %s\n", pkg->name);
+    }
+    builder_create_symlinks(builder_config, pkg->name, pkg->version);
+    database_add_package(db, pkg->name, pkg->version, builder_config->install_dir, (const char **)pkg->dependencies, pkg->dependencies_count);
+}
+
+// Build and install a run of dependencies (in build order) with up to max_parallel
+// forked workers. The run is scheduled as a DAG: every package starts as soon as
+// the packages it depends on within the run are installed, so a slow build only
+// holds back its own dependents. Each worker gets an even share of the build jobs
+// and writes its output to <build_dir>/<pkg>.log; the parent records finished
+// packages (symlinks, database) before starting their dependents.
+static bool build_parallel_dag(BuilderConfig *builder_config, SourceFetcher *fetcher, Database *db,
+                               Package **pkgs, size_t count, size_t max_parallel, bool force,
+                               const bool *prefetched, char ***failed_deps, int *failed_deps_count) {
+    pid_t *pids = calloc(count, sizeof(pid_t));
+    char (*logs)[1024] = calloc(count, sizeof(*logs));
+    size_t *in_degree = calloc(count, sizeof(size_t));
+    bool *edges = calloc(count * count, sizeof(bool)); // edges[i * count + j]: j depends on i
+    bool *started = calloc(count, sizeof(bool));
+    if (!pids || !logs || !in_degree || !edges || !started) {
+        free(pids);
+        free(logs);
+        free(in_degree);
+        free(edges);
+        free(started);
+        return false;
+    }
+    mkdir(builder_config->build_dir, 0755);
+
+    for (size_t j = 0; j < count; j++) {
+        for (size_t i = 0; i < j; i++) {
+            char *name = pkgs[i]->name;
+            if (depends_on_any(pkgs[j], &name, 1)) {
+                edges[i * count + j] = true;
+                in_degree[j]++;
+            }
+        }
+    }
+
+    printf("==> Building %zu dependencies in parallel:", count);
+    for (size_t i = 0; i < count; i++) {
+        printf(" %s", pkgs[i]->name);
+    }
+    printf("\n");
+    fflush(NULL);
+
+    int jobs_per_build = builder_get_jobs() / (int)max_parallel;
+    size_t running = 0, done = 0;
+    bool all_ok = true;
+    while (done < count) {
+        // Start every package whose dependencies are installed (none after a failure)
+        for (size_t i = 0; all_ok && i < count && running < max_parallel; i++) {
+            if (started[i] || in_degree[i] > 0) continue;
+            Package *pkg = pkgs[i];
+            started[i] = true;
+            bool has_version = pkg->version && strcmp(pkg->version, "latest") != 0;
+            char build_dir[1024];
+            if (has_version) {
+                snprintf(build_dir, sizeof(build_dir), "%s/%s-%s", builder_config->build_dir, pkg->name, pkg->version);
+                snprintf(logs[i], sizeof(logs[i]), "%s/%s-%s.log", builder_config->build_dir, pkg->name, pkg->version);
+            } else {
+                snprintf(build_dir, sizeof(build_dir), "%s/%s", builder_config->build_dir, pkg->name);
+                snprintf(logs[i], sizeof(logs[i]), "%s/%s.log", builder_config->build_dir, pkg->name);
+            }
+            log_debug("Starting parallel build of %s (%zu running)", pkg->name, running + 1);
+
+            fflush(NULL);
+            pid_t pid = fork();
+            if (pid == 0) {
+                if (!freopen(logs[i], "w", stdout)) {
+                    _exit(1);
+                }
+                dup2(fileno(stdout), STDERR_FILENO);
+                builder_set_jobs(jobs_per_build);
+
+                char *source_dir = fetcher_fetch(fetcher, pkg, force && !(prefetched && prefetched[i]));
+                bool ok = false;
+                if (source_dir) {
+                    builder_config_set_package_dir(builder_config, pkg->name, pkg->version);
+                    ok = builder_build_with_output(builder_config, pkg, source_dir, build_dir, output_callback, NULL) &&
+                         builder_install_with_output(builder_config, pkg, source_dir, build_dir, output_callback, NULL);
+                }
+                fflush(NULL);
+                _exit(ok ? 0 : 1);
+            } else if (pid < 0) {
+                log_error("fork failed for %s: %s", pkg->name, strerror(errno));
+                fprintf(stderr, "Error: Failed to build dependency\n");
+                fprintf(stderr, "  %s\n", pkg->name);
+                *failed_deps = realloc(*failed_deps, sizeof(char*) * (*failed_deps_count + 1));
+                if (*failed_deps) {
+                    (*failed_deps)[(*failed_deps_count)++] = strdup(pkg->name);
+                }
+                all_ok = false;
+                done++;
+                continue;
+            }
+            pids[i] = pid;
+            running++;
+        }
+        if (running == 0) break; // Nothing left that can run (after a failure)
+
+        int status = 0;
+        pid_t finished = wait(&status);
+        if (finished < 0) break;
+        size_t i = 0;
+        while (i < count && pids[i] != finished) i++;
+        if (i == count) continue;
+        pids[i] = 0;
+        running--;
+        done++;
+
+        Package *pkg = pkgs[i];
+        if (!WIFEXITED(status) || WEXITSTATUS(status) != 0) {
+            fprintf(stderr, "Error: Failed to build dependency\n");
+            fprintf(stderr, "  %s (see %s)\n", pkg->name, logs[i]);
+            log_error("Failed to build dependency: %s@%s (output: %s)", pkg->name, pkg->version ? pkg->version : "latest", logs[i]);
+            *failed_deps = realloc(*failed_deps, sizeof(char*) * (*failed_deps_count + 1));
+            if (*failed_deps) {
+                (*failed_deps)[(*failed_deps_count)++] = strdup(pkg->name);
+            }
+            all_ok = false;
+            continue;
+        }
+
+        record_parallel_build(builder_config, db, pkg);
+        unlink(logs[i]);
+        for (size_t j = 0; j < count; j++) {
+            if (edges[i * count + j]) {
+                in_degree[j]--;
+            }
+        }
+    }
+
+    free(pids);
+    free(logs);
+    free(in_degree);
+    free(edges);
+    free(started);
+    return all_ok && done == count;
+}
+
 static bool run_command_with_window(const char *overview, const char *detail, const char *cmd) {
     if (!cmd || !*cmd) {
         return false;
@@ -229,7 +431,8 @@ static int cmd_remove(int argc, char **argv) {
     int success_count = 0;
     int fail_count = 0;
 
-    // Remove each package
+    // Remove each package (database is written once at the end)
+    database_begin_batch(db);
     for (int i = 0; i < package_count; i++) {
         if (database_remove_package(db, packages[i])) {
             printf("Removed %s\n", packages[i]);
@@ -239,6 +442,7 @@ static int cmd_remove(int argc, char **argv) {
             fail_count++;
         }
     }
+    database_end_batch(db);
 
     database_free(db);
     if (packages) free((void*)packages);
@@ -259,6 +463,14 @@ static int cmd_install(int argc, char **argv) {
             force = true;
         } else if (strcmp(argv[i], "--prefix") == 0 && i + 1 < argc) {
             prefix = argv[++i];
+        } else if (strcmp(argv[i], "--jobs") == 0 && i + 1 < argc) {
+            char *end = NULL;
+            long jobs = strtol(argv[++i], &end, 10);
+            if (end == argv[i] || *end != '\0' || jobs < 1 || jobs > 1024) {
+                fprintf(stderr, "Error: --jobs expects a number between 1 and 1024\n");
+                return 1;
+            }
+            builder_set_jobs((int)jobs);
         } else if (!package_name) {
             // Check for package@version syntax
             char *at_pos = strchr(argv[i], '@');
@@ -285,7 +497,7 @@ static int cmd_install(int argc, char **argv) {
 
     if (!package_name) {
         fprintf(stderr, "Error: package name required\n");
-        fprintf(stderr, "Usage: tsi install [--force] [--prefix PATH] <package>[@version]\n");
+        fprintf(stderr, "Usage: tsi install [--force] [--prefix PATH] [--jobs N] <package>[@version]\n");
         if (package_version) {
             free((char*)package_version);
         }
@@ -357,15 +569,17 @@ static int cmd_install(int argc, char **argv) {
 
     // First verify package exists before proceeding
     // Check if version string is incomplete (ends with dot, is empty, or doesn't match any exact version)
+    // The package is looked up once: the exact version if one is given, else the latest
     bool incomplete_version = false;
+    Package *pkg = NULL;
     if (package_version) {
         size_t version_len = strlen(package_version);
         if (version_len == 0 || package_version[version_len - 1] == '.') {
             incomplete_version = true;
         } else {
             // Check if it's a prefix (doesn't match any exact version but might match some)
-            Package *exact_match = repository_get_package_version(repo, package_name, package_version);
-            if (!exact_match) {
+            pkg = repository_get_package_version(repo, package_name, package_version);
+            if (!pkg) {
                 // Not an exact match - check if any versions start with this prefix
                 size_t versions_count = 0;
                 char **versions = repository_list_versions(repo, package_name, &versions_count);
@@ -388,11 +602,8 @@ static int cmd_install(int argc, char **argv) {
                 }
             }
         }
-    }
-
-    Package *pkg = NULL;
-    if (!incomplete_version) {
-        pkg = package_version ? repository_get_package_version(repo, package_name, package_version) : repository_get_package(repo, package_name);
+    } else {
+        pkg = repository_get_package(repo, package_name);
     }
 
     if (!pkg || incomplete_version) {
@@ -638,7 +849,8 @@ install_package:
     log_debug("Resolving dependencies for package: %s@%s", package_name, package_version ? package_version : "latest");
     log_developer("Installed packages count: %zu", installed_count);
     size_t deps_count = 0;
-    char **deps = resolver_resolve(resolver, package_name, installed, installed_count, &deps_count);
+    Package **deps_resolved = NULL;
+    char **deps = resolver_resolve(resolver, package_name, installed, installed_count, &deps_count, &deps_resolved);
     log_debug("Dependency resolution returned %zu dependencies", deps_count);
 
     if (!deps) {
@@ -765,7 +977,8 @@ install_package:
     }
     size_t build_order_count = 0;
     log_developer("Before resolver_get_build_order: deps=%p, deps_count=%zu, build_order_count=%zu", (void*)deps, deps_count, build_order_count);
-    char **build_order = resolver_get_build_order(resolver, deps, deps_count, &build_order_count);
+    char **build_order = resolver_get_build_order(resolver, deps, deps_resolved, deps_count, &build_order_count);
+    free(deps_resolved);
     log_developer("After resolver_get_build_order: build_order=%p, build_order_count=%zu (address of count: %p)", (void*)build_order, build_order_count, (void*)&build_order_count);
 
     // CRITICAL FIX: If build_order is not NULL but count is 0, use deps_count as fallback
@@ -876,6 +1089,34 @@ install_package:
         return 1;
     }
 
+    // Look up the package of every build order entry once, followed by the main
+    // package. The resolver already skipped installed packages, so the loops
+    // below work from this array alone (no repository or database lookups).
+    Package **order_pkgs = calloc(build_order_count + 1, sizeof(Package*));
+    size_t fetch_count = 0;
+    if (order_pkgs) {
+        for (size_t i = 0; i < build_order_count; i++) {
+            if (build_order[i] && !package_name_matches(build_order[i], package_name)) {
+                order_pkgs[i] = get_build_order_package(repo, build_order[i]);
+                if (order_pkgs[i]) fetch_count++;
+            }
+        }
+        order_pkgs[build_order_count] = package_version ? repository_get_package_version(repo, package_name, package_version) : repository_get_package(repo, package_name);
+        if (order_pkgs[build_order_count]) fetch_count++;
+    }
+
+    // Fetch all sources up front in parallel (fetching is network/IO bound);
+    // the build loop below then finds them in place. Failed fetches are
+    // retried, and reported, by the build loop.
+    bool *prefetched = calloc(build_order_count + 1, sizeof(bool));
+    if (prefetched && order_pkgs && fetch_count > 1) {
+        printf("==> Fetching sources (%zu packages)\n", fetch_count);
+        fetcher_fetch_many(fetcher, order_pkgs, build_order_count + 1, force, prefetched);
+    }
+
+    // Record installed packages in one database write at the end
+    database_begin_batch(db);
+
     // Track failures
     bool has_failures = false;
     int failed_deps_count = 0;
@@ -924,6 +1165,35 @@ install_package:
             continue; // Install main package last
         }
 
+        // Independent dependencies are built side by side when there are enough
+        // cores for at least two builds with two jobs each
+        size_t max_parallel = (size_t)builder_get_jobs() / 2;
+        size_t segment_end = max_parallel > 1 ? parallel_segment_end(repo, order_pkgs, build_order, i, build_order_count, package_name) : i;
+        if (segment_end - i > 1) {
+            Package *segment[segment_end - i];
+            for (size_t k = i; k < segment_end; k++) {
+                segment[k - i] = order_pkgs ? order_pkgs[k] : get_build_order_package(repo, build_order[k]);
+            }
+            // The build order is topological: if every package depends on the one
+            // before it, the run is a chain and gains nothing from the scheduler
+            bool chain = true;
+            for (size_t k = 1; chain && k < segment_end - i; k++) {
+                char *prev_name = segment[k - 1]->name;
+                chain = depends_on_any(segment[k], &prev_name, 1);
+            }
+            if (!chain) {
+                current_dep += segment_end - i;
+                if (!build_parallel_dag(builder_config, fetcher, db, segment, segment_end - i, max_parallel, force,
+                                        prefetched ? prefetched + i : NULL, &failed_deps, &failed_deps_count)) {
+                    has_failures = true;
+                    log_error("Aborting installation due to build failure");
+                    goto cleanup;
+                }
+                i = segment_end - 1;
+                continue;
+            }
+        }
+
         current_dep++;
         if (dependency_count > 1) {
             char dep_msg[256];
@@ -933,26 +1203,7 @@ install_package:
             printf("Installing dependency: %s\n", build_order[i]);
         }
 
-        // Parse package@version from build_order if present
-        char *dep_name = NULL;
-        char *dep_version = NULL;
-        char *at_pos = strchr(build_order[i], '@');
-        if (at_pos) {
-            size_t name_len = at_pos - build_order[i];
-            dep_name = malloc(name_len + 1);
-            if (dep_name) {
-                strncpy(dep_name, build_order[i], name_len);
-                dep_name[name_len] = '\0';
-            }
-            dep_version = strdup(at_pos + 1);
-        } else {
-            dep_name = strdup(build_order[i]);
-        }
-
-        Package *dep_pkg = dep_version ? repository_get_package_version(repo, dep_name ? dep_name : build_order[i], dep_version) : repository_get_package(repo, dep_name ? dep_name : build_order[i]);
-
-        if (dep_name) free(dep_name);
-        if (dep_version) free(dep_version);
+        Package *dep_pkg = order_pkgs ? order_pkgs[i] : get_build_order_package(repo, build_order[i]);
         if (!dep_pkg) {
             char warn_msg[256];
             snprintf(warn_msg, sizeof(warn_msg), "Dependency package not found: %s", build_order[i]);
@@ -970,7 +1221,7 @@ install_package:
 
         // Fetch source
         log_debug("Fetching source for dependency: %s@%s", dep_pkg->name, dep_pkg->version ? dep_pkg->version : "latest");
-        char *dep_source_dir = fetcher_fetch(fetcher, dep_pkg, force);
+        char *dep_source_dir = fetcher_fetch(fetcher, dep_pkg, force && !(prefetched && prefetched[i]));
         if (!dep_source_dir) {
             fprintf(stderr, "Error: Failed to fetch source for %s\n", build_order[i]);
             log_error("Failed to fetch source for dependency: %s@%s", dep_pkg->name, dep_pkg->version ? dep_pkg->version : "latest");
@@ -1072,13 +1323,13 @@ install_package:
     printf("\n");
     printf("Installing: %s\n", package_name);
     log_info("Installing main package: %s@%s", package_name, package_version ? package_version : "latest");
-    Package *main_pkg = package_version ? repository_get_package_version(repo, package_name, package_version) : repository_get_package(repo, package_name);
+    Package *main_pkg = order_pkgs ? order_pkgs[build_order_count] : package_version ? repository_get_package_version(repo, package_name, package_version) : repository_get_package(repo, package_name);
     if (main_pkg) {
         // Set package-specific install directory
         builder_config_set_package_dir(builder_config, main_pkg->name, main_pkg->version);
 
         log_debug("Fetching source for main package: %s@%s", main_pkg->name, main_pkg->version ? main_pkg->version : "latest");
-        char *main_source_dir = fetcher_fetch(fetcher, main_pkg, force);
+        char *main_source_dir = fetcher_fetch(fetcher, main_pkg, force && !(prefetched && prefetched[build_order_count]));
         if (main_source_dir) {
             log_developer("Source fetched for main package: %s@%s -> %s", main_pkg->name, main_pkg->version ? main_pkg->version : "latest", main_source_dir);
             char build_dir[1024];
@@ -1168,6 +1419,10 @@ install_package:
     }
 
 cleanup:
+    free(prefetched);
+    free(order_pkgs);
+    database_end_batch(db);
+
     // Clean up failed dependencies list
     if (failed_deps) {
         for (int i = 0; i < failed_deps_count; i++) {
@@ -1240,23 +1495,16 @@ static int cmd_list(int argc, char **argv) {
         return 1;
     }
 
-    size_t count = 0;
-    char **packages = database_list_installed(db, &count);
-
-    if (count == 0) {
+    // One pass over the loaded records (no per-name lookups)
+    if (db->packages_count == 0) {
         printf("No packages installed.\n");
     } else {
         printf("Installed packages:\n");
-        for (size_t i = 0; i < count; i++) {
-            InstalledPackage *pkg = database_get_package(db, packages[i]);
-            if (pkg) {
-                printf("  %s (%s)\n", pkg->name, pkg->version);
-            }
-            free(packages[i]);
+        for (size_t i = 0; i < db->packages_count; i++) {
+            printf("  %s (%s)\n", db->packages[i].name, db->packages[i].version);
         }
     }
 
-    if (packages) free(packages);
     database_free(db);
     return 0;
 }
@@ -1389,15 +1637,17 @@ static int cmd_info(int argc, char **argv) {
     }
 
     // Check if version string is incomplete (ends with dot, is empty, or doesn't match any exact version)
+    // The package is looked up once: the exact version if one is given, else the latest
     bool incomplete_version = false;
+    Package *pkg = NULL;
     if (version) {
         size_t version_len = strlen(version);
         if (version_len == 0 || version[version_len - 1] == '.') {
             incomplete_version = true;
         } else {
             // Check if it's a prefix (doesn't match any exact version but might match some)
-            Package *exact_match = repository_get_package_version(repo, actual_name, version);
-            if (!exact_match) {
+            pkg = repository_get_package_version(repo, actual_name, version);
+            if (!pkg) {
                 // Not an exact match - check if any versions start with this prefix
                 size_t versions_count = 0;
                 char **versions = repository_list_versions(repo, actual_name, &versions_count);
@@ -1420,11 +1670,8 @@ static int cmd_info(int argc, char **argv) {
                 }
             }
         }
-    }
-
-    Package *pkg = NULL;
-    if (!incomplete_version) {
-        pkg = version ? repository_get_package_version(repo, actual_name, version) : repository_get_package(repo, actual_name);
+    } else {
+        pkg = repository_get_package(repo, actual_name);
     }
 
     if (!pkg || incomplete_version) {
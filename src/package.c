@@ -114,6 +114,7 @@ void package_free(Package *pkg) {
     free(pkg->source_branch);
     free(pkg->source_tag);
     free(pkg->source_commit);
+    free(pkg->source_sha256);
 
     for (size_t i = 0; i < pkg->dependencies_count; i++) {
         free(pkg->dependencies[i]);
@@ -124,6 +125,7 @@ void package_free(Package *pkg) {
         free(pkg->build_dependencies[i]);
     }
     free(pkg->build_dependencies);
+    free(pkg->all_dependencies);
 
     for (size_t i = 0; i < pkg->configure_args_count; i++) {
         free(pkg->configure_args[i]);
@@ -156,13 +158,14 @@ void package_free(Package *pkg) {
         free(pkg->build_commands[i]);
     }
     free(pkg->build_commands);
+    free(pkg->manifest_path);
 
     free(pkg);
 }
 
 bool package_load_from_file(Package *pkg, const char *filename) {
     log_developer("Loading package from file: %s", filename);
-    FILE *f = fopen(filename, "r");
+    FILE *f = fopen(filename, "rb");
     if (!f) {
         log_error("Failed to open package file: %s", filename);
         return false;
@@ -171,15 +174,20 @@ bool package_load_from_file(Package *pkg, const char *filename) {
     fseek(f, 0, SEEK_END);
     long size = ftell(f);
     fseek(f, 0, SEEK_SET);
+    if (size < 0) {
+        fclose(f);
+        return false;
+    }
 
-    char *json = malloc(size + 1);
+    // Read the whole manifest in one call; no text-mode translation
+    char *json = malloc((size_t)size + 1);
     if (!json) {
         fclose(f);
         return false;
     }
 
-    fread(json, 1, size, f);
-    json[size] = '\0';
+    size_t read = fread(json, 1, (size_t)size, f);
+    json[read] = '\0';
     fclose(f);
 
     bool result = package_load_from_json(pkg, json);
@@ -193,7 +201,23 @@ bool package_load_from_file(Package *pkg, const char *filename) {
     return result;
 }
 
-bool package_load_from_json(Package *pkg, const char *json_string) {
+static void package_load_build_config_from(Package *pkg, const char *json_string) {
+    // Build args
+    pkg->configure_args = json_get_array(json_string, "configure_args", &pkg->configure_args_count);
+    pkg->cmake_args = json_get_array(json_string, "cmake_args", &pkg->cmake_args_count);
+    pkg->make_args = json_get_array(json_string, "make_args", &pkg->make_args_count);
+
+    // Patches
+    pkg->patches = json_get_array(json_string, "patches", &pkg->patches_count);
+
+    // Build commands (for custom build system)
+    pkg->build_commands = json_get_array(json_string, "build_commands", &pkg->build_commands_count);
+
+    pkg->build_config_loaded = true;
+}
+
+// Everything but the build configuration
+static void package_load_summary(Package *pkg, const char *json_string) {
     pkg->name = json_get_string(json_string, "name");
     pkg->version = json_get_string(json_string, "version");
     if (!pkg->version) pkg->version = strdup("latest");
@@ -213,6 +237,7 @@ bool package_load_from_json(Package *pkg, const char *json_string) {
         pkg->source_branch = json_get_string(source_start, "branch");
         pkg->source_tag = json_get_string(source_start, "tag");
         pkg->source_commit = json_get_string(source_start, "commit");
+        pkg->source_sha256 = json_get_string(source_start, "sha256");
     } else {
         pkg->source_type = strdup("git");
     }
@@ -221,20 +246,58 @@ bool package_load_from_json(Package *pkg, const char *json_string) {
     pkg->dependencies = json_get_array(json_string, "dependencies", &pkg->dependencies_count);
     pkg->build_dependencies = json_get_array(json_string, "build_dependencies", &pkg->build_dependencies_count);
 
-    // Build args
-    pkg->configure_args = json_get_array(json_string, "configure_args", &pkg->configure_args_count);
-    pkg->cmake_args = json_get_array(json_string, "cmake_args", &pkg->cmake_args_count);
-    pkg->make_args = json_get_array(json_string, "make_args", &pkg->make_args_count);
-
-    // Patches
-    pkg->patches = json_get_array(json_string, "patches", &pkg->patches_count);
+}
 
-    // Build commands (for custom build system)
-    pkg->build_commands = json_get_array(json_string, "build_commands", &pkg->build_commands_count);
+bool package_load_from_json(Package *pkg, const char *json_string) {
+    package_load_summary(pkg, json_string);
+    package_load_build_config_from(pkg, json_string);
+    return pkg->name != NULL;
+}
 
+bool package_load_from_manifest(Package *pkg, const char *json_string, const char *path, long offset, size_t length) {
+    package_load_summary(pkg, json_string);
+    // The build configuration is parsed by package_load_build_config: most
+    // loaded packages are only resolved, listed or searched, never built
+    pkg->manifest_path = strdup(path);
+    pkg->manifest_offset = offset;
+    pkg->manifest_length = length;
+    pkg->build_config_loaded = false;
+    if (!pkg->manifest_path) {
+        package_load_build_config_from(pkg, json_string);
+    }
     return pkg->name != NULL;
 }
 
+bool package_load_build_config(Package *pkg) {
+    if (pkg->build_config_loaded || !pkg->manifest_path) {
+        return true;
+    }
+
+    FILE *f = fopen(pkg->manifest_path, "rb");
+    char *json = f ? malloc(pkg->manifest_length + 1) : NULL;
+    bool ok = json && fseek(f, pkg->manifest_offset, SEEK_SET) == 0 &&
+              fread(json, 1, pkg->manifest_length, f) == pkg->manifest_length;
+    if (f) fclose(f);
+    if (ok) {
+        // The package file may have been edited since the repository was loaded
+        json[pkg->manifest_length] = '\0';
+        size_t end = pkg->manifest_length;
+        while (end > 0 && isspace((unsigned char)json[end - 1])) end--;
+        ok = json[0] == '{' && end > 0 && json[end - 1] == '}';
+    }
+    if (!ok) {
+        log_error("Failed to read build configuration of %s from %s", pkg->name ? pkg->name : "unknown", pkg->manifest_path);
+        free(json);
+        return false;
+    }
+
+    package_load_build_config_from(pkg, json);
+    free(json);
+    free(pkg->manifest_path);
+    pkg->manifest_path = NULL;
+    return true;
+}
+
 bool package_has_dependency(const Package *pkg, const char *dep_name) {
     // Check regular dependencies
     for (size_t i = 0; i < pkg->dependencies_count; i++) {
@@ -251,13 +314,48 @@ bool package_has_dependency(const Package *pkg, const char *dep_name) {
     return false;
 }
 
+char** package_get_all_dependencies(Package *pkg, size_t *count) {
+    size_t total = pkg->dependencies_count + pkg->build_dependencies_count;
+    if (!pkg->all_dependencies && total > 0) {
+        // Resolution and build ordering walk these for every package they
+        // visit, so the merged list is built once and kept on the package
+        char **all = malloc(sizeof(char*) * total);
+        if (!all) {
+            *count = 0;
+            return NULL;
+        }
+        size_t n = 0;
+        for (size_t i = 0; i < total; i++) {
+            char *dep = i < pkg->dependencies_count ? pkg->dependencies[i] : pkg->build_dependencies[i - pkg->dependencies_count];
+            if (!dep) continue;
+            bool seen = false;
+            for (size_t j = 0; j < n && !seen; j++) {
+                seen = strcmp(all[j], dep) == 0;
+            }
+            if (!seen) {
+                all[n++] = dep;
+            }
+        }
+        pkg->all_dependencies = all;
+        pkg->all_dependencies_count = n;
+    }
+    *count = pkg->all_dependencies_count;
+    return pkg->all_dependencies;
+}
+
 void package_add_dependency(Package *pkg, const char *dep_name) {
+    free(pkg->all_dependencies);
+    pkg->all_dependencies = NULL;
+    pkg->all_dependencies_count = 0;
     pkg->dependencies = realloc(pkg->dependencies, sizeof(char*) * (pkg->dependencies_count + 1));
     pkg->dependencies[pkg->dependencies_count] = strdup(dep_name);
     pkg->dependencies_count++;
 }
 
 void package_add_build_dependency(Package *pkg, const char *dep_name) {
+    free(pkg->all_dependencies);
+    pkg->all_dependencies = NULL;
+    pkg->all_dependencies_count = 0;
     pkg->build_dependencies = realloc(pkg->build_dependencies, sizeof(char*) * (pkg->build_dependencies_count + 1));
     pkg->build_dependencies[pkg->build_dependencies_count] = strdup(dep_name);
     pkg->build_dependencies_count++;
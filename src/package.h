@@ -21,12 +21,15 @@ typedef struct {
     char *source_branch;
     char *source_tag;
     char *source_commit;
+    char *source_sha256;
 
     // Dependencies
     char **dependencies;
     size_t dependencies_count;
     char **build_dependencies;
     size_t build_dependencies_count;
+    char **all_dependencies;  // Cache for package_get_all_dependencies (points into the lists above)
+    size_t all_dependencies_count;
 
     // Build configuration
     char **configure_args;
@@ -48,6 +51,14 @@ typedef struct {
     // Custom build commands
     char **build_commands;
     size_t build_commands_count;
+
+    // Build configuration (args, patches, build commands) is only needed when
+    // the package is built: it is parsed on first use from bytes
+    // [manifest_offset, manifest_offset + manifest_length) of manifest_path
+    char *manifest_path;
+    long manifest_offset;
+    size_t manifest_length;
+    bool build_config_loaded;
 } Package;
 
 // Package functions
@@ -55,8 +66,15 @@ Package* package_new(void);
 void package_free(Package *pkg);
 bool package_load_from_file(Package *pkg, const char *filename);
 bool package_load_from_json(Package *pkg, const char *json_string);
+// Like package_load_from_json, but the build configuration is read back from
+// the package file by package_load_build_config (json_string is that range)
+bool package_load_from_manifest(Package *pkg, const char *json_string, const char *path, long offset, size_t length);
+// Parse the build configuration if it isn't yet (false if the package file can't be read)
+bool package_load_build_config(Package *pkg);
 char* package_to_json(const Package *pkg);
 bool package_has_dependency(const Package *pkg, const char *dep_name);
+// Runtime then build dependencies, each spec listed once (computed on first use)
+char** package_get_all_dependencies(Package *pkg, size_t *count);
 void package_add_dependency(Package *pkg, const char *dep_name);
 void package_add_build_dependency(Package *pkg, const char *dep_name);
 
@@ -8,6 +8,7 @@
 #include <sys/stat.h>
 #include <stdint.h>
 #include <limits.h>
+#include <unistd.h>
 
 // Helper function to parse package@version string
 static void parse_package_version(const char *dep_spec, char **name_out, char **version_out) {
@@ -26,48 +27,6 @@ static void parse_package_version(const char *dep_spec, char **name_out, char **
     }
 }
 
-// Simple topological sort for build order
-static int find_package_index(char **packages, size_t count, const char *name) {
-    // Extract package name if it's in package@version format
-    char *pkg_name = NULL;
-    char *pkg_version = NULL;
-    parse_package_version(name, &pkg_name, &pkg_version);
-
-    const char *search_name = pkg_name ? pkg_name : name;
-
-    for (size_t i = 0; i < count; i++) {
-        if (!packages[i]) continue;
-
-        // Extract name from packages[i] if it's in package@version format
-        char *cmp_name = NULL;
-        char *cmp_version = NULL;
-        parse_package_version(packages[i], &cmp_name, &cmp_version);
-
-        const char *cmp_search = cmp_name ? cmp_name : packages[i];
-        bool matches = (strcmp(cmp_search, search_name) == 0);
-
-        // If version was specified, check it matches
-        if (matches && pkg_version && cmp_version) {
-            matches = (strcmp(pkg_version, cmp_version) == 0);
-        } else if (matches && pkg_version && !cmp_version) {
-            matches = false; // Required version not found
-        }
-
-        if (cmp_name) free(cmp_name);
-        if (cmp_version) free(cmp_version);
-
-        if (matches) {
-            if (pkg_name) free(pkg_name);
-            if (pkg_version) free(pkg_version);
-            return (int)i;
-        }
-    }
-
-    if (pkg_name) free(pkg_name);
-    if (pkg_version) free(pkg_version);
-    return -1;
-}
-
 DependencyResolver* resolver_new(Repository *repo) {
     log_developer("resolver_new called");
     DependencyResolver *resolver = malloc(sizeof(DependencyResolver));
@@ -76,102 +35,134 @@ DependencyResolver* resolver_new(Repository *repo) {
         return NULL;
     }
     resolver->repository = repo;
-    resolver->visited = NULL;
-    resolver->visited_count = 0;
-    resolver->visited_capacity = 0;
     log_debug("DependencyResolver initialized");
     return resolver;
 }
 
 void resolver_free(DependencyResolver *resolver) {
-    if (resolver && resolver->visited) {
-        for (size_t i = 0; i < resolver->visited_count; i++) {
-            if (resolver->visited[i]) free(resolver->visited[i]);
-        }
-        free(resolver->visited);
-    }
     free(resolver);
 }
 
+// Whether two package specs ("package" or "package@version") name the same
+// package. Names are compared in place: this runs for every edge of the
+// dependency walk, so it must not allocate.
+static bool spec_names_match(const char *a, const char *b) {
+    const char *a_at = strchr(a, '@');
+    size_t a_len = a_at ? (size_t)(a_at - a) : strlen(a);
+    return strncmp(a, b, a_len) == 0 && (b[a_len] == '\0' || b[a_len] == '@');
+}
+
+// FNV-1a hash of a package name for the name index. A spec's "@version" suffix
+// is not hashed, so "package" and "package@version" land in the same slot.
+static size_t package_name_hash(const char *name) {
+    size_t hash = 2166136261u;
+    for (const unsigned char *p = (const unsigned char *)name; *p && *p != '@'; p++) {
+        hash ^= *p;
+        hash *= 16777619u;
+    }
+    return hash;
+}
+
 // Helper to check if a package name (possibly with @version) matches an installed package
 static bool is_package_installed(const char *package_spec, char **installed, size_t installed_count) {
     if (!package_spec || !installed) return false;
 
-    // Extract package name from package_spec (may be "package@version")
-    char *spec_name = NULL;
-    char *spec_version = NULL;
-    parse_package_version(package_spec, &spec_name, &spec_version);
-    const char *search_name = spec_name ? spec_name : package_spec;
-
     for (size_t i = 0; i < installed_count; i++) {
-        if (!installed[i]) continue;
-
-        // Extract name from installed[i] (may be "package@version")
-        char *inst_name = NULL;
-        char *inst_version = NULL;
-        parse_package_version(installed[i], &inst_name, &inst_version);
-        const char *cmp_name = inst_name ? inst_name : installed[i];
-
         // Match by name (version is optional)
-        bool name_matches = (strcmp(cmp_name, search_name) == 0);
+        if (installed[i] && spec_names_match(package_spec, installed[i])) {
+            return true;
+        }
+    }
+    return false;
+}
 
-        if (inst_name) free(inst_name);
-        if (inst_version) free(inst_version);
+// One package on the explicit DFS stack of resolver_resolve
+typedef struct {
+    const char *spec;  // As written in the dependent's dependency list
+    Package *pkg;
+    size_t next_dep;   // Next entry of package_get_all_dependencies to visit
+} ResolveFrame;
+
+static void free_package_list(char **list, size_t count) {
+    for (size_t i = 0; i < count; i++) free(list[i]);
+    free(list);
+}
 
-        if (name_matches) {
-            if (spec_name) free(spec_name);
-            if (spec_version) free(spec_version);
+// Package names already in the result of resolver_resolve: an open-addressing
+// hash set of result index + 1 (0 = empty slot), so checking a dependency
+// doesn't compare it against every package resolved so far. The build order
+// uses the same set to map dependency specs to package indices.
+typedef struct {
+    size_t *slots;
+    size_t size;  // Power of two, 0 = empty set
+} ResultSet;
+
+static bool result_set_contains(const ResultSet *set, char **result, const char *spec) {
+    if (set->size == 0) return false;
+    size_t mask = set->size - 1;
+    for (size_t slot = package_name_hash(spec) & mask; set->slots[slot] != 0; slot = (slot + 1) & mask) {
+        if (spec_names_match(spec, result[set->slots[slot] - 1])) {
             return true;
         }
     }
-
-    if (spec_name) free(spec_name);
-    if (spec_version) free(spec_version);
     return false;
 }
 
-char** resolver_resolve(DependencyResolver *resolver, const char *package_name, char **installed, size_t installed_count, size_t *result_count) {
+// Index of the first entry of result matching spec, or -1. A spec with
+// "@version" only matches entries with that exact version; a bare name matches
+// any version. Entries are added in order, so along a probe sequence the
+// lower index comes first.
+static long result_set_find(const ResultSet *set, char **result, const char *spec) {
+    if (set->size == 0) return -1;
+    const char *version = strchr(spec, '@');
+    size_t mask = set->size - 1;
+    for (size_t slot = package_name_hash(spec) & mask; set->slots[slot] != 0; slot = (slot + 1) & mask) {
+        const char *entry = result[set->slots[slot] - 1];
+        if (!spec_names_match(spec, entry)) continue;
+        const char *entry_version = strchr(entry, '@');
+        if (!version || (entry_version && strcmp(version, entry_version) == 0)) {
+            return (long)(set->slots[slot] - 1);
+        }
+    }
+    return -1;
+}
+
+// Add result[count - 1] to the set, growing it to stay at most half full
+static bool result_set_add(ResultSet *set, char **result, size_t count) {
+    size_t first = count - 1;
+    if (count * 2 > set->size) {
+        size_t size = set->size ? set->size * 2 : 16;
+        size_t *slots = calloc(size, sizeof(size_t));
+        if (!slots) return false;
+        free(set->slots);
+        set->slots = slots;
+        set->size = size;
+        first = 0;  // Re-insert everything
+    }
+    size_t mask = set->size - 1;
+    for (size_t i = first; i < count; i++) {
+        size_t slot = package_name_hash(result[i]) & mask;
+        while (set->slots[slot] != 0) slot = (slot + 1) & mask;
+        set->slots[slot] = i + 1;
+    }
+    return true;
+}
+
+// Packages are returned as specs; if resolved is not NULL it receives a
+// matching array with the repository package of each spec (free the array only).
+char** resolver_resolve(DependencyResolver *resolver, const char *package_name, char **installed, size_t installed_count, size_t *result_count, Package ***resolved) {
     log_developer("resolver_resolve called for package: %s (installed_count=%zu)", package_name, installed_count);
     *result_count = 0;
-    char **result = NULL;
-    size_t capacity = 0;
+    if (resolved) *resolved = NULL;
 
     if (!resolver) {
         log_error("resolver_resolve called with NULL resolver");
         return NULL;
     }
 
-    // Initialize visited list if needed
-    if (resolver->visited == NULL) {
-        resolver->visited_capacity = 16;
-        resolver->visited = malloc(sizeof(char*) * resolver->visited_capacity);
-        resolver->visited_count = 0;
-    }
-
-    // Check for circular dependency
-    for (size_t i = 0; i < resolver->visited_count; i++) {
-        if (resolver->visited[i] && strcmp(resolver->visited[i], package_name) == 0) {
-            log_error("Circular dependency detected: %s", package_name);
-            *result_count = 0;
-            return NULL;
-        }
-    }
-
-    // Add to visited list
-    if (resolver->visited_count >= resolver->visited_capacity) {
-        resolver->visited_capacity *= 2;
-        resolver->visited = realloc(resolver->visited, sizeof(char*) * resolver->visited_capacity);
-    }
-    resolver->visited[resolver->visited_count++] = strdup(package_name);
-
     // Check if already installed
     if (is_package_installed(package_name, installed, installed_count)) {
         log_debug("Package already installed, skipping resolution: %s", package_name);
-        // Remove from visited before returning
-        if (resolver->visited_count > 0) {
-            free(resolver->visited[--resolver->visited_count]);
-            resolver->visited[resolver->visited_count] = NULL;
-        }
         return NULL; // Already installed
     }
 
@@ -181,373 +172,139 @@ char** resolver_resolve(DependencyResolver *resolver, const char *package_name,
         log_error("Package not found in repository: %s", package_name);
         return NULL;
     }
-    log_debug("Package found: %s@%s with %zu dependencies", pkg->name, pkg->version ? pkg->version : "latest", pkg->dependencies_count);
 
-    // Resolve dependencies first
-    for (size_t i = 0; i < pkg->dependencies_count; i++) {
-        if (!pkg->dependencies[i]) continue; // Skip NULL dependencies
-
-        // Parse dependency spec (may be package@version)
-        char *dep_name = NULL;
-        char *dep_version = NULL;
-        parse_package_version(pkg->dependencies[i], &dep_name, &dep_version);
-        const char *dep_spec = pkg->dependencies[i];
-
-        // Skip self-dependency (package depending on itself)
-        char *pkg_name_only = NULL;
-        char *pkg_version_only = NULL;
-        parse_package_version(package_name, &pkg_name_only, &pkg_version_only);
-        if (pkg_name_only && dep_name && strcmp(pkg_name_only, dep_name) == 0) {
-            // Package depends on itself - skip it
-            free(pkg_name_only);
-            free(pkg_version_only);
-            if (dep_name) free(dep_name);
-            if (dep_version) free(dep_version);
-            continue;
-        }
-        if (pkg_name_only) free(pkg_name_only);
-        if (pkg_version_only) free(pkg_version_only);
-
-        // Check if already in result (compare by name, and version if specified)
-        bool found = false;
-        if (result) {
-            for (size_t j = 0; j < *result_count; j++) {
-                if (!result[j]) continue;
-
-                char *res_name = NULL;
-                char *res_version = NULL;
-                parse_package_version(result[j], &res_name, &res_version);
-
-                bool name_match = (strcmp(res_name ? res_name : result[j], dep_name ? dep_name : dep_spec) == 0);
-                bool version_match = true;
-
-                if (dep_version && res_version) {
-                    version_match = (strcmp(dep_version, res_version) == 0);
-                } else if (dep_version && !res_version) {
-                    version_match = false; // Required version not in result
-                }
-
-                if (res_name) free(res_name);
-                if (res_version) free(res_version);
+    // Depth-first walk with an explicit stack (deep dependency chains don't grow
+    // the C stack). A package is added to the result when all its dependencies
+    // are, so the result lists dependencies before their dependents. A package
+    // already in the result is not walked again: its dependencies are in there too.
+    char **result = NULL;
+    Package **result_pkgs = NULL;
+    size_t count = 0, capacity = 0;
+    ResultSet done = {NULL, 0};
+    ResolveFrame *stack = malloc(sizeof(ResolveFrame) * 16);
+    size_t depth = 0, stack_capacity = 16;
+    if (!stack) {
+        return NULL;
+    }
+    stack[depth++] = (ResolveFrame){package_name, pkg, 0};
+    log_debug("Package found: %s@%s with %zu dependencies", pkg->name, pkg->version ? pkg->version : "latest", pkg->dependencies_count);
 
-                if (name_match && version_match) {
-                    found = true;
-                    break;
+    while (depth > 0) {
+        ResolveFrame *top = &stack[depth - 1];
+        size_t total = 0;
+        char **deps = package_get_all_dependencies(top->pkg, &total);
+
+        // All dependencies handled: add the package itself
+        if (top->next_dep >= total) {
+            if (count >= capacity) {
+                capacity = capacity ? capacity * 2 : 8;
+                char **grown = realloc(result, sizeof(char*) * capacity);
+                if (grown) result = grown;
+                Package **grown_pkgs = grown ? realloc(result_pkgs, sizeof(Package*) * capacity) : NULL;
+                if (!grown_pkgs) {
+                    free_package_list(result, count);
+                    free(result_pkgs);
+                    free(done.slots);
+                    free(stack);
+                    return NULL;
                 }
+                result_pkgs = grown_pkgs;
             }
+            result[count] = strdup(top->spec);
+            if (!result[count] || !result_set_add(&done, result, count + 1)) {
+                free_package_list(result, count + (result[count] != NULL));
+                free(result_pkgs);
+                free(done.slots);
+                free(stack);
+                return NULL;
+            }
+            result_pkgs[count] = top->pkg;
+            count++;
+            depth--;
+            continue;
         }
 
-        if (!found) {
-            // Recursively resolve (pass the full dependency spec including version)
-            log_developer("Recursively resolving dependency: %s", dep_spec);
-            size_t deps_count = 0;
-            char **deps = resolver_resolve(resolver, dep_spec, installed, installed_count, &deps_count);
-            log_developer("Dependency resolution returned %zu packages for: %s", deps_count, dep_spec);
-
-            // Clean up parsed dependency
-            if (dep_name) free(dep_name);
-            if (dep_version) free(dep_version);
-
-            // Add dependencies to result (if resolution succeeded)
-            if (deps && deps_count > 0) {
-                for (size_t j = 0; j < deps_count; j++) {
-                    if (deps[j]) { // Only add non-NULL dependencies
-                        // Check if this dependency is already in result (by name)
-                        bool already_added = false;
-                        if (result) {
-                            for (size_t k = 0; k < *result_count; k++) {
-                                if (!result[k]) continue;
-
-                                // Extract names for comparison
-                                char *res_name = NULL;
-                                char *res_version = NULL;
-                                parse_package_version(result[k], &res_name, &res_version);
-
-                                char *dep_name_check = NULL;
-                                char *dep_version_check = NULL;
-                                parse_package_version(deps[j], &dep_name_check, &dep_version_check);
-
-                                const char *res_name_str = res_name ? res_name : result[k];
-                                const char *dep_name_str = dep_name_check ? dep_name_check : deps[j];
-
-                                // Match by name (version is optional)
-                                if (strcmp(res_name_str, dep_name_str) == 0) {
-                                    already_added = true;
-                                }
+        const char *dep = deps[top->next_dep++];
 
-                                if (res_name) free(res_name);
-                                if (res_version) free(res_version);
-                                if (dep_name_check) free(dep_name_check);
-                                if (dep_version_check) free(dep_version_check);
+        // Skip self-dependency (package depending on itself)
+        if (spec_names_match(top->spec, dep)) continue;
 
-                                if (already_added) break;
-                            }
-                        }
+        // Already in the result
+        if (result_set_contains(&done, result, dep)) continue;
 
-                        if (!already_added) {
-                            if (*result_count >= capacity) {
-                            capacity = capacity ? capacity * 2 : 8;
-                            char **new_result = realloc(result, sizeof(char*) * capacity);
-                            if (!new_result) {
-                                // Allocation failed - clean up
-                                for (size_t k = 0; k < *result_count; k++) {
-                                    if (result && result[k]) free(result[k]);
-                                }
-                                if (result) free(result);
-                                for (size_t k = 0; k < deps_count; k++) {
-                                    if (deps[k]) free(deps[k]);
-                                }
-                                free(deps);
-                                *result_count = 0;
-                                return NULL;
-                            }
-                            result = new_result;
-                        }
-                        result[*result_count] = strdup(deps[j]);
-                        if (!result[*result_count]) {
-                            // strdup failed - clean up
-                            for (size_t k = 0; k < *result_count; k++) {
-                                if (result[k]) free(result[k]);
-                            }
-                            free(result);
-                            for (size_t k = 0; k < deps_count; k++) {
-                                if (deps[k]) free(deps[k]);
-                            }
-                            free(deps);
-                            *result_count = 0;
-                            return NULL;
-                            }
-                            (*result_count)++;
-                        }
-                    }
-                    if (deps[j]) free(deps[j]);
-                }
-                free(deps);
-            } else if (deps) {
-                // Empty result - free it
-                free(deps);
-            } else {
-                // deps is NULL - check if dependency exists in repository
-                Package *dep_pkg = repository_get_package(resolver->repository, pkg->dependencies[i]);
-                if (!dep_pkg) {
-                    // Dependency not found in repository - this is an error
-                    log_error("Dependency not found in repository: %s (required by %s)", pkg->dependencies[i], package_name);
-                    if (result) {
-                        for (size_t k = 0; k < *result_count; k++) {
-                            if (result[k]) free(result[k]);
-                        }
-                        free(result);
-                    }
-                    *result_count = 0;
-                    return NULL;
-                }
-                log_debug("Dependency already installed (skipping): %s", pkg->dependencies[i]);
-                // Dependency exists but was already installed (and not using force) - skip it
-            }
+        // Currently being resolved further up: a cycle. The edge is dropped, as
+        // the recursive resolver did.
+        bool on_stack = false;
+        for (size_t i = 0; i < depth && !on_stack; i++) {
+            on_stack = spec_names_match(dep, stack[i].spec);
         }
-    }
-
-    // Add build dependencies
-    if (pkg->build_dependencies_count > 0) {
-        log_debug("Resolving %zu build dependencies for package: %s", pkg->build_dependencies_count, package_name);
-    }
-    for (size_t i = 0; i < pkg->build_dependencies_count; i++) {
-        if (!pkg->build_dependencies[i]) continue; // Skip NULL dependencies
-
-        // Skip self-dependency (package depending on itself)
-        char *pkg_name_only = NULL;
-        char *pkg_version_only = NULL;
-        parse_package_version(package_name, &pkg_name_only, &pkg_version_only);
-        char *build_dep_name = NULL;
-        char *build_dep_version = NULL;
-        parse_package_version(pkg->build_dependencies[i], &build_dep_name, &build_dep_version);
-        if (pkg_name_only && build_dep_name && strcmp(pkg_name_only, build_dep_name) == 0) {
-            // Package depends on itself - skip it
-            free(pkg_name_only);
-            free(pkg_version_only);
-            if (build_dep_name) free(build_dep_name);
-            if (build_dep_version) free(build_dep_version);
+        if (on_stack) {
+            log_error("Circular dependency detected: %s (required by %s)", dep, top->spec);
             continue;
         }
-        if (pkg_name_only) free(pkg_name_only);
-        if (pkg_version_only) free(pkg_version_only);
-        if (build_dep_name) free(build_dep_name);
-        if (build_dep_version) free(build_dep_version);
-
-        bool found = false;
-        if (result) {
-            for (size_t j = 0; j < *result_count; j++) {
-                if (result[j] && strcmp(result[j], pkg->build_dependencies[i]) == 0) {
-                    found = true;
-                    break;
-                }
-            }
-        }
-
-        if (!found) {
-            size_t deps_count = 0;
-            char **deps = resolver_resolve(resolver, pkg->build_dependencies[i], installed, installed_count, &deps_count);
-
-            // Add dependencies to result (if resolution succeeded)
-            if (deps && deps_count > 0) {
-                for (size_t j = 0; j < deps_count; j++) {
-                    if (deps[j]) { // Only add non-NULL dependencies
-                        // Check if this dependency is already in result (by name)
-                        bool already_added = false;
-                        if (result) {
-                            for (size_t k = 0; k < *result_count; k++) {
-                                if (!result[k]) continue;
-
-                                // Extract names for comparison
-                                char *res_name = NULL;
-                                char *res_version = NULL;
-                                parse_package_version(result[k], &res_name, &res_version);
-
-                                char *dep_name_check = NULL;
-                                char *dep_version_check = NULL;
-                                parse_package_version(deps[j], &dep_name_check, &dep_version_check);
-
-                                const char *res_name_str = res_name ? res_name : result[k];
-                                const char *dep_name_str = dep_name_check ? dep_name_check : deps[j];
-
-                                // Match by name (version is optional)
-                                if (strcmp(res_name_str, dep_name_str) == 0) {
-                                    already_added = true;
-                                }
-
-                                if (res_name) free(res_name);
-                                if (res_version) free(res_version);
-                                if (dep_name_check) free(dep_name_check);
-                                if (dep_version_check) free(dep_version_check);
-
-                                if (already_added) break;
-                            }
-                        }
 
-                        if (!already_added) {
-                            if (*result_count >= capacity) {
-                                capacity = capacity ? capacity * 2 : 8;
-                                char **new_result = realloc(result, sizeof(char*) * capacity);
-                                if (!new_result) {
-                                    // Allocation failed - clean up
-                                    for (size_t k = 0; k < *result_count; k++) {
-                                        if (result && result[k]) free(result[k]);
-                                    }
-                                    if (result) free(result);
-                                    for (size_t k = 0; k < deps_count; k++) {
-                                        if (deps[k]) free(deps[k]);
-                                    }
-                                    free(deps);
-                                    *result_count = 0;
-                                    return NULL;
-                                }
-                                result = new_result;
-                            }
-                            result[*result_count] = strdup(deps[j]);
-                            if (!result[*result_count]) {
-                                // strdup failed - clean up
-                                for (size_t k = 0; k < *result_count; k++) {
-                                    if (result[k]) free(result[k]);
-                                }
-                                free(result);
-                                for (size_t k = 0; k < deps_count; k++) {
-                                    if (deps[k]) free(deps[k]);
-                                }
-                                free(deps);
-                                *result_count = 0;
-                                return NULL;
-                            }
-                            (*result_count)++;
-                        }
-                    }
-                    if (deps[j]) free(deps[j]);
-                }
-                free(deps);
-            } else if (deps) {
-                // Empty result - free it
-                free(deps);
-            } else {
-                // deps is NULL - check if build dependency exists in repository
-                Package *dep_pkg = repository_get_package(resolver->repository, pkg->build_dependencies[i]);
-                if (!dep_pkg) {
-                    // Build dependency not found in repository - this is an error
-                    if (result) {
-                        for (size_t k = 0; k < *result_count; k++) {
-                            if (result[k]) free(result[k]);
-                        }
-                        free(result);
-                    }
-                    *result_count = 0;
-                    return NULL;
-                }
-                // Build dependency exists but was already installed (and not using force) - skip it
-            }
+        if (is_package_installed(dep, installed, installed_count)) {
+            log_debug("Dependency already installed (skipping): %s", dep);
+            continue;
         }
-    }
 
-    // Add this package (always add the package itself)
-    if (*result_count >= capacity) {
-        size_t new_capacity = capacity ? capacity * 2 : 1;
-        char **new_result;
-        if (result) {
-            new_result = realloc(result, sizeof(char*) * new_capacity);
-        } else {
-            new_result = malloc(sizeof(char*) * new_capacity);
-        }
-        if (!new_result) {
-            // Clean up existing result if any
-            if (result) {
-                for (size_t i = 0; i < *result_count; i++) {
-                    if (result[i]) free(result[i]);
-                }
-                free(result);
-            }
-            *result_count = 0;
+        Package *dep_pkg = repository_get_package(resolver->repository, dep);
+        if (!dep_pkg) {
+            log_error("Dependency not found in repository: %s (required by %s)", dep, top->spec);
+            free_package_list(result, count);
+            free(result_pkgs);
+            free(done.slots);
+            free(stack);
             return NULL;
         }
-        result = new_result;
-        capacity = new_capacity;
-    }
-    result[*result_count] = strdup(package_name);
-    if (!result[*result_count]) {
-        // strdup failed - clean up
-        for (size_t i = 0; i < *result_count; i++) {
-            if (result[i]) free(result[i]);
-        }
-        free(result);
-        *result_count = 0;
-        return NULL;
-    }
-    (*result_count)++;
-
-    // Remove from visited list before returning
-    for (size_t i = 0; i < resolver->visited_count; i++) {
-        if (resolver->visited[i] && strcmp(resolver->visited[i], package_name) == 0) {
-            free(resolver->visited[i]);
-            // Shift remaining entries
-            for (size_t j = i; j < resolver->visited_count - 1; j++) {
-                resolver->visited[j] = resolver->visited[j + 1];
+
+        if (depth >= stack_capacity) {
+            stack_capacity *= 2;
+            ResolveFrame *grown = realloc(stack, sizeof(ResolveFrame) * stack_capacity);
+            if (!grown) {
+                free_package_list(result, count);
+                free(result_pkgs);
+                free(done.slots);
+                free(stack);
+                return NULL;
             }
-            resolver->visited_count--;
-            resolver->visited[resolver->visited_count] = NULL;
-            break;
+            stack = grown;
         }
+        log_developer("Resolving dependency: %s", dep);
+        stack[depth++] = (ResolveFrame){dep, dep_pkg, 0};
     }
+    free(stack);
+    free(done.slots);
 
-    // Reset visited list if we're back at the top level (visited_count == 0)
-    if (resolver->visited_count == 0 && resolver->visited) {
-        free(resolver->visited);
-        resolver->visited = NULL;
-        resolver->visited_capacity = 0;
+    *result_count = count;
+    if (resolved) {
+        *resolved = result_pkgs;
+    } else {
+        free(result_pkgs);
     }
 
-    log_debug("Dependency resolution completed for %s: %zu total packages", package_name, *result_count);
+    log_debug("Dependency resolution completed for %s: %zu total packages", package_name, count);
     return result;
 }
 
-char** resolver_get_build_order(DependencyResolver *resolver, char **packages, size_t packages_count, size_t *result_count) {
+// Package of packages[i]: taken from the resolved array when the caller has it
+// (resolver_resolve already looked every one up), from the repository otherwise
+static Package *build_order_package(DependencyResolver *resolver, char **packages, Package **resolved, size_t i) {
+    if (resolved) {
+        return resolved[i];
+    }
+    char *pkg_name = NULL;
+    char *pkg_version = NULL;
+    parse_package_version(packages[i], &pkg_name, &pkg_version);
+    const char *actual_name = pkg_name ? pkg_name : packages[i];
+    Package *pkg = pkg_version ? repository_get_package_version(resolver->repository, actual_name, pkg_version) : repository_get_package(resolver->repository, actual_name);
+    if (pkg_name) free(pkg_name);
+    if (pkg_version) free(pkg_version);
+    return pkg;
+}
+
+char** resolver_get_build_order(DependencyResolver *resolver, char **packages, Package **resolved, size_t packages_count, size_t *result_count) {
     log_debug("Calculating build order for %zu packages", packages_count);
-    // Simple topological sort
     *result_count = 0;
     if (packages_count == 0) {
         log_warning("No packages provided for build order calculation");
@@ -562,207 +319,226 @@ char** resolver_get_build_order(DependencyResolver *resolver, char **packages, s
         return result;
     }
 
-    char **result = calloc(packages_count, sizeof(char*));  // Initialize to NULL
-    if (!result) return NULL;
-
-    bool *added = calloc(packages_count, sizeof(bool));
-    if (!added) {
-        free(result);
-        return NULL;
+    // Kahn's algorithm over integer indices into packages: succs_start/succs
+    // hold the dependents of each package (edge list grouped per package),
+    // in_degree the number of its dependencies not yet added. For build order,
+    // only build_dependencies count: runtime dependencies are needed at
+    // runtime but don't affect build order.
+    char **result = calloc(packages_count, sizeof(char*));
+    Package **pkgs = resolved ? resolved : calloc(packages_count, sizeof(Package*));
+    int *in_degree = calloc(packages_count, sizeof(int));
+    size_t *edge_from = NULL, *edge_to = NULL;
+    size_t *succs_start = calloc(packages_count + 1, sizeof(size_t));
+    size_t *succs = NULL;
+    size_t *ready = malloc(sizeof(size_t) * packages_count); // Min-heap of packages with in_degree 0
+    size_t edges_count = 0, edges_capacity = 0, ready_count = 0;
+    ResultSet index = {NULL, 0}; // Package name -> index into packages
+    bool ok = result && pkgs && in_degree && succs_start && ready;
+
+    // Every package must be in the repository before there is anything to
+    // order (resolver_resolve already checked the packages it passes in)
+    size_t missing_count = 0;
+    for (size_t i = 0; ok && !resolved && i < packages_count; i++) {
+        pkgs[i] = build_order_package(resolver, packages, NULL, i);
+    }
+    for (size_t i = 0; ok && i < packages_count; i++) {
+        if (!pkgs[i]) {
+            log_error("Package not found in repository: %s", packages[i]);
+            missing_count++;
+        }
+    }
+    ok = ok && missing_count == 0;
+    for (size_t i = 0; ok && i < packages_count; i++) {
+        ok = result_set_add(&index, packages, i + 1);
     }
 
-    // Build dependency graph
-    int *in_degree = calloc(packages_count, sizeof(int));
-    if (!in_degree) {
-        free(result);
-        free(added);
-        return NULL;
+    for (size_t i = 0; ok && i < packages_count; i++) {
+        Package *pkg = pkgs[i];
+        for (size_t j = 0; ok && j < pkg->build_dependencies_count; j++) {
+            if (!pkg->build_dependencies[j]) continue;
+            long dep_idx = result_set_find(&index, packages, pkg->build_dependencies[j]);
+            // A package depending on itself is skipped, as in resolver_resolve
+            if (dep_idx < 0 || (size_t)dep_idx == i) continue;
+            // A dependency listed twice is one edge
+            bool duplicate = false;
+            for (size_t e = edges_count; e > 0 && edge_to[e - 1] == i && !duplicate; e--) {
+                duplicate = edge_from[e - 1] == (size_t)dep_idx;
+            }
+            if (duplicate) continue;
+            if (edges_count >= edges_capacity) {
+                edges_capacity = edges_capacity ? edges_capacity * 2 : 16;
+                size_t *grown_from = realloc(edge_from, sizeof(size_t) * edges_capacity);
+                if (grown_from) edge_from = grown_from;
+                size_t *grown_to = grown_from ? realloc(edge_to, sizeof(size_t) * edges_capacity) : NULL;
+                if (grown_to) edge_to = grown_to;
+                ok = grown_from && grown_to;
+                if (!ok) break;
+            }
+            edge_from[edges_count] = (size_t)dep_idx;
+            edge_to[edges_count] = i;
+            edges_count++;
+            in_degree[i]++;
+            succs_start[dep_idx + 1]++;
+        }
     }
 
-    for (size_t i = 0; i < packages_count; i++) {
-        // Parse package@version if present
-        char *pkg_name = NULL;
-        char *pkg_version = NULL;
-        parse_package_version(packages[i], &pkg_name, &pkg_version);
-        const char *actual_name = pkg_name ? pkg_name : packages[i];
-
-        Package *pkg = pkg_version ? repository_get_package_version(resolver->repository, actual_name, pkg_version) : repository_get_package(resolver->repository, actual_name);
-        if (pkg) {
-            // For build order, only consider build_dependencies, not runtime dependencies
-            // Runtime dependencies are needed at runtime but don't affect build order
-            for (size_t j = 0; j < pkg->build_dependencies_count; j++) {
-                if (!pkg->build_dependencies[j]) continue;
-                int dep_idx = find_package_index(packages, packages_count, pkg->build_dependencies[j]);
-                if (dep_idx >= 0) {
-                    in_degree[i]++;
-                }
+    // Group the edges by dependency (counting sort): the dependents of package
+    // k are succs[succs_start[k] .. succs_start[k + 1])
+    if (ok) {
+        for (size_t k = 0; k < packages_count; k++) {
+            succs_start[k + 1] += succs_start[k];
+        }
+        succs = malloc(sizeof(size_t) * (edges_count ? edges_count : 1));
+        size_t *fill = malloc(sizeof(size_t) * packages_count);
+        ok = succs && fill;
+        if (ok) {
+            memcpy(fill, succs_start, sizeof(size_t) * packages_count);
+            for (size_t e = 0; e < edges_count; e++) {
+                succs[fill[edge_from[e]]++] = edge_to[e];
             }
-        } else {
-            // Package not found in repository - this is an error
-            // But we'll continue and handle it later
         }
+        free(fill);
+    }
+    free(edge_from);
+    free(edge_to);
 
-        if (pkg_name) free(pkg_name);
-        if (pkg_version) free(pkg_version);
+    if (!ok) {
+        if (missing_count > 0) {
+            log_error("Cannot calculate build order: %zu package%s not found in repository", missing_count, missing_count == 1 ? "" : "s");
+        } else {
+            log_error("Failed to allocate memory for build order calculation");
+        }
+        free(result);
+        if (!resolved) free(pkgs);
+        free(in_degree);
+        free(succs_start);
+        free(succs);
+        free(ready);
+        free(index.slots);
+        return NULL;
     }
 
-    // Topological sort
-    log_developer("Starting topological sort: packages_count=%zu", packages_count);
+    log_developer("Starting topological sort: packages_count=%zu, edges=%zu", packages_count, edges_count);
     for (size_t i = 0; i < packages_count; i++) {
         log_developer("  Initial in_degree[%zu] for '%s': %d", i, packages[i], in_degree[i]);
+        if (in_degree[i] == 0) {
+            ready[ready_count++] = i; // Ascending: already a valid min-heap
+        }
     }
-    while (*result_count < packages_count) {
-        log_developer("Topological sort iteration: *result_count=%zu, packages_count=%zu", *result_count, packages_count);
-        bool found = false;
-        size_t selected_idx = SIZE_MAX;
-
-        // Pick first available package with in_degree == 0
-        // Dependencies in package definitions ensure correct build order
-        for (size_t i = 0; i < packages_count; i++) {
-            if (!added[i] && in_degree[i] == 0) {
-                selected_idx = i;
-                break;
+
+    // Always take the lowest-index ready package, so the build order stays as
+    // close to the resolver's order as the dependencies allow
+    while (ready_count > 0) {
+        size_t i = ready[0];
+        ready[0] = ready[--ready_count];
+        for (size_t pos = 0;;) {
+            size_t smallest = pos, left = 2 * pos + 1, right = left + 1;
+            if (left < ready_count && ready[left] < ready[smallest]) smallest = left;
+            if (right < ready_count && ready[right] < ready[smallest]) smallest = right;
+            if (smallest == pos) break;
+            size_t tmp = ready[pos];
+            ready[pos] = ready[smallest];
+            ready[smallest] = tmp;
+            pos = smallest;
+        }
+
+        log_developer("Adding package %zu: '%s' (in_degree=0)", *result_count, packages[i]);
+        result[*result_count] = strdup(packages[i]);
+        if (!result[*result_count]) {
+            log_error("strdup failed for '%s' - out of memory", packages[i]);
+            for (size_t k = 0; k < *result_count; k++) {
+                free(result[k]);
             }
+            free(result);
+            if (!resolved) free(pkgs);
+            free(in_degree);
+            free(succs_start);
+            free(succs);
+            free(ready);
+            free(index.slots);
+            *result_count = 0;
+            return NULL;
         }
-        // Add selected package
-        if (selected_idx != SIZE_MAX) {
-            size_t i = selected_idx;
-            log_developer("Adding package %zu: '%s' (in_degree=0)", *result_count, packages[i]);
-            char *dup_str = strdup(packages[i]);
-            if (!dup_str) {
-                log_error("strdup failed for '%s' - out of memory", packages[i]);
-                // Free resources and return NULL
-                for (size_t k = 0; k < *result_count; k++) {
-                    if (result[k]) free(result[k]);
+        (*result_count)++;
+
+        // Decrease in-degree of dependents
+        for (size_t s = succs_start[i]; s < succs_start[i + 1]; s++) {
+            size_t j = succs[s];
+            log_developer("  Package '%s' depends on '%s', decreasing in_degree[%zu] from %d to %d",
+                          packages[j], packages[i], j, in_degree[j], in_degree[j] - 1);
+            if (--in_degree[j] == 0) {
+                size_t pos = ready_count++;
+                ready[pos] = j;
+                while (pos > 0 && ready[(pos - 1) / 2] > ready[pos]) {
+                    size_t parent = (pos - 1) / 2;
+                    size_t tmp = ready[pos];
+                    ready[pos] = ready[parent];
+                    ready[parent] = tmp;
+                    pos = parent;
                 }
-                free(result);
-                free(added);
-                free(in_degree);
-                *result_count = 0;
-                return NULL;
-            } else {
-                result[*result_count] = dup_str;
-                log_developer("  Assigned result[%zu] = '%s' (pointer: %p)", *result_count, result[*result_count], (void*)result[*result_count]);
-                (*result_count)++;
-                log_developer("  Incremented *result_count to %zu", *result_count);
-                added[i] = true;
-                found = true;
-
-                // Decrease in-degree of dependents
-                // Parse package name from packages[i] (may be "package@version")
-                char *added_pkg_name = NULL;
-                char *added_pkg_version = NULL;
-                parse_package_version(packages[i], &added_pkg_name, &added_pkg_version);
-                const char *added_name = added_pkg_name ? added_pkg_name : packages[i];
-
-                Package *pkg = repository_get_package(resolver->repository, added_name);
-                if (pkg) {
-                    for (size_t j = 0; j < packages_count; j++) {
-                        if (!added[j]) {
-                            // Parse package name from packages[j] (may be "package@version")
-                            char *other_pkg_name = NULL;
-                            char *other_pkg_version = NULL;
-                            parse_package_version(packages[j], &other_pkg_name, &other_pkg_version);
-                            const char *other_name = other_pkg_name ? other_pkg_name : packages[j];
-
-                            Package *other = repository_get_package(resolver->repository, other_name);
-                            if (other) {
-                                // Check if other package depends on added package
-                                // For build order, only check build_dependencies (not runtime dependencies)
-                                bool has_dep = false;
-                                for (size_t k = 0; k < other->build_dependencies_count; k++) {
-                                    if (!other->build_dependencies[k]) continue;
-                                    char *build_dep_name = NULL;
-                                    char *build_dep_version = NULL;
-                                    parse_package_version(other->build_dependencies[k], &build_dep_name, &build_dep_version);
-                                    const char *build_dep_name_str = build_dep_name ? build_dep_name : other->build_dependencies[k];
-                                    if (strcmp(build_dep_name_str, added_name) == 0) {
-                                        has_dep = true;
-                                    }
-                                    if (build_dep_name) free(build_dep_name);
-                                    if (build_dep_version) free(build_dep_version);
-                                    if (has_dep) break;
-                                }
-                                if (has_dep) {
-                                    log_developer("  Package '%s' depends on '%s', decreasing in_degree[%zu] from %d to %d",
-                                                  other_name, added_name, j, in_degree[j], in_degree[j] - 1);
-                                    in_degree[j]--;
-                                }
-                            }
-                            if (other_pkg_name) free(other_pkg_name);
-                            if (other_pkg_version) free(other_pkg_version);
-                        }
-                    }
-                }
-                if (added_pkg_name) free(added_pkg_name);
-                if (added_pkg_version) free(added_pkg_version);
             }
         }
-        if (!found) {
-            log_warning("No package found with in_degree=0, but *result_count=%zu < packages_count=%zu", *result_count, packages_count);
-            // Circular dependency detected - report which packages are stuck
-            log_error("Circular dependency detected! Remaining packages with dependencies:");
-            for (size_t i = 0; i < packages_count; i++) {
-                if (!added[i]) {
-                    char *pkg_name = NULL;
-                    char *pkg_version = NULL;
-                    parse_package_version(packages[i], &pkg_name, &pkg_version);
-                    const char *actual_name = pkg_name ? pkg_name : packages[i];
-                    Package *pkg = repository_get_package(resolver->repository, actual_name);
-                    if (pkg) {
-                        log_error("  %s (in_degree=%d)", actual_name, in_degree[i]);
-                        if (pkg->dependencies_count > 0 || pkg->build_dependencies_count > 0) {
-                            log_error("    Dependencies:");
-                            for (size_t j = 0; j < pkg->dependencies_count; j++) {
-                                if (pkg->dependencies[j]) {
-                                    log_error("      - %s (runtime)", pkg->dependencies[j]);
-                                }
-                            }
-                            for (size_t j = 0; j < pkg->build_dependencies_count; j++) {
-                                if (pkg->build_dependencies[j]) {
-                                    log_error("      - %s (build)", pkg->build_dependencies[j]);
-                                }
-                            }
-                        }
+    }
+    free(succs_start);
+    free(succs);
+    free(ready);
+
+    if (*result_count < packages_count) {
+        // Every package left has a dependency that is also left. Following
+        // such dependencies from any of them must come back to a package
+        // already on the path: that loop is the cycle to report.
+        size_t *path = malloc(sizeof(size_t) * packages_count);
+        long *path_pos = malloc(sizeof(long) * packages_count);
+        if (path && path_pos) {
+            for (size_t k = 0; k < packages_count; k++) path_pos[k] = -1;
+            size_t path_len = 0;
+            size_t node = 0;
+            while (in_degree[node] == 0) node++;
+            while (path_pos[node] < 0) {
+                path_pos[node] = (long)path_len;
+                path[path_len++] = node;
+                Package *pkg = pkgs[node];
+                for (size_t j = 0; j < pkg->build_dependencies_count; j++) {
+                    if (!pkg->build_dependencies[j]) continue;
+                    long dep_idx = result_set_find(&index, packages, pkg->build_dependencies[j]);
+                    if (dep_idx >= 0 && (size_t)dep_idx != node && in_degree[dep_idx] > 0) {
+                        node = (size_t)dep_idx;
+                        break;
                     }
-                    if (pkg_name) free(pkg_name);
-                    if (pkg_version) free(pkg_version);
                 }
             }
-            // Circular dependency or error - check if we added all packages
-            if (*result_count < packages_count) {
-                // Failed to add all packages - free result and return NULL
-                for (size_t i = 0; i < *result_count; i++) {
-                    free(result[i]);
-                }
-                free(result);
-                free(added);
-                free(in_degree);
-                return NULL;
+            char cycle[1024];
+            size_t used = 0;
+            for (size_t k = (size_t)path_pos[node]; k <= path_len && used < sizeof(cycle); k++) {
+                const char *name = pkgs[k < path_len ? path[k] : node]->name;
+                int written = snprintf(cycle + used, sizeof(cycle) - used, "%s%s", k > (size_t)path_pos[node] ? " -> " : "", name);
+                if (written < 0) break;
+                used += (size_t)written;
             }
-            break;
+            log_error("Circular build dependency detected: %s", cycle);
+        } else {
+            log_error("Circular build dependency detected");
         }
-    }
-
-    // Verify all packages were added
-    if (*result_count < packages_count) {
+        free(path);
+        free(path_pos);
+        free(index.slots);
         log_error("Build order calculation incomplete (added %zu of %zu packages)", *result_count, packages_count);
+
         // Failed to add all packages - free result and return NULL
         for (size_t i = 0; i < *result_count; i++) {
             free(result[i]);
         }
         free(result);
-        free(added);
+        if (!resolved) free(pkgs);
         free(in_degree);
         *result_count = 0;
         return NULL;
     }
 
     log_debug("Build order calculated successfully: %zu packages", *result_count);
-    log_developer("About to return from resolver_get_build_order: result=%p, *result_count=%zu", (void*)result, *result_count);
-    free(added);
+    free(index.slots);
+    if (!resolved) free(pkgs);
     free(in_degree);
-    log_developer("After freeing memory: result=%p, *result_count=%zu", (void*)result, *result_count);
     return result;
 }
 
@@ -772,6 +548,307 @@ bool resolver_has_circular_dependency(DependencyResolver *resolver, const char *
     return false;
 }
 
+// Rebuild the name index after packages were loaded or added. Resolution and
+// build ordering look packages up by name many times; with the index each
+// lookup hashes the name and walks only that package's versions instead of
+// comparing against every package in the repository.
+static void repository_rebuild_index(Repository *repo) {
+    free(repo->name_index);
+    free(repo->next_version);
+    free(repo->latest_version);
+    repo->name_index = NULL;
+    repo->next_version = NULL;
+    repo->latest_version = NULL;
+    repo->name_index_size = 0;
+    if (repo->packages_count == 0) return;
+
+    size_t size = 16;
+    while (size < repo->packages_count * 2) size *= 2;
+    size_t *index = calloc(size, sizeof(size_t));
+    size_t *next = calloc(repo->packages_count, sizeof(size_t));
+    size_t *latest = calloc(repo->packages_count, sizeof(size_t));
+    if (!index || !next || !latest) {
+        // Lookups fall back to scanning
+        free(index);
+        free(next);
+        free(latest);
+        return;
+    }
+
+    // Insert back to front so each chain lists versions in repository order
+    for (size_t i = repo->packages_count; i-- > 0;) {
+        const char *name = repo->packages[i]->name;
+        if (!name) continue;
+        size_t slot = package_name_hash(name) & (size - 1);
+        while (index[slot] != 0 && strcmp(repo->packages[index[slot] - 1]->name, name) != 0) {
+            slot = (slot + 1) & (size - 1);
+        }
+        next[i] = index[slot];
+        index[slot] = i + 1;
+    }
+
+    // Pick the latest version of each name once, with the same rule as
+    // repository_get_package's scan, so a lookup is a single probe
+    for (size_t slot = 0; slot < size; slot++) {
+        if (index[slot] == 0) continue;
+        size_t best = index[slot];
+        for (size_t pos = next[best - 1]; pos != 0; pos = next[pos - 1]) {
+            const char *candidate = repo->packages[pos - 1]->version;
+            const char *current = repo->packages[best - 1]->version;
+            if (candidate && current && strcmp(candidate, current) > 0) {
+                best = pos;
+            }
+        }
+        for (size_t pos = index[slot]; pos != 0; pos = next[pos - 1]) {
+            latest[pos - 1] = best;
+        }
+    }
+    repo->name_index = index;
+    repo->next_version = next;
+    repo->latest_version = latest;
+    repo->name_index_size = size;
+}
+
+// Index + 1 of the first package named name, 0 if there is none. Follow
+// repo->next_version for its other versions. Without an index, scans.
+static size_t repository_first_version(const Repository *repo, const char *name) {
+    if (repo->name_index_size == 0) {
+        for (size_t i = 0; i < repo->packages_count; i++) {
+            if (repo->packages[i]->name && strcmp(repo->packages[i]->name, name) == 0) {
+                return i + 1;
+            }
+        }
+        return 0;
+    }
+    size_t mask = repo->name_index_size - 1;
+    for (size_t slot = package_name_hash(name) & mask; repo->name_index[slot] != 0; slot = (slot + 1) & mask) {
+        if (strcmp(repo->packages[repo->name_index[slot] - 1]->name, name) == 0) {
+            return repo->name_index[slot];
+        }
+    }
+    return 0;
+}
+
+// Index + 1 of the next package with the same name as packages[pos - 1], 0 if none
+static size_t repository_next_version(const Repository *repo, size_t pos, const char *name) {
+    if (repo->name_index_size > 0) {
+        return repo->next_version[pos - 1];
+    }
+    for (size_t i = pos; i < repo->packages_count; i++) {
+        if (repo->packages[i]->name && strcmp(repo->packages[i]->name, name) == 0) {
+            return i + 1;
+        }
+    }
+    return 0;
+}
+
+// Repository index: the content of every package file in one file
+// (<repo_dir>/.index), so loading the repository reads one file instead of
+// opening each manifest. Entries record the file's mtime and size and are only
+// used while those still match, so edited or replaced manifests are read
+// again and the index is rewritten. The mtime is kept in nanoseconds and the
+// inode is recorded too, so an edit within the same second that keeps the size,
+// or a file replaced by another one, is still noticed. Format, per package file:
+//   <file name>\t<mtime ns>\t<size>\t<inode>\t<content length>\n<content>\n
+#define REPO_INDEX_HEADER "TSI-INDEX 2\n"
+
+typedef struct {
+    char *file;
+    long long mtime;
+    long long size;
+    unsigned long long inode;
+    char *content;
+    size_t content_len;
+    bool owned;  // file and content are allocated (not pointers into a loaded index)
+} RepoIndexEntry;
+
+typedef struct {
+    char *data;  // Loaded index file (entries point into it)
+    RepoIndexEntry *entries;
+    size_t count;
+} RepoIndex;
+
+static void repo_index_free(RepoIndex *index) {
+    for (size_t i = 0; i < index->count; i++) {
+        if (index->entries[i].owned) {
+            free(index->entries[i].file);
+            free(index->entries[i].content);
+        }
+    }
+    free(index->entries);
+    free(index->data);
+    memset(index, 0, sizeof(*index));
+}
+
+static void repo_index_load(RepoIndex *index, const char *repo_dir) {
+    char path[1024];
+    snprintf(path, sizeof(path), "%s/.index", repo_dir);
+    FILE *f = fopen(path, "r");
+    if (!f) return;
+    fseek(f, 0, SEEK_END);
+    long size = ftell(f);
+    fseek(f, 0, SEEK_SET);
+    if (size <= 0) {
+        fclose(f);
+        return;
+    }
+    index->data = malloc((size_t)size + 1);
+    if (!index->data) {
+        fclose(f);
+        return;
+    }
+    size_t read = fread(index->data, 1, (size_t)size, f);
+    fclose(f);
+    index->data[read] = '\0';
+
+    size_t header_len = strlen(REPO_INDEX_HEADER);
+    if (read < header_len || strncmp(index->data, REPO_INDEX_HEADER, header_len) != 0) {
+        log_debug("Ignoring repository index with unknown format: %s", path);
+        repo_index_free(index);
+        return;
+    }
+
+    char *p = index->data + header_len;
+    char *end = index->data + read;
+    while (p < end) {
+        char *newline = memchr(p, '\n', (size_t)(end - p));
+        if (!newline) break;
+        *newline = '\0';
+        char *tab = strchr(p, '\t');
+        if (!tab) break;
+        *tab = '\0';
+        RepoIndexEntry entry = {.file = p};
+        unsigned long long content_len = 0;
+        if (sscanf(tab + 1, "%lld\t%lld\t%llu\t%llu", &entry.mtime, &entry.size, &entry.inode, &content_len) != 4 ||
+            content_len >= (unsigned long long)(end - newline - 1)) {
+            break;
+        }
+        entry.content = newline + 1;
+        entry.content_len = (size_t)content_len;
+        // Terminate the content in place (over its trailing newline), so it
+        // can be parsed straight from the index buffer
+        entry.content[entry.content_len] = '\0';
+
+        RepoIndexEntry *grown = realloc(index->entries, sizeof(RepoIndexEntry) * (index->count + 1));
+        if (!grown) break;
+        index->entries = grown;
+        index->entries[index->count++] = entry;
+        p = entry.content + entry.content_len + 1;
+    }
+    log_developer("Loaded repository index: %zu entries", index->count);
+}
+
+// Find the entry for a file. The directory is read in the same order the index
+// was written in, so the entry after the previous match is tried first.
+static const RepoIndexEntry *repo_index_find(const RepoIndex *index, const char *file, size_t *cursor) {
+    if (*cursor < index->count && strcmp(index->entries[*cursor].file, file) == 0) {
+        return &index->entries[(*cursor)++];
+    }
+    for (size_t i = 0; i < index->count; i++) {
+        if (strcmp(index->entries[i].file, file) == 0) {
+            *cursor = i + 1;
+            return &index->entries[i];
+        }
+    }
+    return NULL;
+}
+
+// Modification time of a file in nanoseconds
+static long long file_mtime_ns(const struct stat *st) {
+#ifdef __APPLE__
+    return (long long)st->st_mtime * 1000000000LL + st->st_mtimensec;
+#else
+    return (long long)st->st_mtim.tv_sec * 1000000000LL + st->st_mtim.tv_nsec;
+#endif
+}
+
+// Add an entry for the index being built. An unchanged file reuses the entry of
+// the loaded index (which must outlive this one); a changed one is copied.
+static void repo_index_add(RepoIndex *index, const char *file, const struct stat *st, char *content,
+                           const RepoIndexEntry *unchanged) {
+    if (strpbrk(file, "\t\n")) return; // Can't be represented in the index
+    RepoIndexEntry *grown = realloc(index->entries, sizeof(RepoIndexEntry) * (index->count + 1));
+    if (!grown) return;
+    index->entries = grown;
+    RepoIndexEntry *entry = &index->entries[index->count];
+    if (unchanged) {
+        *entry = *unchanged;
+        entry->owned = false;
+        index->count++;
+        return;
+    }
+    entry->file = strdup(file);
+    entry->content = strdup(content);
+    entry->owned = true;
+    if (!entry->file || !entry->content) {
+        free(entry->file);
+        free(entry->content);
+        return;
+    }
+    entry->mtime = file_mtime_ns(st);
+    entry->size = (long long)st->st_size;
+    entry->inode = (unsigned long long)st->st_ino;
+    entry->content_len = strlen(content);
+    index->count++;
+}
+
+// Write the index to a temporary file and rename it into place
+static void repo_index_write(const RepoIndex *index, const char *repo_dir) {
+    char path[1024];
+    char tmp_path[1100];
+    snprintf(path, sizeof(path), "%s/.index", repo_dir);
+    // A unique temporary name, so concurrent tsi processes don't write into
+    // each other's file; the loader skips dot files
+    snprintf(tmp_path, sizeof(tmp_path), "%s.XXXXXX", path);
+    int fd = mkstemp(tmp_path);
+    if (fd < 0) {
+        log_debug("Cannot write repository index (read-only repository?): %s", path);
+        return;
+    }
+    fchmod(fd, 0644); // mkstemp creates the file readable by its owner only
+    FILE *f = fdopen(fd, "w");
+    if (!f) {
+        close(fd);
+        unlink(tmp_path);
+        return;
+    }
+    fputs(REPO_INDEX_HEADER, f);
+    for (size_t i = 0; i < index->count; i++) {
+        const RepoIndexEntry *entry = &index->entries[i];
+        fprintf(f, "%s\t%lld\t%lld\t%llu\t%zu\n", entry->file, entry->mtime, entry->size, entry->inode, entry->content_len);
+        fwrite(entry->content, 1, entry->content_len, f);
+        fputc('\n', f);
+    }
+    if (fclose(f) != 0 || rename(tmp_path, path) != 0) {
+        log_debug("Failed to write repository index: %s", path);
+        unlink(tmp_path);
+        return;
+    }
+    log_debug("Repository index updated: %zu package files", index->count);
+}
+
+// Read a package file (NULL on error)
+static char *read_manifest(const char *path) {
+    FILE *f = fopen(path, "r");
+    if (!f) return NULL;
+    fseek(f, 0, SEEK_END);
+    long file_size = ftell(f);
+    fseek(f, 0, SEEK_SET);
+    if (file_size <= 0) {
+        fclose(f);
+        return NULL;
+    }
+    char *json = malloc((size_t)file_size + 1);
+    if (!json) {
+        fclose(f);
+        return NULL;
+    }
+    size_t read = fread(json, 1, (size_t)file_size, f);
+    fclose(f);
+    json[read] = '\0';
+    return json;
+}
+
 Repository* repository_new(const char *repo_dir) {
     log_developer("repository_new called with repo_dir='%s'", repo_dir);
     Repository *repo = malloc(sizeof(Repository));
@@ -782,8 +859,18 @@ Repository* repository_new(const char *repo_dir) {
 
     repo->packages = NULL;
     repo->packages_count = 0;
+    repo->name_index = NULL;
+    repo->name_index_size = 0;
+    repo->next_version = NULL;
+    repo->latest_version = NULL;
 
     // Load packages from directory
+    RepoIndex index = {0};
+    RepoIndex new_index = {0};
+    size_t index_cursor = 0;
+    bool index_stale = false;
+    repo_index_load(&index, repo_dir);
+
     DIR *dir = opendir(repo_dir);
     if (dir) {
         struct dirent *entry;
@@ -799,30 +886,30 @@ Repository* repository_new(const char *repo_dir) {
             char path[512];
             snprintf(path, sizeof(path), "%s/%s", repo_dir, entry->d_name);
 
+            // Load file content (regular files only), from the index when the
+            // file hasn't changed since it was indexed
             struct stat st;
             if (stat(path, &st) == 0 && S_ISREG(st.st_mode)) {
-                // Load file content
-                FILE *f = fopen(path, "r");
-                if (!f) continue;
-
-                fseek(f, 0, SEEK_END);
-                long file_size = ftell(f);
-                fseek(f, 0, SEEK_SET);
-
-                if (file_size <= 0 || file_size > 1024 * 1024) { // Max 1MB
-                    fclose(f);
+                if (st.st_size <= 0 || st.st_size > 1024 * 1024) { // Max 1MB
                     continue;
                 }
 
-                char *json = malloc(file_size + 1);
+                // Unchanged files are parsed straight from the index buffer
+                char *json = NULL;
+                char *json_owned = NULL;
+                const RepoIndexEntry *cached = repo_index_find(&index, entry->d_name, &index_cursor);
+                if (cached && cached->mtime == file_mtime_ns(&st) && cached->size == (long long)st.st_size &&
+                    cached->inode == (unsigned long long)st.st_ino) {
+                    json = cached->content;
+                } else {
+                    cached = NULL;
+                    json = json_owned = read_manifest(path);
+                    index_stale = true;
+                }
                 if (!json) {
-                    fclose(f);
                     continue;
                 }
-
-                size_t read = fread(json, 1, file_size, f);
-                fclose(f);
-                json[read] = '\0';
+                repo_index_add(&new_index, entry->d_name, &st, json, cached);
 
                 // Check if this is a multi-version file (has "versions" array)
                 // Look for "versions" key followed by ':' and then '['
@@ -888,39 +975,29 @@ Repository* repository_new(const char *repo_dir) {
                             } else if (*p == '}') {
                                 brace_depth--;
                                 if (brace_depth == 0 && bracket_depth == 1 && obj_start) {
-                                    // Extract this version object
+                                    // Build the version object with the package name prepended:
+                                    // {"name":"...", ...version fields...}, copied once
                                     size_t obj_len = p - obj_start + 1;
-                                    char *version_json = malloc(obj_len + 1);
+                                    size_t prefix_len = package_name ? strlen(package_name) + 11 : 0; // {"name":"",
+                                    char *version_json = malloc(prefix_len + obj_len + 1);
                                     if (version_json) {
-                                        strncpy(version_json, obj_start, obj_len);
-                                        version_json[obj_len] = '\0';
-
-                                        // Create package from this version
-                                        // First, add the name to the version JSON temporarily
-                                        char *version_json_with_name = NULL;
                                         if (package_name) {
-                                            // Insert name at the beginning: {"name":"...", ...existing json...}
-                                            size_t name_json_len = strlen(package_name) + 20; // "{\"name\":\"\","
-                                            size_t version_json_len = strlen(version_json);
-                                            version_json_with_name = malloc(name_json_len + version_json_len + 1);
-                                            if (version_json_with_name) {
-                                                snprintf(version_json_with_name, name_json_len + version_json_len + 1,
-                                                        "{\"name\":\"%s\",%s", package_name, version_json + 1); // Skip first {
-                                            }
+                                            snprintf(version_json, prefix_len + 1, "{\"name\":\"%s\",", package_name);
+                                            memcpy(version_json + prefix_len, obj_start + 1, obj_len - 1); // Skip first {
+                                            version_json[prefix_len + obj_len - 1] = '\0';
+                                        } else {
+                                            memcpy(version_json, obj_start, obj_len);
+                                            version_json[obj_len] = '\0';
                                         }
 
+                                        // Create package from this version
                                         Package *pkg = package_new();
-                                        const char *json_to_parse = version_json_with_name ? version_json_with_name : version_json;
-                                        if (package_load_from_json(pkg, json_to_parse)) {
+                                        if (package_load_from_manifest(pkg, version_json, path, (long)(obj_start - json), obj_len)) {
                                             repo->packages = realloc(repo->packages, sizeof(Package*) * (repo->packages_count + 1));
                                             repo->packages[repo->packages_count++] = pkg;
                                         } else {
                                             package_free(pkg);
                                         }
-
-                                        if (version_json_with_name) {
-                                            free(version_json_with_name);
-                                        }
                                         free(version_json);
                                     }
                                     obj_start = NULL;
@@ -936,21 +1013,31 @@ Repository* repository_new(const char *repo_dir) {
 
                 if (!is_multi_version) {
                     // Single version format: {"name": "...", "version": "...", ...}
+                    // Parsed from the content already read, not by reading the file again
                     Package *pkg = package_new();
-                    if (package_load_from_file(pkg, path)) {
+                    if (package_load_from_manifest(pkg, json, path, 0, strlen(json))) {
                         repo->packages = realloc(repo->packages, sizeof(Package*) * (repo->packages_count + 1));
                         repo->packages[repo->packages_count++] = pkg;
                     } else {
+                        log_error("Failed to parse package JSON from file: %s", path);
                         package_free(pkg);
                     }
                 }
 
-                free(json);
+                free(json_owned);
             }
         }
         closedir(dir);
+
+        // Files that were removed also make the index stale
+        if (index_stale || new_index.count != index.count) {
+            repo_index_write(&new_index, repo_dir);
+        }
     }
+    repo_index_free(&new_index);
+    repo_index_free(&index);
 
+    repository_rebuild_index(repo);
     log_debug("Repository loaded: %zu packages from %s", repo->packages_count, repo_dir);
     return repo;
 }
@@ -961,6 +1048,9 @@ void repository_free(Repository *repo) {
         package_free(repo->packages[i]);
     }
     free(repo->packages);
+    free(repo->name_index);
+    free(repo->next_version);
+    free(repo->latest_version);
     free(repo);
 }
 
@@ -968,15 +1058,20 @@ Package* repository_get_package(Repository *repo, const char *name) {
     log_developer("repository_get_package called for: %s", name);
     // Return the latest version (highest version string, or first found if no version specified)
     Package *latest = NULL;
-    for (size_t i = 0; i < repo->packages_count; i++) {
-        if (strcmp(repo->packages[i]->name, name) == 0) {
-            if (!latest) {
-                latest = repo->packages[i];
-            } else if (repo->packages[i]->version && latest->version) {
-                // Simple version comparison (lexicographic, works for semantic versions)
-                if (strcmp(repo->packages[i]->version, latest->version) > 0) {
-                    latest = repo->packages[i];
-                }
+    size_t first = repository_first_version(repo, name);
+    if (first != 0 && repo->latest_version) {
+        latest = repo->packages[repo->latest_version[first - 1] - 1];
+        log_debug("Package found: %s@%s", latest->name, latest->version ? latest->version : "latest");
+        return latest;
+    }
+    for (size_t pos = first; pos != 0; pos = repository_next_version(repo, pos, name)) {
+        Package *candidate = repo->packages[pos - 1];
+        if (!latest) {
+            latest = candidate;
+        } else if (candidate->version && latest->version) {
+            // Simple version comparison (lexicographic, works for semantic versions)
+            if (strcmp(candidate->version, latest->version) > 0) {
+                latest = candidate;
             }
         }
     }
@@ -994,12 +1089,11 @@ Package* repository_get_package_version(Repository *repo, const char *name, cons
         return repository_get_package(repo, name);
     }
 
-    for (size_t i = 0; i < repo->packages_count; i++) {
-        if (strcmp(repo->packages[i]->name, name) == 0) {
-            if (repo->packages[i]->version && strcmp(repo->packages[i]->version, version) == 0) {
-                log_debug("Package version found: %s@%s", name, version);
-                return repo->packages[i];
-            }
+    for (size_t pos = repository_first_version(repo, name); pos != 0; pos = repository_next_version(repo, pos, name)) {
+        Package *candidate = repo->packages[pos - 1];
+        if (candidate->version && strcmp(candidate->version, version) == 0) {
+            log_debug("Package version found: %s@%s", name, version);
+            return candidate;
         }
     }
     log_warning("Package version not found in repository: %s@%s", name, version);
@@ -1010,13 +1104,11 @@ char** repository_list_versions(Repository *repo, const char *name, size_t *coun
     *count = 0;
     char **versions = NULL;
 
-    for (size_t i = 0; i < repo->packages_count; i++) {
-        if (strcmp(repo->packages[i]->name, name) == 0) {
-            const char *version = repo->packages[i]->version ? repo->packages[i]->version : "latest";
-            versions = realloc(versions, sizeof(char*) * (*count + 1));
-            versions[*count] = strdup(version);
-            (*count)++;
-        }
+    for (size_t pos = repository_first_version(repo, name); pos != 0; pos = repository_next_version(repo, pos, name)) {
+        const char *version = repo->packages[pos - 1]->version ? repo->packages[pos - 1]->version : "latest";
+        versions = realloc(versions, sizeof(char*) * (*count + 1));
+        versions[*count] = strdup(version);
+        (*count)++;
     }
 
     return versions;
@@ -1029,6 +1121,7 @@ bool repository_add_package(Repository *repo, Package *pkg) {
 
     repo->packages = realloc(repo->packages, sizeof(Package*) * (repo->packages_count + 1));
     repo->packages[repo->packages_count++] = pkg;
+    repository_rebuild_index(repo);
     return true;
 }
 
@@ -12,21 +12,22 @@ extern "C" {
 typedef struct {
     Package **packages;
     size_t packages_count;
+    size_t *name_index;       // Hash table of the first package index + 1 per name (0 = empty slot)
+    size_t name_index_size;   // Number of slots (power of two, 0 = no index)
+    size_t *next_version;     // Index + 1 of the next package with the same name (0 = last)
+    size_t *latest_version;   // Index + 1 of the latest package with the same name
 } Repository;
 
 // Dependency resolver
 typedef struct {
     Repository *repository;
-    char **visited;  // For cycle detection during resolution
-    size_t visited_count;
-    size_t visited_capacity;
 } DependencyResolver;
 
 // Resolver functions
 DependencyResolver* resolver_new(Repository *repo);
 void resolver_free(DependencyResolver *resolver);
-char** resolver_resolve(DependencyResolver *resolver, const char *package_name, char **installed, size_t installed_count, size_t *result_count);
-char** resolver_get_build_order(DependencyResolver *resolver, char **packages, size_t packages_count, size_t *result_count);
+char** resolver_resolve(DependencyResolver *resolver, const char *package_name, char **installed, size_t installed_count, size_t *result_count, Package ***resolved);
+char** resolver_get_build_order(DependencyResolver *resolver, char **packages, Package **resolved, size_t packages_count, size_t *result_count);
 bool resolver_has_circular_dependency(DependencyResolver *resolver, const char *package_name);
 
 // Repository functions